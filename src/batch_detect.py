@@ -0,0 +1,218 @@
+"""
+Processamento em lote, sem interface gráfica, de diretórios de sinais gravados.
+Expande arquivos, diretórios (só .sig) e padrões glob, roda
+process_and_analyze_signal em um pool de processos e grava uma tabela colunar com
+frequência do pico, período e significância (sigmas corrigidos pelo número de
+bins buscados) de cada arquivo.
+
+Cada resultado é anexado a um diário CSV assim que fica pronto; ao reiniciar com
+--resume, os arquivos já processados com sucesso são pulados. Com saída .npz o
+diário fica em '<saída>.partial.csv' e é convertido em colunas no final.
+
+Exemplo:
+    python batch_detect.py 'dados/**/*.sig' -o resultados.csv --workers 8 --resume
+"""
+
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from instrumentation import StageProfiler, stage
+from signal_storage import load_signal
+from process_signal import process_and_analyze_signal
+
+# Colunas da tabela de resultados, na ordem em que são gravadas
+COLUMNS = ('path', 'num_samples', 'fs', 'peak_freq_hz', 'period_s', 'snr_sigma', 'detected',
+           'elapsed_s', 'error')
+# Diretórios só contribuem com .sig: .txt soltos (notas, README) não são sinais
+_DIRECTORY_PATTERN = '*.sig'
+
+
+def find_signal_files(inputs):
+    """
+    Expande arquivos, diretórios (todos os .sig dentro, recursivamente) e padrões
+    glob (com suporte a **). Arquivos .txt só entram quando nomeados ou casados por
+    um padrão. Retorna caminhos absolutos, ordenados e sem repetição.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, '**', _DIRECTORY_PATTERN), recursive=True))
+        else:
+            paths.update(glob.glob(item, recursive=True))
+    return sorted(os.path.abspath(path) for path in paths if os.path.isfile(path))
+
+
+def _process_file(task):
+    """
+    Carrega e analisa um arquivo (roda dentro do worker); erros viram linhas com 'error'.
+    Retorna (linha, relatório de estágios ou None se a instrumentação estiver desligada).
+    """
+    path, params = task
+    row = dict.fromkeys(COLUMNS, '')
+    row['path'] = path
+    profiler = StageProfiler(params['trace_memory']) if params['profile'] else None
+    start = time.perf_counter()
+    try:
+        with stage(profiler, 'load'):
+            samples, header = load_signal(path)
+        Fs = header.get('fs') or params['fs']
+        if Fs is None:
+            raise ValueError("frequência de amostragem desconhecida (use --fs para arquivos .txt)")
+        results = process_and_analyze_signal(
+            samples, Fs, cutoff_freq=params['cutoff_freq'], filter_order=params['filter_order'],
+            detection_threshold=params['threshold'], min_freq=params['min_freq'],
+            max_freq=params['max_freq'], method=params['method'], dtype=params['dtype'],
+            profiler=profiler)
+        row.update({
+            'num_samples': len(samples),
+            'fs': Fs,
+            'peak_freq_hz': float(results['detected_peak_freq']),
+            'period_s': float(results['detected_period']),
+            'snr_sigma': float(results['detection_sigma']),
+            'detected': bool(results['detected'])
+        })
+    except Exception as e:  # Um arquivo ruim não derruba o lote
+        row['error'] = f"{type(e).__name__}: {e}"
+    row['elapsed_s'] = time.perf_counter() - start
+    if profiler is None:
+        return row, None
+    profiler.close()
+    return row, profiler.report()
+
+
+def _journal_path(output):
+    """O diário é a própria saída CSV ou um CSV parcial ao lado da saída .npz"""
+    return output if output.endswith('.csv') else output + '.partial.csv'
+
+
+def read_journal(path):
+    """Linhas já gravadas no diário CSV (lista vazia se ele não existe)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def _is_complete(row):
+    """
+    Linha de sucesso gravada por inteiro: todas as colunas presentes, pico preenchido e
+    erro vazio. Uma última linha cortada por uma interrupção vem do DictReader com
+    campos None (ou faltando) e não conta como processada.
+    """
+    return (all(row.get(column) is not None for column in COLUMNS)
+            and row['peak_freq_hz'] != '' and row['error'] == '' and None not in row)
+
+
+def _write_npz(output, rows):
+    """Converte as linhas em uma tabela colunar .npz (um array por coluna)"""
+    columns = {
+        'path': np.array([row['path'] for row in rows], dtype=str),
+        'error': np.array([row['error'] for row in rows], dtype=str),
+        'detected': np.array([str(row['detected']) == 'True' for row in rows]),
+        'num_samples': np.array([int(row['num_samples'] or 0) for row in rows], dtype=np.int64)
+    }
+    for name in ('fs', 'peak_freq_hz', 'period_s', 'snr_sigma', 'elapsed_s'):
+        columns[name] = np.array([float(row[name]) if row[name] != '' else np.nan for row in rows])
+    np.savez(output, **columns)
+
+
+def run_batch(inputs, output, workers=None, resume=False, fs=None, cutoff_freq=55,
+              filter_order=5, threshold=3.0, min_freq=0.5, max_freq=None, method='fft',
+              dtype=None, profiler=None, verbose=True):
+    """
+    Processa todos os arquivos encontrados e grava a tabela em output (.csv ou .npz).
+    Com resume=True, arquivos com linha de sucesso completa no diário são pulados; as
+    linhas com erro ou incompletas (escrita interrompida) são reprocessadas. Retorna a lista final de linhas (dicionários).
+    Com um instrumentation.StageProfiler, cada worker mede seus estágios (com a mesma
+    opção de trace_memory) e os relatórios são somados nesse profiler.
+    """
+    if not output.endswith(('.csv', '.npz')):
+        raise ValueError("A saída deve terminar em .csv ou .npz")
+    journal = _journal_path(output)
+    done = []
+    if resume:
+        done = [row for row in read_journal(journal) if _is_complete(row)]
+    elif os.path.exists(journal):
+        os.remove(journal)
+    done_paths = {row['path'] for row in done}
+
+    paths = find_signal_files(inputs)
+    pending = [path for path in paths if path not in done_paths]
+    if verbose:
+        print(f"{len(paths)} arquivo(s) encontrado(s); {len(paths) - len(pending)} já processado(s), "
+              f"{len(pending)} pendente(s)")
+
+    params = {'fs': fs, 'cutoff_freq': cutoff_freq, 'filter_order': filter_order,
+              'threshold': threshold, 'min_freq': min_freq, 'max_freq': max_freq,
+              'method': method, 'dtype': dtype, 'profile': profiler is not None,
+              'trace_memory': profiler is not None and profiler.trace_memory}
+
+    # Reescreve o diário só com as linhas válidas e anexa cada resultado assim que chega
+    rows = list(done)
+    with open(journal, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(done)
+        f.flush()
+        if pending:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_process_file, (path, params)) for path in pending]
+                for i, future in enumerate(as_completed(futures), 1):
+                    row, report = future.result()
+                    if report is not None:
+                        profiler.merge(report)
+                    writer.writerow(row)
+                    f.flush()
+                    rows.append(row)
+                    if verbose:
+                        status = f"ERRO {row['error']}" if row['error'] else \
+                            f"{row['peak_freq_hz']:.3f} Hz, {row['snr_sigma']:.1f} σ"
+                        print(f"[{i}/{len(pending)}] {os.path.basename(row['path'])}: {status}")
+
+    if output.endswith('.npz'):
+        _write_npz(output, sorted(rows, key=lambda row: row['path']))
+        os.remove(journal)
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Detecção de pulsares em lote (sem interface gráfica)")
+    parser.add_argument('inputs', nargs='+', help="Arquivos (.sig/.txt), diretórios (só .sig) ou padrões glob")
+    parser.add_argument('-o', '--output', default='resultados.csv', help="Tabela de saída (.csv ou .npz)")
+    parser.add_argument('--workers', type=int, default=None, help="Processos no pool")
+    parser.add_argument('--resume', action='store_true', help="Pula arquivos já processados no diário")
+    parser.add_argument('--fs', type=float, default=None,
+                        help="Frequência de amostragem para arquivos sem cabeçalho (.txt)")
+    parser.add_argument('--cutoff', type=float, default=55, help="Corte do filtro passa-baixa (Hz)")
+    parser.add_argument('--order', type=int, default=5, help="Ordem do filtro")
+    parser.add_argument('--threshold', type=float, default=3.0, help="Limiar de detecção (sigmas corrigidos pelo número de bins)")
+    parser.add_argument('--min-freq', type=float, default=0.5, help="Início da banda de busca (Hz)")
+    parser.add_argument('--max-freq', type=float, default=None, help="Fim da banda de busca (Hz)")
+    parser.add_argument('--method', choices=('fft', 'welch', 'bartlett'), default='fft',
+                        help="Estimador espectral")
+    parser.add_argument('--float32', action='store_true', help="Processa em precisão simples (arquivos float32 já são processados em float32)")
+    parser.add_argument('--profile', action='store_true', help="Mede o tempo de cada estágio")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Com --profile, mede também o pico de memória (tracemalloc; mais lento)")
+    args = parser.parse_args()
+
+    profiler = StageProfiler(trace_memory=args.trace_memory) if args.profile else None
+    start = time.perf_counter()
+    rows = run_batch(args.inputs, args.output, workers=args.workers, resume=args.resume, fs=args.fs,
+                     cutoff_freq=args.cutoff, filter_order=args.order, threshold=args.threshold,
+                     min_freq=args.min_freq, max_freq=args.max_freq, method=args.method,
+                     dtype=np.float32 if args.float32 else None, profiler=profiler)
+    n_errors = sum(1 for row in rows if row['error'])
+    n_detected = sum(1 for row in rows if str(row['detected']) == 'True')
+    print(f"Concluído em {time.perf_counter() - start:.1f} s: {len(rows)} arquivo(s), "
+          f"{n_detected} detecção(ões), {n_errors} erro(s) → {args.output}")
+    if profiler is not None:
+        print("\n" + profiler.format_report())
+    sys.exit(1 if n_errors else 0)
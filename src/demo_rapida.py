@@ -7,6 +7,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from generate_signal import generate_and_save_random_signal
 from process_signal import process_and_analyze_signal
+from plot_decimation import plot_decimated
 
 def demo_completa():
     """Demonstração completa do pipeline de detecção"""
@@ -27,8 +28,8 @@ def demo_completa():
     
     # Passo 1: Gerar sinal
     print("1️⃣ Gerando sinal sintético...")
-    np.random.seed(42)  # Para reprodutibilidade
-    noisy_signal, time_vector = generate_and_save_random_signal(Fs, duration, noise_amplitude)
+    noisy_signal, time_vector, _ = generate_and_save_random_signal(
+        Fs, duration, noise_amplitude, rng=42, educational=True)  # Reprodutível
     print(f"   ✅ Sinal gerado com {len(noisy_signal)} amostras")
     
     # Passo 2: Processar sinal
@@ -47,11 +48,13 @@ def demo_completa():
     
     # Passo 3: Resultados
     print("\n3️⃣ Resultados da detecção:")
-    if results['detected_peak_freq'] > 0:
+    if results['detected']:
         print(f"   🎯 Frequência detectada: {results['detected_peak_freq']:.2f} Hz")
         print(f"   ⏰ Período detectado: {results['detected_period']:.3f} s")
+        print(f"   📈 Significância: {results['detection_sigma']:.1f} σ")
         print(f"   ✅ STATUS: PULSAR DETECTADO!")
     else:
+        print(f"   📈 Significância do maior pico: {results['detection_sigma']:.1f} σ (abaixo do limiar)")
         print(f"   ❌ STATUS: PULSAR NÃO DETECTADO")
     
     # Passo 4: Plotar resultados
@@ -61,9 +64,15 @@ def demo_completa():
     fig, axes = plt.subplots(2, 2, figsize=(15, 10))
     fig.suptitle('🌟 DEMONSTRAÇÃO: DETECÇÃO DE PULSARES', fontsize=16, fontweight='bold')
     
+    # Séries completas com decimação min/max: o zoom da barra de ferramentas revela o detalhe
+    # (a lista mantém as linhas vivas enquanto a janela estiver aberta)
+    decimated_lines = []
+
     # Plot 1: Sinal no tempo
-    axes[0,0].plot(time_vector[:1000], noisy_signal[:1000], 'b-', alpha=0.7, label='Sinal Ruidoso')
-    axes[0,0].plot(time_vector[:1000], results['filtered_signal'][:1000], 'r-', linewidth=2, label='Sinal Filtrado')
+    decimated_lines.append(plot_decimated(axes[0,0], time_vector, noisy_signal, 'b-', alpha=0.7,
+                                          label='Sinal Ruidoso'))
+    decimated_lines.append(plot_decimated(axes[0,0], time_vector, results['filtered_signal'], 'r-',
+                                          linewidth=2, label='Sinal Filtrado'))
     axes[0,0].set_title('Sinais no Domínio do Tempo')
     axes[0,0].set_xlabel('Tempo (s)')
     axes[0,0].set_ylabel('Amplitude')
@@ -72,10 +81,11 @@ def demo_completa():
     axes[0,0].set_xlim(0, 1)
     
     # Plot 2: Espectro de potência
-    axes[0,1].semilogy(results['frequencies'], results['power_spectrum_original'], 
-                       'b-', alpha=0.7, label='Original')
-    axes[0,1].semilogy(results['frequencies'], results['power_spectrum_filtered'], 
-                       'r-', linewidth=2, label='Filtrado')
+    decimated_lines.append(plot_decimated(axes[0,1], results['frequencies'], results['power_spectrum_original'],
+                                          'b-', alpha=0.7, label='Original'))
+    decimated_lines.append(plot_decimated(axes[0,1], results['frequencies'], results['power_spectrum_filtered'],
+                                          'r-', linewidth=2, label='Filtrado'))
+    axes[0,1].set_yscale('log')
     axes[0,1].axvline(x=results['cutoff_freq'], color='g', linestyle='--', 
                       label=f'Corte ({results["cutoff_freq"]} Hz)')
     if results['detected_peak_freq'] > 0:
@@ -90,7 +100,8 @@ def demo_completa():
     axes[0,1].set_xlim(0, 100)
     
     # Plot 3: Zoom no espectro
-    axes[1,0].plot(results['frequencies'], results['power_spectrum_filtered'], 'r-', linewidth=2)
+    decimated_lines.append(plot_decimated(axes[1,0], results['frequencies'], results['power_spectrum_filtered'],
+                                          'r-', linewidth=2))
     if results['detected_peak_freq'] > 0:
         axes[1,0].axvline(x=results['detected_peak_freq'], color='purple', 
                           linestyle='--', linewidth=2,
@@ -110,7 +121,8 @@ def demo_completa():
 🔍 DETECÇÃO:
 • Frequência: {results['detected_peak_freq']:.2f} Hz
 • Período: {results['detected_period']:.3f} s
-• Status: {"✅ DETECTADO" if results['detected_peak_freq'] > 0 else "❌ NÃO DETECTADO"}
+• Significância: {results['detection_sigma']:.1f} σ
+• Status: {"✅ DETECTADO" if results['detected'] else "❌ NÃO DETECTADO"}
 
 ⚙️ PROCESSAMENTO:
 • Filtro: Butterworth {results['filter_order']}ª ordem
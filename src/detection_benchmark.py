@@ -0,0 +1,180 @@
+"""
+Campanha Monte-Carlo de eficiência de detecção.
+Gera N sinais sintéticos por configuração (tipo de sinal × amplitude de ruído),
+processa cada um com process_and_analyze_signal em um pool de processos e
+reporta taxa de detecção, taxa de falso alarme, erro de frequência e vazão
+(amostras por segundo). Serve para dimensionar hardware e flagrar regressões.
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from generate_signal import sample_signal_parameters, synthesize_signal, add_noise, spawn_rngs, SIGNAL_TYPES
+from process_signal import process_and_analyze_signal
+
+
+def _run_block(task):
+    """Executa um bloco de sinais de uma configuração (roda dentro do worker)"""
+    signal_type, noise_amplitude, rng, n_signals, params = task
+    Fs = params['Fs']
+    freq_tolerance = params['freq_tolerance']
+
+    n_detected = 0
+    n_false_alarms = 0
+    freq_errors = []
+    elapsed = 0.0
+    n_samples = 0
+
+    # Vetor de tempo e buffer do sinal limpo são compartilhados por todo o bloco;
+    # por sinal só se sorteiam os parâmetros e se sintetizam as amostras uma vez
+    t = np.arange(0, params['duration'], 1 / Fs)
+    clean = np.empty(len(t))
+
+    for _ in range(n_signals):
+        info = sample_signal_parameters(rng, signal_type=signal_type)
+        clean.fill(0.0)
+        signal = add_noise(synthesize_signal(t, info, out=clean), noise_amplitude, rng)
+
+        start = time.perf_counter()
+        results = process_and_analyze_signal(signal, Fs, cutoff_freq=params['cutoff_freq'],
+                                             filter_order=params['filter_order'],
+                                             detection_threshold=params['threshold'])
+        elapsed += time.perf_counter() - start
+        n_samples += len(signal)
+
+        if not results['detected']:
+            continue  # Nada significativo: não é detecção nem falso alarme
+
+        true_freqs = np.asarray(info['frequencies'])
+        if true_freqs.size:
+            error = np.min(np.abs(true_freqs - results['detected_peak_freq']))
+            if error <= freq_tolerance:
+                n_detected += 1
+                freq_errors.append(error)
+                continue
+        n_false_alarms += 1
+
+    return {
+        'signal_type': signal_type,
+        'noise_amplitude': noise_amplitude,
+        'n_signals': n_signals,
+        'n_detected': n_detected,
+        'n_false_alarms': n_false_alarms,
+        'freq_errors': freq_errors,
+        'elapsed': elapsed,
+        'n_samples': n_samples
+    }
+
+
+def run_detection_campaign(n_signals=200, noise_amplitudes=(0.25, 0.5, 1.0, 2.0),
+                           signal_types=SIGNAL_TYPES, Fs=1000, duration=2, cutoff_freq=35,
+                           filter_order=5, threshold=3.0, freq_tolerance=None,
+                           seed=0, max_workers=None, block_size=25):
+    """
+    Roda a campanha e retorna (linhas, resumo).
+    Cada linha corresponde a uma configuração (tipo de sinal, amplitude de ruído).
+
+    Args:
+        threshold: Significância mínima (sigmas corrigidos pelo número de bins) para declarar detecção
+        freq_tolerance: Erro máximo (Hz) para a detecção coincidir com uma componente
+            injetada (None = resolução da FFT, Fs/N)
+        seed: Semente da campanha; os blocos recebem geradores filhos (spawn_rngs),
+            então o resultado não depende do número de workers
+    """
+    if freq_tolerance is None:
+        freq_tolerance = Fs / int(round(Fs * duration))
+    params = {
+        'Fs': Fs,
+        'duration': duration,
+        'cutoff_freq': cutoff_freq,
+        'filter_order': filter_order,
+        'threshold': threshold,
+        'freq_tolerance': freq_tolerance
+    }
+
+    # Divide cada configuração em blocos de tamanho fixo para balancear os workers
+    configs = [(signal_type, noise) for signal_type in signal_types for noise in noise_amplitudes]
+    blocks = []
+    for signal_type, noise in configs:
+        remaining = n_signals
+        while remaining > 0:
+            size = min(block_size, remaining)
+            blocks.append((signal_type, noise, size))
+            remaining -= size
+    rngs = spawn_rngs(seed, len(blocks))
+    tasks = [(signal_type, noise, rng, size, params)
+             for (signal_type, noise, size), rng in zip(blocks, rngs)]
+
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        block_results = list(pool.map(_run_block, tasks))
+    wall_time = time.perf_counter() - wall_start
+
+    # Agrega os blocos por configuração
+    rows = []
+    for signal_type, noise in configs:
+        parts = [b for b in block_results
+                 if b['signal_type'] == signal_type and b['noise_amplitude'] == noise]
+        total = sum(b['n_signals'] for b in parts)
+        errors = [e for b in parts for e in b['freq_errors']]
+        elapsed = sum(b['elapsed'] for b in parts)
+        samples = sum(b['n_samples'] for b in parts)
+        has_signal = signal_type != 'noise_only'
+        rows.append({
+            'signal_type': signal_type,
+            'noise_amplitude': noise,
+            'n_signals': total,
+            'detection_rate': sum(b['n_detected'] for b in parts) / total if has_signal else np.nan,
+            'false_alarm_rate': sum(b['n_false_alarms'] for b in parts) / total,
+            'mean_freq_error_hz': float(np.mean(errors)) if errors else np.nan,
+            'samples_per_second': samples / elapsed if elapsed > 0 else np.inf
+        })
+
+    total_samples = sum(b['n_samples'] for b in block_results)
+    summary = {
+        'n_signals': sum(b['n_signals'] for b in block_results),
+        'wall_time_s': wall_time,
+        'samples_per_second': total_samples / wall_time if wall_time > 0 else np.inf
+    }
+    return rows, summary
+
+
+def _fmt(value, spec):
+    """Formata um valor da tabela, mostrando '—' quando não se aplica (NaN)"""
+    return '—' if np.isnan(value) else format(value, spec)
+
+
+def print_report(rows, summary):
+    """Imprime a tabela de resultados da campanha"""
+    print(f"{'tipo':<11} {'ruído':>6} {'N':>6} {'detecção':>9} {'falso al.':>9} "
+          f"{'erro (Hz)':>10} {'amostras/s':>12}")
+    print("-" * 69)
+    for row in rows:
+        print(f"{row['signal_type']:<11} {row['noise_amplitude']:>6.2f} {row['n_signals']:>6d} "
+              f"{_fmt(row['detection_rate'], '.1%'):>9} {row['false_alarm_rate']:>9.1%} "
+              f"{_fmt(row['mean_freq_error_hz'], '.3f'):>10} {row['samples_per_second']:>12.3g}")
+    print("-" * 69)
+    print(f"Total: {summary['n_signals']} sinais em {summary['wall_time_s']:.2f} s "
+          f"({summary['samples_per_second']:.3g} amostras/s no pool)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Campanha Monte-Carlo de eficiência de detecção")
+    parser.add_argument('--n-signals', type=int, default=200, help="Sinais por configuração")
+    parser.add_argument('--noise', type=float, nargs='+', default=[0.25, 0.5, 1.0, 2.0],
+                        help="Amplitudes de ruído da grade")
+    parser.add_argument('--fs', type=float, default=1000, help="Frequência de amostragem (Hz)")
+    parser.add_argument('--duration', type=float, default=2, help="Duração de cada sinal (s)")
+    parser.add_argument('--workers', type=int, default=None, help="Processos no pool")
+    parser.add_argument('--seed', type=int, default=0, help="Semente da campanha")
+    args = parser.parse_args()
+
+    print("🎯 CAMPANHA MONTE-CARLO DE DETECÇÃO")
+    print("=" * 69)
+    rows, summary = run_detection_campaign(n_signals=args.n_signals, noise_amplitudes=args.noise,
+                                           Fs=args.fs, duration=args.duration,
+                                           seed=args.seed, max_workers=args.workers)
+    print_report(rows, summary)
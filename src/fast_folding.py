@@ -0,0 +1,191 @@
+"""
+Busca de periodicidade pelo Fast Folding Algorithm (FFA) para pulsares lentos.
+A busca pela FFT começa em min_freq (0.5 Hz) e perde sensibilidade para pulsos
+estreitos de período longo, cuja potência se espalha por muitos harmônicos. O FFA
+dobra o sinal em todos os períodos de teste de uma faixa: o sinal é reamostrado
+para b caixas por período base, arrumado em m linhas de b caixas e uma borboleta
+recursiva (log₂ m etapas vetorizadas, cada uma somando pares de blocos com
+deslocamentos circulares) produz os m perfis dos períodos b + s/(m-1) caixas,
+s = 0..m-1, em O(N log m) em vez de O(N·m). Cada perfil é pontuado pelo S/N do
+melhor filtro casado retangular (boxcar) de algumas larguras.
+"""
+
+import numpy as np
+
+from epoch_folding import fold_signal
+
+# Larguras (em caixas de fase) dos filtros retangulares usados no S/N dos perfis
+DEFAULT_WIDTHS = (1, 2, 3, 4, 6, 8, 12, 16)
+
+
+def downsample(x, factor):
+    """
+    Reamostra o sinal pela média em caixas de largura `factor` amostras (≥ 1, pode ser
+    fracionária): cada saída é a integral exata da série, vista como constante por
+    amostra, entre k·factor e (k+1)·factor, dividida por factor.
+    """
+    if factor < 1:
+        raise ValueError(f"O fator de reamostragem deve ser ≥ 1 (recebido {factor})")
+    x = np.asarray(x, dtype=float)
+    n_out = int(len(x) / factor)
+    cumulative = np.concatenate(([0.0], np.cumsum(x)))
+    edges = np.interp(np.arange(n_out + 1) * factor, np.arange(len(cumulative)), cumulative)
+    return np.diff(edges) / factor
+
+
+def ffa_transform(data):
+    """
+    Transformada FFA de uma matriz (m, b): m períodos consecutivos de b caixas.
+    As linhas são completadas com zeros até M = próxima potência de 2; a linha s da
+    saída (M, b) é a soma das linhas de entrada com a linha i deslocada ≈ i·s/(M-1)
+    caixas, ou seja, o perfil dobrado no período b + s/(M-1) caixas. Os deslocamentos
+    são arredondados a cada etapa da borboleta, então o erro acumulado é de cerca de
+    uma caixa (menor que a largura dos pulsos procurados).
+    """
+    data = np.asarray(data, dtype=float)
+    m, b = data.shape
+    M = 1 << max(m - 1, 0).bit_length()
+    profiles = np.zeros((M, 1, b))
+    profiles[:m, 0] = data
+
+    columns = np.arange(b)
+    h = 1
+    while h < M:
+        # Pares de blocos vizinhos (cabeça, cauda) de h linhas já transformadas viram um de 2h
+        pairs = profiles.reshape(-1, 2, h, b)
+        s = np.arange(2 * h)
+        j = s // 2  # Perfil de cabeça e de cauda com metade da deriva total s
+        shift = s - j  # Deslocamento da cauda para que a última linha derive s caixas
+        rolled = (columns + shift[:, np.newaxis]) % b
+        profiles = pairs[:, 0, j] + np.take_along_axis(pairs[:, 1, j], rolled[np.newaxis], axis=-1)
+        h *= 2
+    return profiles.reshape(M, b)
+
+
+def _profile_snr(profiles, n_rows, sigma, widths):
+    """
+    S/N de cada perfil pelo melhor filtro retangular circular: para a largura w,
+    (maior soma de w caixas consecutivas - w·média) / (σ·√(n_rows·w·(1 - w/b))),
+    que é ~N(0, 1) por fase para ruído branco de desvio σ por caixa.
+    Retorna (S/N, largura escolhida) por perfil.
+    """
+    b = profiles.shape[-1]
+    widths = [w for w in widths if w < b]
+    centered = profiles - profiles.mean(axis=-1, keepdims=True)
+    w_max = max(widths)
+    wrapped = np.concatenate([centered, centered[:, :w_max]], axis=-1)
+    cumulative = np.zeros((len(wrapped), b + w_max + 1))
+    np.cumsum(wrapped, axis=-1, out=cumulative[:, 1:])
+
+    best_snr = np.full(len(profiles), -np.inf)
+    best_width = np.zeros(len(profiles), dtype=int)
+    for w in widths:
+        boxcar = np.max(cumulative[:, w:w + b] - cumulative[:, :b], axis=-1)
+        snr = boxcar / (sigma * np.sqrt(n_rows * w * (1 - w / b)))
+        better = snr > best_snr
+        best_snr = np.where(better, snr, best_snr)
+        best_width = np.where(better, w, best_width)
+    return best_snr, best_width
+
+
+def ffa_search(x, Fs, min_period, max_period, bins_min=128, bins_max=None, widths=DEFAULT_WIDTHS):
+    """
+    Dobra o sinal em todos os períodos de min_period a max_period (segundos) pelo FFA.
+    A faixa é percorrida em oitavas: em cada uma o sinal é reamostrado para que o
+    menor período da oitava tenha bins_min caixas, e cada número inteiro de caixas
+    b em [bins_min, bins_max) cobre os períodos de b a b + 1 caixas com resolução
+    de 1/(m-1) caixa. Cada b custa O(N/fator · log m); mais caixas por período
+    dão perfis mais finos (melhor S/N para pulsos estreitos) a um custo proporcional.
+
+    Args:
+        min_period, max_period: Faixa de períodos de teste em segundos (min_period·Fs
+            precisa ser ≥ bins_min: a reamostragem só reduz a taxa)
+        bins_min, bins_max: Caixas de fase por período dentro de cada oitava
+            (bins_max=None usa 2·bins_min)
+        widths: Larguras (caixas) dos filtros retangulares do S/N
+
+    Retorna dicionário com a grade (periods, snrs, widths) em ordem crescente de
+    período, o melhor período, seu S/N, a largura do pulso em segundos e o perfil
+    dobrado (bins_min caixas) no melhor período.
+    """
+    if not 0 < min_period < max_period:
+        raise ValueError(f"Faixa de períodos inválida: {min_period} a {max_period} s")
+    if bins_max is None:
+        bins_max = 2 * bins_min
+    if bins_max <= bins_min:
+        raise ValueError("bins_max deve ser maior que bins_min")
+    if min_period * Fs < bins_min:
+        raise ValueError(f"min_period·Fs = {min_period * Fs:g} amostras < bins_min = {bins_min}: "
+                         f"use um período mínimo ≥ {bins_min / Fs:g} s ou menos caixas")
+    x = np.asarray(x, dtype=float)
+
+    all_periods, all_snrs, all_widths = [], [], []
+    octave_start = min_period
+    while octave_start < max_period:
+        factor = octave_start * Fs / bins_min
+        reduced = downsample(x, factor)
+        reduced -= reduced.mean()
+        # Desvio robusto por caixa (1.4826·MAD), pouco afetado por pulsos estreitos
+        sigma = 1.4826 * np.median(np.abs(reduced - np.median(reduced))) or reduced.std()
+        dt = factor / Fs
+        for b in range(bins_min, bins_max):
+            if b * dt > max_period:
+                break
+            m = len(reduced) // b
+            if m < 2 or sigma == 0:
+                break  # Menos de dois períodos no sinal: nada a dobrar
+            profiles = ffa_transform(reduced[:m * b].reshape(m, b))
+            M = len(profiles)
+            # A linha M-1 tem período b + 1 caixas, que é a primeira do próximo b
+            periods = (b + np.arange(M - 1) / (M - 1)) * dt
+            snrs, box_widths = _profile_snr(profiles[:-1], m, sigma, widths)
+            keep = (periods >= min_period) & (periods <= max_period)
+            all_periods.append(periods[keep])
+            all_snrs.append(snrs[keep])
+            all_widths.append(box_widths[keep] * dt)
+        octave_start *= bins_max / bins_min
+
+    periods = np.concatenate(all_periods) if all_periods else np.empty(0)
+    snrs = np.concatenate(all_snrs) if all_snrs else np.empty(0)
+    pulse_widths = np.concatenate(all_widths) if all_widths else np.empty(0)
+    if len(periods) == 0:
+        return {'period': np.nan, 'snr': 0.0, 'width': np.nan, 'profile': np.full(bins_min, np.nan),
+                'periods': periods, 'snrs': snrs, 'widths': pulse_widths}
+
+    best = int(np.argmax(snrs))
+    profile, _ = fold_signal(x, Fs, periods[best], bins_min)
+    return {
+        'period': periods[best],
+        'snr': snrs[best],
+        'width': pulse_widths[best],
+        'profile': profile,
+        'periods': periods,
+        'snrs': snrs,
+        'widths': pulse_widths
+    }
+
+
+if __name__ == '__main__':
+    # Exemplo: pulsar lento (período de 3.7 s, pulso de 1% do período) abaixo de 0.5 Hz
+    import time
+    from process_signal import process_and_analyze_signal
+
+    Fs_test = 1000
+    duration_test = 120
+    period_test = 3.7
+    rng = np.random.default_rng(1)
+    t_test = np.arange(0, duration_test, 1 / Fs_test)
+    phase = (t_test / period_test) % 1.0
+    test_signal = 0.3 * (phase < 0.01) + rng.standard_normal(len(t_test))
+
+    results = process_and_analyze_signal(test_signal, Fs_test, cutoff_freq=35)
+    print(f"Período real: {period_test:.4f} s")
+    print(f"FFT:  pico em {results['detected_peak_freq']:.3f} Hz, "
+          f"{results['detection_sigma']:.1f} σ, detectado={results['detected']}")
+
+    start = time.perf_counter()
+    search = ffa_search(results['filtered_signal'], Fs_test, 1.0, 10.0)
+    elapsed = time.perf_counter() - start
+    print(f"FFA:  período {search['period']:.4f} s, S/N {search['snr']:.1f}, "
+          f"largura {search['width'] * 1e3:.0f} ms "
+          f"({len(search['periods'])} períodos testados em {elapsed:.2f} s)")
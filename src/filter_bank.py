@@ -0,0 +1,57 @@
+from collections import OrderedDict
+
+from scipy.signal import butter
+
+
+class FilterBank:
+    """
+    Banco de filtros Butterworth com cache LRU.
+    Guarda os filtros já projetados em forma de seções de segunda ordem (SOS),
+    indexados por (Fs, corte, ordem, tipo), para evitar reprojetar o mesmo filtro
+    a cada sinal processado. Expõe contadores de acertos (hits) e faltas (misses).
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def get_sos(self, Fs, cutoff_freq, filter_order, btype='low'):
+        """
+        Retorna os coeficientes SOS do filtro, projetando-o apenas na primeira vez.
+        O array devolvido é compartilhado entre chamadas e não deve ser modificado.
+        """
+        key = (float(Fs), float(cutoff_freq), int(filter_order), btype)
+        sos = self._cache.get(key)
+        if sos is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return sos
+
+        self.misses += 1
+        Wn = cutoff_freq / (Fs / 2)  # Frequência de corte normalizada
+        sos = butter(filter_order, Wn, btype=btype, analog=False, output='sos')
+        self._cache[key] = sos
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)  # Remove o filtro usado há mais tempo
+        return sos
+
+    def cache_info(self):
+        """Resumo do estado do cache (no estilo de functools.lru_cache)"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'maxsize': self.maxsize,
+            'currsize': len(self._cache)
+        }
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Banco compartilhado usado por process_signal quando nenhum outro é informado
+default_filter_bank = FilterBank()
@@ -1,98 +1,200 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
-def generate_and_save_random_signal(Fs, duration, noise_amplitude, force_random=False):
+from signal_storage import save_signal
+from instrumentation import stage
+
+# Tipos de sinal do modo aleatório
+SIGNAL_TYPES = ('pulsar', 'noise_only', 'irregular')
+
+def _synthesize_components(t, frequencies, amplitudes, phases, dtype=np.float64, out=None):
     """
-    Gera um sinal sintético com componentes senoidais aleatórias e ruído.
-    Retorna o sinal ruidoso e o vetor de tempo.
-    
+    Soma das senoides Aᵢ·sin(2πfᵢt + φᵢ) acumulada no lugar.
+    Usa um único buffer de trabalho pré-alocado em vez de um temporário por
+    componente; a fase é calculada em float64 mesmo quando a saída é float32.
+    """
+    signal = np.zeros(len(t), dtype=dtype) if out is None else out
+    scratch = np.empty(len(t))
+    for freq, amp, phase in zip(frequencies, amplitudes, phases):
+        np.multiply(t, 2 * np.pi * freq, out=scratch)
+        scratch += phase
+        np.sin(scratch, out=scratch)
+        scratch *= amp
+        signal += scratch
+    return signal
+
+def spawn_rngs(seed, n_streams):
+    """
+    Cria n_streams geradores independentes a partir de uma semente, via
+    SeedSequence.spawn. Cada processo/worker recebe seu próprio fluxo, de forma
+    que a geração em paralelo é determinística e sem estado global compartilhado.
+    """
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed_seq.spawn(n_streams)]
+
+def sample_signal_parameters(rng=None, educational=False, signal_type=None, force_random=False):
+    """
+    Estágio 1 do gerador: sorteia só os parâmetros das componentes, sem gerar amostras.
+    Retorna um dicionário com frequencies, amplitudes, phases, num_components e
+    signal_type ('educational' no modo educativo, que não consome o gerador).
+
     Args:
-        force_random: Se True, força geração totalmente aleatória (pode não ter pulsar)
+        rng: numpy.random.Generator, semente (int/SeedSequence) ou None para entropia nova
+        educational: Se True, usa as componentes fixas do modo educativo (5, 15, 25 Hz)
+        signal_type: 'pulsar', 'noise_only' ou 'irregular' para fixar o tipo no modo
+            aleatório (None = sorteado com probabilidades 0.6/0.2/0.2)
+        force_random: Se True, força geração totalmente aleatória mesmo com educational=True
     """
-    T = 1 / Fs
-    t = np.arange(0, duration, T)
+    if signal_type not in (None,) + SIGNAL_TYPES:
+        raise ValueError(f"Tipo de sinal desconhecido: {signal_type!r}")
 
     # Verificar se deve usar modo educativo ou aleatório
-    use_educational_mode = not force_random and hasattr(np.random, 'get_state') and np.random.get_state()[1][0] == 42
-    
-    if use_educational_mode:
+    if educational and not force_random:
         # Modo educativo: usar frequências específicas para demonstração
-        frequencies = [5, 15, 25]  # Hz - bem separadas para visualização
-        amplitudes = [1.5, 1.0, 0.8]
-        phases = [0, np.pi/4, np.pi/2]
-        num_components = 3
+        return {
+            'frequencies': [5, 15, 25],  # Hz - bem separadas para visualização
+            'amplitudes': [1.5, 1.0, 0.8],
+            'phases': [0, np.pi/4, np.pi/2],
+            'num_components': 3,
+            'signal_type': 'educational'
+        }
+
+    # Modo aleatório: pode gerar diferentes tipos de sinais
+    rng = np.random.default_rng(rng)
+    if signal_type is None:
+        signal_type = str(rng.choice(SIGNAL_TYPES, p=[0.6, 0.2, 0.2]))
+
+    frequencies = []
+    amplitudes = []
+    phases = []
+    if signal_type == 'noise_only':
+        # Apenas ruído - simula não detecção de pulsar
+        num_components = 0
+    elif signal_type == 'irregular':
+        # Componentes com frequências muito próximas ou muito fracas
+        num_components = int(rng.integers(1, 4))
+        
+        base_freq = rng.uniform(1, 10)
+        for i in range(num_components):
+            # Frequências próximas que podem causar batimento
+            frequencies.append(base_freq + i * rng.uniform(0.1, 2))
+            amplitudes.append(rng.uniform(0.2, 0.6))  # Amplitudes menores
+            phases.append(rng.uniform(0, 2 * np.pi))
     else:
-        # Modo aleatório: pode gerar diferentes tipos de sinais
-        signal_type = np.random.choice(['pulsar', 'noise_only', 'irregular'], p=[0.6, 0.2, 0.2])
+        # Pulsar típico com componentes bem definidas
+        num_components = int(rng.integers(2, 5))
         
-        if signal_type == 'noise_only':
-            # Apenas ruído - simula não detecção de pulsar
-            num_components = 0
-            frequencies = []
-            amplitudes = []
-            phases = []
-        elif signal_type == 'irregular':
-            # Componentes com frequências muito próximas ou muito fracas
-            num_components = np.random.randint(1, 4)
-            frequencies = []
-            amplitudes = []
-            phases = []
-            
-            base_freq = np.random.uniform(1, 10)
-            for i in range(num_components):
-                # Frequências próximas que podem causar batimento
-                frequencies.append(base_freq + i * np.random.uniform(0.1, 2))
-                amplitudes.append(np.random.uniform(0.2, 0.6))  # Amplitudes menores
-                phases.append(np.random.uniform(0, 2 * np.pi))
-        else:
-            # Pulsar típico com componentes bem definidas
-            num_components = np.random.randint(2, 5)
-            frequencies = []
-            amplitudes = []
-            phases = []
-            
-            # Frequência fundamental
-            fundamental = np.random.uniform(2, 20)
-            frequencies.append(fundamental)
-            amplitudes.append(np.random.uniform(1.0, 2.5))
-            phases.append(np.random.uniform(0, 2 * np.pi))
+        # Frequência fundamental
+        fundamental = rng.uniform(2, 20)
+        frequencies.append(fundamental)
+        amplitudes.append(rng.uniform(1.0, 2.5))
+        phases.append(rng.uniform(0, 2 * np.pi))
+        
+        # Harmônicos ou frequências relacionadas
+        for i in range(1, num_components):
+            if rng.random() < 0.7:  # 70% chance de ser harmônico
+                freq = fundamental * (i + 1) + rng.uniform(-1, 1)
+            else:  # Frequência independente
+                freq = rng.uniform(5, 50)
             
-            # Harmônicos ou frequências relacionadas
-            for i in range(1, num_components):
-                if np.random.random() < 0.7:  # 70% chance de ser harmônico
-                    freq = fundamental * (i + 1) + np.random.uniform(-1, 1)
-                else:  # Frequência independente
-                    freq = np.random.uniform(5, 50)
-                
-                frequencies.append(freq)
-                amplitudes.append(np.random.uniform(0.3, 1.5))
-                phases.append(np.random.uniform(0, 2 * np.pi))
-
-    # Gerar sinal como superposição
-    signal = np.zeros_like(t)
-    for i in range(num_components):
-        component = amplitudes[i] * np.sin(2 * np.pi * frequencies[i] * t + phases[i])
-        signal += component
-
-    # Adicionar ruído gaussiano
-    noise = noise_amplitude * np.random.randn(len(t))
-    noisy_signal = signal + noise
+            frequencies.append(freq)
+            amplitudes.append(rng.uniform(0.3, 1.5))
+            phases.append(rng.uniform(0, 2 * np.pi))
 
-    # Salvar informações para debugging
-    signal_info = {
+    return {
         'frequencies': frequencies,
         'amplitudes': amplitudes,
         'phases': phases,
         'num_components': num_components,
+        'signal_type': signal_type
+    }
+
+def synthesize_signal(t, signal_info, dtype=np.float64, out=None):
+    """Estágio 2 do gerador: sinal limpo (soma das componentes de signal_info)"""
+    return _synthesize_components(t, signal_info['frequencies'], signal_info['amplitudes'],
+                                  signal_info['phases'], dtype=dtype, out=out)
+
+def component_signals(t, signal_info, dtype=np.float64):
+    """
+    Variante do estágio 2 que mantém cada componente separada (para visualização).
+    Retorna uma lista de dicionários com signal, freq, amp e phase.
+    """
+    components = []
+    for freq, amp, phase in zip(signal_info['frequencies'], signal_info['amplitudes'],
+                                signal_info['phases']):
+        components.append({
+            'signal': _synthesize_components(t, [freq], [amp], [phase], dtype=dtype),
+            'freq': freq,
+            'amp': amp,
+            'phase': phase
+        })
+    return components
+
+def add_noise(signal, noise_amplitude, rng=None, dtype=np.float64):
+    """
+    Estágio 3 do gerador: soma ruído gaussiano branco ao sinal limpo.
+    O ruído é sorteado e acumulado no lugar, sem temporários extras; o sinal
+    de entrada não é modificado. Com dtype=np.float32 o ruído já é sorteado em
+    precisão simples (outro fluxo de números que o de float64, mas sem nenhum
+    array de float64 do tamanho do sinal).
+    """
+    rng = np.random.default_rng(rng)
+    if np.dtype(dtype) == np.float32:
+        noisy_signal = rng.standard_normal(len(signal), dtype=np.float32)
+    else:
+        noisy_signal = rng.standard_normal(len(signal))
+    noisy_signal *= noise_amplitude
+    noisy_signal += signal
+    return noisy_signal.astype(dtype, copy=False)
+
+def generate_and_save_random_signal(Fs, duration, noise_amplitude, force_random=False,
+                                    dtype=np.float64, rng=None, educational=False,
+                                    signal_type=None, profiler=None):
+    """
+    Gera um sinal sintético com componentes senoidais aleatórias e ruído.
+    Retorna o sinal ruidoso, o vetor de tempo e as informações do sinal.
+    Encadeia os três estágios (sample_signal_parameters, synthesize_signal e
+    add_noise); use-os separadamente para reaproveitar resultados intermediários.
+    
+    Args:
+        force_random: Se True, força geração totalmente aleatória mesmo com educational=True
+        dtype: Tipo do sinal retornado (np.float32 gera tudo em precisão simples e reduz
+            a memória pela metade)
+        rng: numpy.random.Generator, semente (int/SeedSequence) ou None para entropia nova
+        educational: Se True, usa as componentes fixas do modo educativo (5, 15, 25 Hz)
+        signal_type: 'pulsar', 'noise_only' ou 'irregular' para fixar o tipo no modo
+            aleatório (None = sorteado com probabilidades 0.6/0.2/0.2)
+        profiler: instrumentation.StageProfiler opcional; mede sample_parameters,
+            synthesis e noise
+    """
+    rng = np.random.default_rng(rng)
+    T = 1 / Fs
+    t = np.arange(0, duration, T)
+
+    with stage(profiler, 'sample_parameters'):
+        params = sample_signal_parameters(rng, educational, signal_type, force_random)
+
+    # Gerar sinal como superposição e adicionar ruído gaussiano
+    with stage(profiler, 'synthesis'):
+        signal = synthesize_signal(t, params,
+                                   dtype=np.float32 if np.dtype(dtype) == np.float32 else np.float64)
+    with stage(profiler, 'noise'):
+        noisy_signal = add_noise(signal, noise_amplitude, rng, dtype)
+
+    # Salvar informações para debugging
+    signal_info = {
+        'frequencies': params['frequencies'],
+        'amplitudes': params['amplitudes'],
+        'phases': params['phases'],
+        'num_components': params['num_components'],
         'noise_amplitude': noise_amplitude,
         'fs': Fs,
         'duration': duration,
-        'signal_type': 'educational' if use_educational_mode else signal_type if 'signal_type' in locals() else 'pulsar'
+        'signal_type': params['signal_type']
     }
     
     return noisy_signal, t, signal_info
 
-def generate_educational_components(Fs, duration):
+def generate_educational_components(Fs, duration, dtype=np.float64):
     """
     Gera componentes individuais para demonstração educativa.
     Retorna lista de componentes e parâmetros.
@@ -109,7 +211,8 @@ def generate_educational_components(Fs, duration):
     
     components = []
     for comp_data in components_data:
-        signal = comp_data['amp'] * np.sin(2 * np.pi * comp_data['freq'] * t + comp_data['phase'])
+        signal = _synthesize_components(t, [comp_data['freq']], [comp_data['amp']],
+                                        [comp_data['phase']], dtype=dtype)
         components.append({
             'signal': signal,
             'time': t,
@@ -134,87 +237,19 @@ if __name__ == '__main__':
     print("\n1️⃣ Gerando componentes educativas...")
     components, comp_data = generate_educational_components(Fs_default, duration_default)
     
-    # Plotar componentes individuais
-    plt.figure(figsize=(12, 8))
-    
-    # Subplot das componentes
-    plt.subplot(2, 2, 1)
-    colors = ['red', 'blue', 'green']
-    for i, comp in enumerate(components):
-        plt.plot(comp['time'][:500], comp['signal'][:500], 
-                color=colors[i], linewidth=2, 
-                label=f"{comp['name']}: {comp['freq']} Hz")
-    plt.title('Componentes Senoidais Individuais')
-    plt.xlabel('Tempo (s)')
-    plt.ylabel('Amplitude')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.xlim(0, 0.5)
-    
-    # Sinal somado (limpo)
-    plt.subplot(2, 2, 2)
-    clean_signal = sum(comp['signal'] for comp in components)
-    plt.plot(components[0]['time'][:500], clean_signal[:500], 
-            'purple', linewidth=2, label='Sinal Limpo (Soma)')
-    plt.title('Superposição das Componentes')
-    plt.xlabel('Tempo (s)')
-    plt.ylabel('Amplitude')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.xlim(0, 0.5)
-    
     # Gerar sinal ruidoso
     print("\n2️⃣ Adicionando ruído...")
-    np.random.seed(42)  # Para reprodutibilidade
-    noisy_sig, time_vec = generate_and_save_random_signal(Fs_default, duration_default, noise_amp_default)
-    
-    # Sinal com ruído
-    plt.subplot(2, 2, 3)
-    plt.plot(time_vec[:500], noisy_sig[:500], 
-            'orange', alpha=0.8, label='Sinal + Ruído')
-    plt.plot(time_vec[:500], clean_signal[:500], 
-            'purple', alpha=0.5, linestyle='--', label='Original')
-    plt.title('Sinal com Ruído Adicionado')
-    plt.xlabel('Tempo (s)')
-    plt.ylabel('Amplitude')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.xlim(0, 0.5)
-    
-    # Informações
-    plt.subplot(2, 2, 4)
-    plt.axis('off')
-    info_text = f"""
-📊 PARÂMETROS DO SINAL:
-
-🎯 Componentes:
-"""
-    for comp_data in comp_data:
-        info_text += f"• {comp_data['name']}: {comp_data['freq']} Hz, A={comp_data['amp']:.1f}\n"
-    
-    info_text += f"""
-⚙️ Configurações:
-• Freq. amostragem: {Fs_default} Hz
-• Duração: {duration_default} s
-• Amostras: {len(noisy_sig)}
-• Ruído: σ = {noise_amp_default}
-
-🔬 Conceitos:
-• Superposição linear
-• Amostragem digital
-• Ruído gaussiano
-• Periodicidade
-"""
-    
-    plt.text(0.1, 0.9, info_text, fontsize=10, verticalalignment='top',
-            bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.8))
-    
-    plt.suptitle('🎲 Demonstração: Geração de Sinais Educativos', fontsize=14, fontweight='bold')
-    plt.tight_layout()
-    plt.show()
+    noisy_sig, time_vec, sig_info = generate_and_save_random_signal(
+        Fs_default, duration_default, noise_amp_default, rng=42, educational=True)  # Reprodutível
+
+    # Plotar componentes, superposição e sinal ruidoso (matplotlib só é carregado aqui)
+    from visualization import plot_generation_demo
+    plot_generation_demo(components, comp_data, time_vec, noisy_sig, Fs_default,
+                         duration_default, noise_amp_default)
 
-    # Salvar arquivo
-    np.savetxt('random_signal_noisy.txt', noisy_sig)
-    print(f"\n✅ Sinal salvo em 'random_signal_noisy.txt'")
+    # Salvar arquivo (binário com metadados; leitura via np.memmap em signal_storage.load_signal)
+    save_signal('random_signal_noisy.sig', noisy_sig, Fs_default, duration_default,
+                signal_info=sig_info)
+    print(f"\n✅ Sinal salvo em 'random_signal_noisy.sig'")
     print(f"📊 {len(noisy_sig)} amostras geradas")
     print("🎯 Para interface educativa completa, execute: python main_app.py")
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Tempo de importação dos módulos de cálculo.
+Importa cada módulo em um interpretador novo com `python -X importtime`, soma o
+tempo cumulativo reportado e verifica que nenhum módulo de interface (matplotlib,
+tkinter) foi carregado. Sai com código 1 se algum módulo carregar um módulo
+proibido ou passar do orçamento de tempo, para flagrar regressões.
+
+Exemplo:
+    python import_benchmark.py --budget-ms 400
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Módulos que os workers importam: devem carregar só NumPy/SciPy
+COMPUTE_MODULES = ('generate_signal', 'process_signal', 'filter_bank', 'signal_storage',
+                   'streaming_detector', 'epoch_folding', 'pipeline_cache', 'detection_benchmark',
+                   'batch_detect', 'precision_parity', 'instrumentation', 'perf_regression',
+                   'fast_folding')
+FORBIDDEN_PREFIXES = ('matplotlib', 'tkinter', '_tkinter', 'PIL')
+
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _parse_importtime(stderr, module):
+    """Tempo cumulativo (µs) do módulo pedido na saída de -X importtime"""
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = [field.strip() for field in line[len('import time:'):].split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    return None
+
+
+def measure_import(module, python=sys.executable):
+    """
+    Importa o módulo em um processo novo e retorna (tempo em ms, pacotes proibidos carregados).
+    """
+    code = (f"import sys, {module}; "
+            f"print('\\n'.join(name for name in sys.modules if name.startswith({FORBIDDEN_PREFIXES!r})))")
+    completed = subprocess.run([python, '-X', 'importtime', '-c', code], cwd=_SRC_DIR,
+                               capture_output=True, text=True, check=True)
+    microseconds = _parse_importtime(completed.stderr, module)
+    forbidden = sorted({name.split('.')[0] for name in completed.stdout.split()})
+    return (microseconds / 1000 if microseconds is not None else float('nan')), forbidden
+
+
+def run_import_benchmark(modules=COMPUTE_MODULES, repeats=3):
+    """Mede cada módulo `repeats` vezes (fica o menor tempo) e retorna uma linha por módulo"""
+    rows = []
+    for module in modules:
+        times = []
+        forbidden = []
+        for _ in range(repeats):
+            elapsed, forbidden = measure_import(module)
+            times.append(elapsed)
+        rows.append({'module': module, 'import_ms': min(times), 'forbidden': forbidden})
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tempo de importação dos módulos de cálculo")
+    parser.add_argument('modules', nargs='*', default=list(COMPUTE_MODULES),
+                        help="Módulos a medir (padrão: todos os de cálculo)")
+    parser.add_argument('--repeats', type=int, default=3, help="Repetições por módulo (usa o menor)")
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="Tempo máximo de importação por módulo")
+    args = parser.parse_args()
+
+    print("⏱️ TEMPO DE IMPORTAÇÃO (python -X importtime)")
+    print("=" * 60)
+    rows = run_import_benchmark(args.modules, args.repeats)
+    failed = False
+    for row in rows:
+        problems = []
+        if row['forbidden']:
+            problems.append("carrega " + ", ".join(row['forbidden']))
+        if args.budget_ms is not None and row['import_ms'] > args.budget_ms:
+            problems.append(f"acima de {args.budget_ms:g} ms")
+        failed |= bool(problems)
+        status = "❌ " + "; ".join(problems) if problems else "✅"
+        print(f"{row['module']:<22} {row['import_ms']:>8.1f} ms  {status}")
+    print("=" * 60)
+    sys.exit(1 if failed else 0)
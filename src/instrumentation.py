@@ -0,0 +1,115 @@
+"""
+Instrumentação opcional dos estágios do pipeline.
+As funções de cálculo aceitam profiler=None; com um StageProfiler cada estágio
+(projeto do filtro, filtfilt, FFTs, busca na banda, ...) é cronometrado e,
+opcionalmente, tem o pico de alocação medido com tracemalloc. Sem profiler o
+custo é um teste de None e um contexto vazio por estágio.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Contexto vazio compartilhado devolvido por stage() quando não há profiler
+_NO_STAGE = nullcontext()
+
+
+def stage(profiler, name):
+    """Contexto do estágio `name` no profiler, ou um contexto vazio se profiler for None"""
+    if profiler is None:
+        return _NO_STAGE
+    return profiler.stage(name)
+
+
+class StageProfiler:
+    """
+    Acumula, por estágio, número de chamadas, tempo de parede e pico de memória.
+    Com trace_memory=True o tracemalloc é ligado na criação (se ainda não estava) e
+    cada estágio registra o maior volume alocado acima do que havia no início dele;
+    estágios aninhados são suportados. O rastreamento deixa o código bem mais lento,
+    então os tempos medidos com ele ligado não devem ser comparados aos sem ele.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._stats = {}  # nome -> [chamadas, tempo total (s), pico (bytes)], em ordem de chegada
+        self._stack = []  # [memória no início, maior pico absoluto visto] dos estágios abertos
+
+    @contextmanager
+    def stage(self, name):
+        """Cronometra (e mede a memória de) um bloco: with profiler.stage('fft'): ..."""
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # reset_peak apaga o pico do estágio externo: guarda-o antes
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            self._stack.append([current, current])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak_bytes = 0
+            if self.trace_memory:
+                frame = self._stack.pop()
+                frame[1] = max(frame[1], tracemalloc.get_traced_memory()[1])
+                peak_bytes = frame[1] - frame[0]
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], frame[1])
+            stats = self._stats.setdefault(name, [0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], peak_bytes)
+
+    def report(self):
+        """Lista de dicionários (stage, calls, total_s, mean_s, peak_bytes) na ordem dos estágios"""
+        return [{'stage': name, 'calls': calls, 'total_s': total, 'mean_s': total / calls,
+                 'peak_bytes': peak}
+                for name, (calls, total, peak) in self._stats.items()]
+
+    def merge(self, report):
+        """Soma ao profiler um relatório de outro (por exemplo, de um worker do pool)"""
+        for row in report:
+            stats = self._stats.setdefault(row['stage'], [0, 0.0, 0])
+            stats[0] += row['calls']
+            stats[1] += row['total_s']
+            stats[2] = max(stats[2], row['peak_bytes'])
+
+    def format_report(self):
+        """Tabela de texto com tempo total, médio, fração do total e pico de memória"""
+        rows = self.report()
+        total = sum(row['total_s'] for row in rows) or 1.0
+        lines = [f"{'estágio':<22} {'chamadas':>8} {'total (ms)':>11} {'médio (ms)':>11} "
+                 f"{'%':>6} {'pico (MB)':>10}",
+                 "-" * 72]
+        for row in rows:
+            peak = f"{row['peak_bytes'] / 1e6:>10.2f}" if self.trace_memory else f"{'—':>10}"
+            lines.append(f"{row['stage']:<22} {row['calls']:>8d} {row['total_s'] * 1e3:>11.2f} "
+                         f"{row['mean_s'] * 1e3:>11.3f} {row['total_s'] / total:>6.1%} {peak}")
+        return "\n".join(lines)
+
+    def summary_line(self, max_stages=4):
+        """Resumo de uma linha com os estágios mais demorados (para barras de status)"""
+        rows = sorted(self.report(), key=lambda row: row['total_s'], reverse=True)[:max_stages]
+        parts = []
+        for row in rows:
+            part = f"{row['stage']} {row['total_s'] * 1e3:.1f} ms"
+            if self.trace_memory:
+                part += f" / {row['peak_bytes'] / 1e6:.1f} MB"
+            parts.append(part)
+        return " | ".join(parts)
+
+    def reset(self):
+        """Zera as estatísticas acumuladas"""
+        self._stats.clear()
+
+    def close(self):
+        """Desliga o tracemalloc se foi este profiler que o ligou"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
@@ -1,3 +1,5 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import matplotlib.pyplot as plt
@@ -6,8 +8,15 @@ import numpy as np
 from matplotlib.patches import Rectangle
 import matplotlib.patches as mpatches
 
-from generate_signal import generate_and_save_random_signal
-from process_signal import process_and_analyze_signal
+from generate_signal import sample_signal_parameters
+from instrumentation import StageProfiler
+from pipeline_cache import build_signal_pipeline
+from plot_decimation import DecimatedLine
+
+
+class ComputationCancelled(Exception):
+    """Lançada dentro da thread de trabalho quando o usuário cancela o processamento"""
+
 
 class PulsarDetectorApp:
     def __init__(self, root):
@@ -55,6 +64,19 @@ class PulsarDetectorApp:
         self.total_steps = 5
         self.random_mode = False  # Novo: controla modo aleatório vs educativo
         self.signal_info = {}  # Novo: armazena informações do sinal gerado
+        self.rng = np.random.default_rng()  # Gerador explícito (sem estado global)
+
+        # Cache dos estágios do pipeline: cada ajuste recalcula só o que depende dele
+        self.pipeline = build_signal_pipeline()
+        self._tuning_after_id = None
+
+        # Processamento em segundo plano: a thread de trabalho publica mensagens na fila
+        # e a thread da interface as consome via root.after (Tk não é thread-safe)
+        self._task_queue = queue.Queue()
+        self._task_id = 0
+        self._task_handler = None
+        self._cancel_event = threading.Event()
+        self._busy = False
 
         # Configurações visuais
         try:
@@ -133,6 +155,15 @@ class PulsarDetectorApp:
                                            style='TProgressbar')
         self.progress_bar.pack(pady=5)
 
+        # Progresso da etapa em execução (alimentado pelo pipeline)
+        self.task_progress_var = tk.StringVar(value="Etapa: ociosa")
+        tk.Label(progress_frame, textvariable=self.task_progress_var,
+                font=self.fonts['text'], fg=self.colors['text_secondary'],
+                bg=self.colors['bg_light']).pack(pady=(8, 0))
+        self.task_progress = ttk.Progressbar(progress_frame, length=320, mode='determinate',
+                                            style='TProgressbar')
+        self.task_progress.pack(pady=5)
+
         # Botões de controle com estilo tecnológico
         button_frame = tk.Frame(self.sidebar, bg=self.colors['bg_light'])
         button_frame.pack(fill=tk.X, padx=15, pady=10)
@@ -173,6 +204,13 @@ class PulsarDetectorApp:
         reset_btn.bind("<Enter>", lambda e: reset_btn.configure(bg='#d32f2f'))
         reset_btn.bind("<Leave>", lambda e: reset_btn.configure(bg=self.colors['error']))
 
+        # Cancelamento do processamento em segundo plano
+        self.cancel_btn = tk.Button(button_frame, text="⏹ CANCELAR PROCESSAMENTO", command=self._cancel_task,
+                                    font=self.fonts['button'], bg='#555',
+                                    fg=self.colors['text_primary'], relief=tk.FLAT, bd=0,
+                                    padx=15, pady=8, cursor='hand2', state='disabled')
+        self.cancel_btn.pack(fill=tk.X, pady=3)
+
         # Modo de operação com estilo futurístico
         mode_frame = tk.LabelFrame(self.sidebar, text="� MODO DE OPERAÇÃO", 
                                   font=self.fonts['button'], fg=self.colors['accent_purple'],
@@ -195,6 +233,37 @@ class PulsarDetectorApp:
                                     font=self.fonts['text'], command=self._on_mode_change)
         mode_random.pack(anchor='w', padx=10, pady=5)
 
+        # Ajuste ao vivo dos parâmetros (reaproveita os resultados em cache)
+        tuning_frame = tk.LabelFrame(self.sidebar, text="🎛️ AJUSTE AO VIVO",
+                                     font=self.fonts['button'], fg=self.colors['accent_cyan'],
+                                     bg=self.colors['bg_light'], labelanchor='n')
+        tuning_frame.pack(fill=tk.X, padx=15, pady=5)
+
+        self.noise_var = tk.DoubleVar(value=0.5)
+        self.cutoff_var = tk.DoubleVar(value=35)
+        self.order_var = tk.IntVar(value=5)
+        self.band_min_var = tk.DoubleVar(value=0.5)
+        self.band_max_var = tk.DoubleVar(value=self.Fs/2 - 5)
+        sliders = [
+            ("Ruído (amplitude)", self.noise_var, 0.0, 3.0, 0.05),
+            ("Corte do filtro (Hz)", self.cutoff_var, 1, self.Fs/2 - 1, 1),
+            ("Ordem do filtro", self.order_var, 1, 10, 1),
+            ("Banda de busca: mín. (Hz)", self.band_min_var, 0.5, 100, 0.5),
+            ("Banda de busca: máx. (Hz)", self.band_max_var, 5, self.Fs/2 - 5, 1)
+        ]
+        for label, variable, low, high, resolution in sliders:
+            tk.Scale(tuning_frame, label=label, variable=variable, from_=low, to=high,
+                     resolution=resolution, orient=tk.HORIZONTAL, command=self._on_tuning_change,
+                     font=self.fonts['text'], bg=self.colors['bg_light'], fg=self.colors['text_primary'],
+                     troughcolor=self.colors['bg_dark'], highlightthickness=0).pack(fill=tk.X, padx=8)
+
+        # Tempos por estágio do pipeline na barra de status (desligado = sem custo)
+        self.profile_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(tuning_frame, text="⏱️ Medir tempo dos estágios", variable=self.profile_var,
+                       command=self._on_profile_toggle, bg=self.colors['bg_light'],
+                       fg=self.colors['text_primary'], selectcolor=self.colors['bg_dark'],
+                       font=self.fonts['text']).pack(anchor='w', padx=8, pady=(0, 5))
+
         # Área de explicações com estilo high-tech
         explanation_frame = tk.LabelFrame(self.sidebar, text="🧠 BANCO DE CONHECIMENTO", 
                                          font=self.fonts['button'], fg=self.colors['accent_green'], 
@@ -215,11 +284,15 @@ class PulsarDetectorApp:
         self.plot_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=15, pady=15)
 
         # Configuração matplotlib com tema escuro
-        self.fig, self.ax = plt.subplots(1, 1, figsize=(12, 7), 
-                                        facecolor=self.colors['bg_dark'])
-        self.ax.set_facecolor(self.colors['bg_medium'])
-        
+        self.fig = plt.figure(figsize=(12, 7), facecolor=self.colors['bg_dark'])
+
+        # Layouts de eixos persistentes por passo (criados sob demanda, nunca destruídos)
+        self._layouts = {}
+        self._active_layout = None
+        self._background = None  # Fundo em cache para o blitting dos marcadores
+
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         self.canvas_widget.configure(bg=self.colors['bg_dark'])
@@ -256,61 +329,155 @@ class PulsarDetectorApp:
         if self.current_step > 0:
             self._reset_all()  # Reset se já começou
 
-    def _show_welcome_screen(self):
-        """Tela inicial com explicação sobre pulsares"""
-        self.ax.clear()
-        self.ax.set_facecolor(self.colors['bg_dark'])
+    # === LAYOUTS PERSISTENTES E BLITTING ===
+    def _get_layout(self, name, nrows, ncols, build, **gridspec_kw):
+        """
+        Ativa o layout de eixos de um passo, criando-o apenas na primeira vez.
+        Eixos, linhas e textos ficam na figura entre passos: trocar de passo só
+        alterna a visibilidade e os dados são atualizados com set_data, sem
+        fig.clear(), add_subplot ou tight_layout a cada clique.
+        """
+        layout = self._layouts.get(name)
+        if layout is None:
+            margins = dict(left=0.07, right=0.97, bottom=0.08, top=0.93, hspace=0.45, wspace=0.25)
+            margins.update(gridspec_kw)
+            gs = self.fig.add_gridspec(nrows, ncols, **margins)
+            axes = [self.fig.add_subplot(gs[i // ncols, i % ncols]) for i in range(nrows * ncols)]
+            layout = {'axes': axes, 'animated': [], 'suptitle': ''}
+            build(layout)
+            self._layouts[name] = layout
+
+        if self._active_layout != name:
+            for key, other in self._layouts.items():
+                for ax in other['axes']:
+                    ax.set_visible(key == name)
+            self.fig.suptitle(layout['suptitle'], fontsize=14, fontweight='bold')
+            self._active_layout = name
+            self._background = None
+        return layout
+
+    def _make_line_slots(self, ax, n_slots, colors, **line_kw):
+        """Cria linhas vazias reutilizáveis (uma por componente possível)"""
+        return [ax.plot([], [], color=colors[i % len(colors)], **line_kw)[0]
+                for i in range(n_slots)]
+
+    def _fill_line_slots(self, slots, series):
+        """
+        Preenche as linhas reutilizáveis com (x, y, rótulo) e esconde as que sobram.
+        Linhas escondidas ficam sem dados para não influenciar o autoscale.
+        """
+        for i, line in enumerate(slots):
+            if i < len(series):
+                x, y, label = series[i]
+                line.set_data(x, y)
+                line.set_label(label)
+                line.set_visible(True)
+            else:
+                line.set_data([], [])
+                line.set_visible(False)
+
+    def _rescale(self, ax, legend=True, **legend_kw):
+        """Reajusta o eixo y aos dados atuais e refaz a legenda das linhas visíveis"""
+        ax.relim()
+        ax.autoscale_view(scalex=False)
+        if legend:
+            handles = [line for line in ax.get_lines()
+                       if line.get_visible() and not line.get_label().startswith('_')]
+            if handles:
+                ax.legend(handles=handles, **legend_kw)
+            else:
+                self._remove_legend(ax)
+
+    def _remove_legend(self, ax):
+        """Remove a legenda do eixo, se houver"""
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
+
+    def _on_canvas_draw(self, event):
+        """Após cada redesenho completo guarda o fundo e pinta os artistas animados"""
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        """Desenha os artistas animados (marcadores móveis) do layout ativo"""
+        layout = self._layouts.get(self._active_layout)
+        if layout is None:
+            return
+        for artist in layout['animated']:
+            if artist.get_visible():
+                self.fig.draw_artist(artist)
+
+    def _blit_animated(self):
+        """
+        Atualiza só os marcadores móveis: restaura o fundo em cache, redesenha os
+        artistas animados e copia a região para a tela, sem refazer eixos e curvas.
+        """
+        if self._background is None:
+            self.canvas.draw_idle()  # Ainda não há fundo válido: redesenho completo
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.fig.bbox)
+
+    def _build_welcome_layout(self, layout):
+        """Cria os textos estáticos da tela inicial"""
+        ax = layout['axes'][0]
+        ax.set_facecolor(self.colors['bg_dark'])
         
         # Criar um "display" futurístico
-        self.ax.text(0.5, 0.85, "🌟 DETECTOR DE PULSARES v2.0", 
+        ax.text(0.5, 0.85, "🌟 DETECTOR DE PULSARES v2.0", 
                     ha='center', va='center', fontsize=24, fontweight='bold',
-                    color=self.colors['accent_cyan'], transform=self.ax.transAxes)
+                    color=self.colors['accent_cyan'], transform=ax.transAxes)
         
-        self.ax.text(0.5, 0.75, "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", 
+        ax.text(0.5, 0.75, "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", 
                     ha='center', va='center', fontsize=12,
-                    color=self.colors['accent_purple'], transform=self.ax.transAxes)
+                    color=self.colors['accent_purple'], transform=ax.transAxes)
         
-        self.ax.text(0.5, 0.65, "Sistema de Processamento Digital de Sinais", 
+        ax.text(0.5, 0.65, "Sistema de Processamento Digital de Sinais", 
                     ha='center', va='center', fontsize=16, style='italic',
-                    color=self.colors['text_secondary'], transform=self.ax.transAxes)
+                    color=self.colors['text_secondary'], transform=ax.transAxes)
         
-        self.ax.text(0.5, 0.55, "Aplicado à Detecção de Estrelas de Nêutrons", 
+        ax.text(0.5, 0.55, "Aplicado à Detecção de Estrelas de Nêutrons", 
                     ha='center', va='center', fontsize=16, style='italic',
-                    color=self.colors['text_secondary'], transform=self.ax.transAxes)
+                    color=self.colors['text_secondary'], transform=ax.transAxes)
         
         # Informações técnicas
-        self.ax.text(0.5, 0.4, "⚡ ESPECIFICAÇÕES TÉCNICAS ⚡", 
+        ax.text(0.5, 0.4, "⚡ ESPECIFICAÇÕES TÉCNICAS ⚡", 
                     ha='center', va='center', fontsize=14, fontweight='bold',
-                    color=self.colors['accent_green'], transform=self.ax.transAxes)
+                    color=self.colors['accent_green'], transform=ax.transAxes)
         
         specs_text = """🔬 Processamento: FFT de alta resolução
 📡 Filtragem: Butterworth digital adaptativo
 🎯 Detecção: Análise espectral automática
 🚀 Interface: Modo educativo + casos reais"""
         
-        self.ax.text(0.5, 0.25, specs_text, 
+        ax.text(0.5, 0.25, specs_text, 
                     ha='center', va='center', fontsize=12,
-                    color=self.colors['text_primary'], transform=self.ax.transAxes,
+                    color=self.colors['text_primary'], transform=ax.transAxes,
                     bbox=dict(boxstyle="round,pad=0.5", facecolor=self.colors['bg_medium'], 
                              edgecolor=self.colors['accent_cyan'], alpha=0.8))
         
-        self.ax.text(0.5, 0.08, "► INICIAR SEQUÊNCIA DE DETECÇÃO ◄", 
+        ax.text(0.5, 0.08, "► INICIAR SEQUÊNCIA DE DETECÇÃO ◄", 
                     ha='center', va='center', fontsize=16, fontweight='bold',
-                    color=self.colors['warning'], transform=self.ax.transAxes,
+                    color=self.colors['warning'], transform=ax.transAxes,
                     bbox=dict(boxstyle="round,pad=0.3", facecolor=self.colors['bg_light'], 
                              edgecolor=self.colors['warning'], alpha=0.9))
         
-        self.ax.set_xlim(0, 1)
-        self.ax.set_ylim(0, 1)
-        self.ax.axis('off')
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
         
         # Adicionar grade sutil de fundo
         for i in range(20):
             alpha = 0.05
-            self.ax.axhline(y=i/20, color=self.colors['accent_cyan'], alpha=alpha, linewidth=0.5)
-            self.ax.axvline(x=i/20, color=self.colors['accent_cyan'], alpha=alpha, linewidth=0.5)
-        
-        self.canvas.draw()
+            ax.axhline(y=i/20, color=self.colors['accent_cyan'], alpha=alpha, linewidth=0.5)
+            ax.axvline(x=i/20, color=self.colors['accent_cyan'], alpha=alpha, linewidth=0.5)
+
+    def _show_welcome_screen(self):
+        """Tela inicial com explicação sobre pulsares"""
+        layout = self._get_layout('welcome', 1, 1, self._build_welcome_layout)
+        self.ax = layout['axes'][0]
+        self.canvas.draw_idle()
         
         welcome_text = f"""
 🌟 DETECTOR DE PULSARES v2.0
@@ -363,7 +530,11 @@ Isso simula condições reais de observação astronômica.
         else:
             self.status_indicator.configure(fg=self.colors['success'])  # Verde quando completo
         
-        # Habilita o próximo botão com cores tecnológicas
+        self._refresh_step_buttons()
+
+    def _refresh_step_buttons(self):
+        """Habilita o próximo botão com cores tecnológicas"""
+        step = self.current_step
         for i, btn in enumerate(self.step_buttons):
             if i <= step:
                 if i < step:
@@ -373,90 +544,228 @@ Isso simula condições reais de observação astronômica.
             else:
                 btn.configure(state='disabled', bg='#555')  # Cinza para desabilitado
 
+    def _run_in_background(self, description, compute, on_done, step_name):
+        """
+        Executa compute(progress) em uma thread de trabalho, mantendo a janela responsiva.
+        compute recebe a função progress(fração, descrição), que alimenta a barra de
+        progresso da etapa e lança ComputationCancelled se o usuário cancelar. O resultado
+        é entregue a on_done já na thread da interface (via _poll_task_queue).
+        """
+        if self._busy:
+            messagebox.showwarning("Aviso", "Aguarde o término do processamento em andamento ou cancele-o.")
+            return
+
+        self._task_id += 1
+        task_id = self._task_id
+        cancel_event = threading.Event()
+        self._cancel_event = cancel_event
+        task_queue = self._task_queue
+
+        def progress(fraction, message):
+            if cancel_event.is_set():
+                raise ComputationCancelled()
+            task_queue.put((task_id, 'progress', fraction, message))
+
+        def worker():
+            try:
+                result = compute(progress)
+                progress(1.0, "Concluído")  # Último ponto de cancelamento
+                task_queue.put((task_id, 'done', result, None))
+            except ComputationCancelled:
+                task_queue.put((task_id, 'cancelled', None, None))
+            except Exception as e:
+                task_queue.put((task_id, 'error', e, None))
+
+        self._task_handler = (on_done, step_name)
+        self._set_busy(True, description)
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(50, self._poll_task_queue)
+
+    def _poll_task_queue(self):
+        """Consome as mensagens da thread de trabalho (roda na thread da interface)"""
+        while self._busy:
+            try:
+                task_id, kind, payload, message = self._task_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(50, self._poll_task_queue)
+                return
+            if task_id != self._task_id:
+                continue  # Mensagem de uma tarefa já cancelada ou reinicializada
+
+            if kind == 'progress':
+                self.task_progress['value'] = payload * 100
+                self.task_progress_var.set(f"Etapa: {message}")
+                continue
+
+            on_done, step_name = self._task_handler
+            self._set_busy(False)
+            if kind == 'done':
+                on_done(payload)
+                self._show_stage_timings()
+            elif kind == 'cancelled':
+                self.task_progress_var.set("Etapa: cancelada")
+                self.status_var.set(f"⏹ {step_name} cancelado pelo usuário")
+            else:
+                messagebox.showerror("Erro", f"Erro no {step_name}: {payload}")
+
+    def _set_busy(self, busy, description=""):
+        """Trava/destrava os controles enquanto há processamento em segundo plano"""
+        self._busy = busy
+        if busy:
+            for btn in self.step_buttons:
+                btn.configure(state='disabled', bg='#555')
+            self.cancel_btn.configure(state='normal', bg=self.colors['warning'])
+            self.task_progress['value'] = 0
+            self.task_progress_var.set(f"Etapa: {description}")
+            self.status_var.set(f"⏳ {description}... | Processando em segundo plano")
+            self.status_indicator.configure(fg=self.colors['warning'])
+        else:
+            self.cancel_btn.configure(state='disabled', bg='#555')
+            self.status_indicator.configure(fg=self.colors['success'])
+            self._refresh_step_buttons()
+
+    def _cancel_task(self):
+        """Pede o cancelamento da tarefa em segundo plano (efetivo na próxima etapa do pipeline)"""
+        if self._busy:
+            self._cancel_event.set()
+            self.task_progress_var.set("Etapa: cancelando...")
+
+    def _on_profile_toggle(self):
+        """Liga/desliga a medição de tempo dos estágios do pipeline"""
+        self.pipeline.profiler = StageProfiler() if self.profile_var.get() else None
+
+    def _show_stage_timings(self):
+        """Mostra na barra de status os estágios mais demorados da última tarefa"""
+        profiler = self.pipeline.profiler
+        if profiler is None:
+            return
+        summary = profiler.summary_line()
+        self.status_var.set(f"⏱️ {summary}" if summary else "⏱️ Tudo em cache: nenhum estágio recalculado")
+        profiler.reset()
+
+    # === AJUSTE AO VIVO ===
+    def _tuning_params(self):
+        """Lê os controles de ajuste como parâmetros do pipeline"""
+        return {
+            'noise_amplitude': float(self.noise_var.get()),
+            'cutoff_freq': float(self.cutoff_var.get()),
+            'filter_order': int(self.order_var.get()),
+            'min_freq': float(self.band_min_var.get()),
+            'max_freq': float(self.band_max_var.get())
+        }
+
+    def _on_tuning_change(self, value=None):
+        """Callback dos controles: agrupa os eventos enquanto o controle é arrastado"""
+        if self._tuning_after_id is not None:
+            self.root.after_cancel(self._tuning_after_id)
+        self._tuning_after_id = self.root.after(40, self._apply_tuning)
+
+    def _apply_tuning(self):
+        """
+        Aplica os controles ao pipeline e atualiza o passo exibido. Só os estágios
+        que dependem dos parâmetros alterados são recalculados; o resto vem do cache.
+        """
+        self._tuning_after_id = None
+        if self._busy:
+            # Tenta de novo quando o processamento atual terminar
+            self._tuning_after_id = self.root.after(100, self._apply_tuning)
+            return
+
+        dropped = self.pipeline.set_params(**self._tuning_params())
+        step = self.current_step
+        if step < 3 or not dropped:
+            return  # Nada a refazer agora; os valores valem para os próximos passos
+
+        pipeline = self.pipeline
+
+        def compute(progress):
+            noise = pipeline.get('noise', progress)
+            noisy_signal = pipeline.get('noisy_signal', progress)
+            analysis = pipeline.get('analysis', progress) if step >= 4 else None
+            return noise, noisy_signal, analysis
+
+        self._run_in_background("Reajustando parâmetros", compute,
+                                lambda result: self._show_tuning(step, result), "Ajuste")
+
+    def _show_tuning(self, step, result):
+        """Redesenha o passo atual com os resultados reajustados"""
+        noise, noisy_signal, analysis = result
+        if step == 3:
+            self._show_step3((self.pipeline.get('noise_amplitude'), noise, noisy_signal))
+            return
+        self.current_noisy_signal = noisy_signal
+        if step == 4:
+            self._show_step4(analysis)
+        else:
+            self.filtered_results = analysis
+            try:
+                self._show_step5(analysis)
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro no Passo 5: {e}")
+
     def _step1_generate_components(self):
         """Passo 1: Gerar e mostrar componentes senoidais individuais"""
+        Fs, duration, random_mode = self.Fs, self.duration, self.random_mode
+        # Modo aleatório usa entropia nova; modo educativo é reproduzível
+        self.rng = np.random.default_rng() if random_mode else np.random.default_rng(42)
+        rng = self.rng
+
+        # Sortear os parâmetros é barato: fica na thread da interface, assim como o
+        # set_params, para que uma tarefa antiga nunca altere o pipeline de uma nova
+        signal_info = sample_signal_parameters(rng, educational=not random_mode)
+        pipeline = self.pipeline
+        pipeline.set_params(Fs=Fs, duration=duration, signal_info=signal_info, rng=rng)
+
+        def compute(progress):
+            # Construir componentes baseados no signal_info (estágios em cache do pipeline);
+            # as amostras são sintetizadas uma única vez pelos estágios
+            components = pipeline.get('components', progress)
+            return pipeline.get('time_vector'), signal_info, components
+
+        self._run_in_background("Gerando componentes", compute, self._show_step1, "Passo 1")
+
+    def _build_step1_layout(self, layout):
+        """Eixo do Passo 1: uma linha por componente e o aviso de sinal só com ruído"""
+        ax = layout['axes'][0]
+        layout['lines'] = [DecimatedLine(line) for line in self._make_line_slots(
+            ax, 5, ['red', 'blue', 'green', 'purple', 'orange'], linewidth=2)]
+        layout['noise_text'] = ax.text(
+            0.5, 0.5, "🔍 SINAL DETECTADO: APENAS RUÍDO\n\n"
+            "Este é um caso realista onde não há\npulsar detectável no sinal!\n\n"
+            "Prossiga para ver como o sistema\nlida com a ausência de periodicidade.",
+            ha='center', va='center', fontsize=14, transform=ax.transAxes, visible=False,
+            bbox=dict(boxstyle="round,pad=0.3", facecolor="orange", alpha=0.8))
+        ax.set_xlabel('Tempo (s)')
+        ax.set_ylabel('Amplitude')
+        ax.grid(True, alpha=0.3)
+        ax.set_xlim(0, 0.5)  # Mostra apenas os primeiros 0.5s para clareza
+
+    def _show_step1(self, result):
+        """Exibe as componentes do Passo 1 (executa na thread da interface)"""
+        self.current_time_vector, self.signal_info, self.individual_components = result
+        t = self.current_time_vector
         try:
-            # Gerar componentes individuais
-            T = 1 / self.Fs
-            t = np.arange(0, self.duration, T)
-            self.current_time_vector = t
-            
-            if self.random_mode:
-                # Modo aleatório: usar geração aleatória
-                from generate_signal import generate_and_save_random_signal
-                _, _, self.signal_info = generate_and_save_random_signal(
-                    self.Fs, self.duration, 0.5, force_random=True)
-                
-                # Construir componentes baseados no sinal_info
-                self.individual_components = []
-                if self.signal_info['num_components'] > 0:
-                    for i in range(self.signal_info['num_components']):
-                        component = self.signal_info['amplitudes'][i] * np.sin(
-                            2 * np.pi * self.signal_info['frequencies'][i] * t + 
-                            self.signal_info['phases'][i])
-                        self.individual_components.append({
-                            'signal': component,
-                            'freq': self.signal_info['frequencies'][i],
-                            'amp': self.signal_info['amplitudes'][i],
-                            'phase': self.signal_info['phases'][i]
-                        })
-            else:
-                # Modo educativo: parâmetros fixos
-                np.random.seed(42)  # Para resultados reproduzíveis
-                self.individual_components = []
-                freqs = [5, 15, 25]  # Frequências bem definidas para visualização
-                amps = [1.5, 1.0, 0.8]
-                phases = [0, np.pi/4, np.pi/2]
-                
-                self.signal_info = {
-                    'frequencies': freqs,
-                    'amplitudes': amps,
-                    'phases': phases,
-                    'num_components': 3,
-                    'signal_type': 'educational'
-                }
-                
-                # Gerar cada componente
-                for i in range(3):
-                    component = amps[i] * np.sin(2 * np.pi * freqs[i] * t + phases[i])
-                    self.individual_components.append({
-                        'signal': component,
-                        'freq': freqs[i],
-                        'amp': amps[i],
-                        'phase': phases[i]
-                    })
-            
-            # Plotar componentes individuais
-            self.ax.clear()
-            
-            if len(self.individual_components) == 0:
+            # Plotar componentes individuais (atualiza as linhas do layout persistente)
+            layout = self._get_layout('step1', 1, 1, self._build_step1_layout)
+            ax = layout['axes'][0]
+            noise_only = len(self.individual_components) == 0
+
+            self._fill_line_slots(layout['lines'], [
+                (t, comp['signal'], f'Comp {i+1}: {comp["freq"]:.1f} Hz, A={comp["amp"]:.1f}')
+                for i, comp in enumerate(self.individual_components)])
+            layout['noise_text'].set_visible(noise_only)
+            if noise_only:
                 # Caso especial: apenas ruído
-                self.ax.text(0.5, 0.5, "🔍 SINAL DETECTADO: APENAS RUÍDO\n\n"
-                           "Este é um caso realista onde não há\npulsar detectável no sinal!\n\n"
-                           "Prossiga para ver como o sistema\nlida com a ausência de periodicidade.",
-                           ha='center', va='center', fontsize=14,
-                           transform=self.ax.transAxes,
-                           bbox=dict(boxstyle="round,pad=0.3", facecolor="orange", alpha=0.8))
-                self.ax.set_xlim(0, 1)
-                self.ax.set_ylim(0, 1)
-                self.ax.axis('off')
+                ax.set_axis_off()
+                ax.set_title('')
+                self._remove_legend(ax)
             else:
-                colors = ['red', 'blue', 'green', 'purple', 'orange']
-                for i, comp in enumerate(self.individual_components):
-                    color = colors[i % len(colors)]
-                    self.ax.plot(t[:500], comp['signal'][:500], 
-                               color=color, linewidth=2,
-                               label=f'Comp {i+1}: {comp["freq"]:.1f} Hz, A={comp["amp"]:.1f}')
-                
-                self.ax.set_title('🎲 Passo 1: Componentes Senoidais Individuais', 
-                                fontsize=14, fontweight='bold')
-                self.ax.set_xlabel('Tempo (s)')
-                self.ax.set_ylabel('Amplitude')
-                self.ax.grid(True, alpha=0.3)
-                self.ax.legend()
-                self.ax.set_xlim(0, 0.5)  # Mostra apenas os primeiros 0.5s para clareza
-            
-            self.canvas.draw()
+                ax.set_axis_on()
+                ax.set_title('🎲 Passo 1: Componentes Senoidais Individuais',
+                             fontsize=14, fontweight='bold')
+                self._rescale(ax)
+
+            self.canvas.draw_idle()
             self._update_progress(1, "Componentes Geradas")
             
             # Gerar texto explicativo baseado no tipo de sinal
@@ -525,73 +834,76 @@ Próximo: Vamos somar essas componentes (Princípio da Superposição)
 
     def _step2_superposition(self):
         """Passo 2: Mostrar superposição das componentes"""
-        if not self.individual_components:
+        if self.current_time_vector is None:
             messagebox.showwarning("Aviso", "Execute o Passo 1 primeiro!")
             return
-            
-        try:
+
+        pipeline = self.pipeline
+
+        def compute(progress):
             # Criar sinal limpo pela superposição
-            t = self.current_time_vector
-            self.clean_signal = np.zeros_like(t)
-            
-            for comp in self.individual_components:
-                self.clean_signal += comp['signal']
-            
-            # Plotar comparação
-            self.fig.clear()
-            
+            return pipeline.get('clean_signal', progress)
+
+        self._run_in_background("Aplicando superposição", compute, self._show_step2, "Passo 2")
+
+    def _build_step2_layout(self, layout):
+        """Eixos do Passo 2: componentes individuais e sinal resultante"""
+        ax1, ax2 = layout['axes']
+        for ax in (ax1, ax2):
+            ax.set_facecolor(self.colors['bg_medium'])
+            ax.set_ylabel('Amplitude', color=self.colors['text_primary'])
+            ax.grid(True, alpha=0.3, color=self.colors['text_secondary'])
+            ax.set_xlim(0, 0.5)
+            ax.tick_params(colors=self.colors['text_secondary'])
+        ax2.set_xlabel('Tempo (s)', color=self.colors['text_primary'])
+
+        layout['lines'] = [DecimatedLine(line) for line in self._make_line_slots(
+            ax1, 5, ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57'], linewidth=2, alpha=0.8)]
+        layout['result'] = DecimatedLine(ax2.plot([], [], color=self.colors['accent_purple'], linewidth=3,
+                                                  label='Sinal Resultante (Superposição)')[0])
+        layout['noise_text'] = ax2.text(
+            0.5, 0.5, "⚠️ SINAL NULO\n\nNenhuma componente detectada.\nApenas ruído será adicionado no próximo passo.",
+            ha='center', va='center', fontsize=14, visible=False,
+            color=self.colors['warning'], transform=ax2.transAxes,
+            bbox=dict(boxstyle="round,pad=0.3", facecolor=self.colors['bg_light'], alpha=0.8))
+
+    def _show_step2(self, clean_signal):
+        """Exibe a superposição do Passo 2 (executa na thread da interface)"""
+        self.clean_signal = clean_signal
+        t = self.current_time_vector
+        try:
+            # Plotar comparação (atualiza as linhas do layout persistente)
+            layout = self._get_layout('step2', 2, 1, self._build_step2_layout)
+            ax1, ax2 = layout['axes']
+            has_components = len(self.individual_components) > 0
+
             # Subplot 1: Componentes individuais
-            ax1 = self.fig.add_subplot(2, 1, 1)
-            ax1.set_facecolor(self.colors['bg_medium'])
-            
-            if len(self.individual_components) > 0:
-                colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57']
-                
-                for i, comp in enumerate(self.individual_components):
-                    color = colors[i % len(colors)]
-                    ax1.plot(t[:500], comp['signal'][:500], 
-                            color=color, linewidth=2, alpha=0.8,
-                            label=f'{comp["freq"]:.1f} Hz')
-                
-                ax1.set_title('Componentes Individuais', fontsize=12, fontweight='bold',
-                             color=self.colors['text_primary'])
-                ax1.set_ylabel('Amplitude', color=self.colors['text_primary'])
-                ax1.grid(True, alpha=0.3, color=self.colors['text_secondary'])
-                ax1.legend()
-                ax1.set_xlim(0, 0.5)
-                ax1.tick_params(colors=self.colors['text_secondary'])
-            
+            self._fill_line_slots(layout['lines'], [
+                (t, comp['signal'], f'{comp["freq"]:.1f} Hz')
+                for comp in self.individual_components])
+            ax1.set_title('Componentes Individuais' if has_components else '',
+                          fontsize=12, fontweight='bold', color=self.colors['text_primary'])
+            self._rescale(ax1)
+
             # Subplot 2: Sinal resultante
-            ax2 = self.fig.add_subplot(2, 1, 2)
-            ax2.set_facecolor(self.colors['bg_medium'])
-            
-            if len(self.individual_components) > 0:
-                ax2.plot(t[:500], self.clean_signal[:500], 
-                        color=self.colors['accent_purple'], linewidth=3,
-                        label='Sinal Resultante (Superposição)')
-                
-                ax2.set_title('⚡ Passo 2: Sinal Resultante da Superposição', 
-                             fontsize=12, fontweight='bold', color=self.colors['text_primary'])
-                ax2.set_xlabel('Tempo (s)', color=self.colors['text_primary'])
-                ax2.set_ylabel('Amplitude', color=self.colors['text_primary'])
-                ax2.grid(True, alpha=0.3, color=self.colors['text_secondary'])
-                ax2.legend()
-                ax2.set_xlim(0, 0.5)
-                ax2.tick_params(colors=self.colors['text_secondary'])
+            layout['noise_text'].set_visible(not has_components)
+            if has_components:
+                layout['result'].set_data(t, self.clean_signal)
+                layout['result'].set_visible(True)
+                ax2.set_axis_on()
+                ax2.set_title('⚡ Passo 2: Sinal Resultante da Superposição',
+                              fontsize=12, fontweight='bold', color=self.colors['text_primary'])
+                self._rescale(ax2)
             else:
                 # Caso de apenas ruído
-                ax2.text(0.5, 0.5, "⚠️ SINAL NULO\n\nNenhuma componente detectada.\nApenas ruído será adicionado no próximo passo.",
-                        ha='center', va='center', fontsize=14,
-                        color=self.colors['warning'], transform=ax2.transAxes,
-                        bbox=dict(boxstyle="round,pad=0.3", facecolor=self.colors['bg_light'], alpha=0.8))
-                ax2.set_xlim(0, 1)
-                ax2.set_ylim(0, 1)
-                ax2.axis('off')
+                layout['result'].set_visible(False)
+                ax2.set_axis_off()
+                ax2.set_title('')
+                self._remove_legend(ax2)
                 # Criar sinal zero para próximos passos
                 self.clean_signal = np.zeros_like(t)
-            
-            self.fig.tight_layout()
-            self.canvas.draw()
+
+            self.canvas.draw_idle()
             self._update_progress(2, "Superposição Aplicada")
             
             # Explanation baseada no número de componentes
@@ -665,49 +977,47 @@ Próximo: Adicionar ruído realista para simular condições de observação
         if self.clean_signal is None:
             messagebox.showwarning("Aviso", "Execute os passos anteriores primeiro!")
             return
-            
+
+        pipeline = self.pipeline
+        pipeline.set_params(**self._tuning_params())
+        noise_amplitude = pipeline.get('noise_amplitude')
+
+        def compute(progress):
+            # Adicionar ruído (amplitude do controle de ajuste)
+            noise = pipeline.get('noise', progress)
+            return noise_amplitude, noise, pipeline.get('noisy_signal', progress)
+
+        self._run_in_background("Adicionando ruído", compute, self._show_step3, "Passo 3")
+
+    def _build_step3_layout(self, layout):
+        """Eixos do Passo 3: sinal limpo, ruído e sinal recebido"""
+        ax1, ax2, ax3 = layout['axes']
+        layout['lines'] = [
+            DecimatedLine(ax1.plot([], [], color='blue', linewidth=2, label='Sinal Limpo')[0]),
+            DecimatedLine(ax2.plot([], [], color='red', linewidth=1, alpha=0.7, label='Ruído Gaussiano')[0]),
+            DecimatedLine(ax3.plot([], [], color='orange', linewidth=1.5, label='Sinal + Ruído')[0])
+        ]
+        titles = ['Sinal Original (Sem Ruído)', 'Ruído Adicionado', '📡 Passo 3: Sinal Recebido (Com Ruído)']
+        for ax, title in zip(layout['axes'], titles):
+            ax.set_title(title, fontsize=11, fontweight='bold')
+            ax.set_ylabel('Amplitude')
+            ax.grid(True, alpha=0.3)
+            ax.legend()
+            ax.set_xlim(0, 0.5)
+        ax3.set_xlabel('Tempo (s)')
+
+    def _show_step3(self, result):
+        """Exibe o sinal ruidoso do Passo 3 (executa na thread da interface)"""
+        noise_amplitude, noise, self.current_noisy_signal = result
         try:
-            # Adicionar ruído
-            noise_amplitude = 0.5
-            noise = noise_amplitude * np.random.randn(len(self.current_time_vector))
-            self.current_noisy_signal = self.clean_signal + noise
-            
-            # Plotar comparação
-            self.fig.clear()
-            
-            # Subplot 1: Sinal limpo
-            ax1 = self.fig.add_subplot(3, 1, 1)
-            ax1.plot(self.current_time_vector[:500], self.clean_signal[:500], 
-                    color='blue', linewidth=2, label='Sinal Limpo')
-            ax1.set_title('Sinal Original (Sem Ruído)', fontsize=11, fontweight='bold')
-            ax1.set_ylabel('Amplitude')
-            ax1.grid(True, alpha=0.3)
-            ax1.legend()
-            ax1.set_xlim(0, 0.5)
-            
-            # Subplot 2: Ruído
-            ax2 = self.fig.add_subplot(3, 1, 2)
-            ax2.plot(self.current_time_vector[:500], noise[:500], 
-                    color='red', linewidth=1, alpha=0.7, label='Ruído Gaussiano')
-            ax2.set_title('Ruído Adicionado', fontsize=11, fontweight='bold')
-            ax2.set_ylabel('Amplitude')
-            ax2.grid(True, alpha=0.3)
-            ax2.legend()
-            ax2.set_xlim(0, 0.5)
-            
-            # Subplot 3: Sinal ruidoso
-            ax3 = self.fig.add_subplot(3, 1, 3)
-            ax3.plot(self.current_time_vector[:500], self.current_noisy_signal[:500], 
-                    color='orange', linewidth=1.5, label='Sinal + Ruído')
-            ax3.set_title('📡 Passo 3: Sinal Recebido (Com Ruído)', fontsize=11, fontweight='bold')
-            ax3.set_xlabel('Tempo (s)')
-            ax3.set_ylabel('Amplitude')
-            ax3.grid(True, alpha=0.3)
-            ax3.legend()
-            ax3.set_xlim(0, 0.5)
-            
-            self.fig.tight_layout()
-            self.canvas.draw()
+            # Plotar comparação (atualiza as linhas do layout persistente)
+            layout = self._get_layout('step3', 3, 1, self._build_step3_layout)
+            series = (self.clean_signal, noise, self.current_noisy_signal)
+            for ax, line, y in zip(layout['axes'], layout['lines'], series):
+                line.set_data(self.current_time_vector, y)
+                self._rescale(ax, legend=False)
+
+            self.canvas.draw_idle()
             self._update_progress(3, "Ruído Adicionado")
             
             # Calcular SNR
@@ -759,44 +1069,52 @@ Próximo: Aplicar filtro passa-baixa
         if self.current_noisy_signal is None:
             messagebox.showwarning("Aviso", "Execute os passos anteriores primeiro!")
             return
-            
+
+        pipeline = self.pipeline
+        pipeline.set_params(**self._tuning_params())
+
+        def compute(progress):
+            # Filtro, FFTs e detecção pelos estágios do pipeline, que alimentam a barra de progresso
+            return pipeline.get('analysis', progress)
+
+        self._run_in_background("Filtrando sinal", compute, self._show_step4, "Passo 4")
+
+    def _build_step4_layout(self, layout):
+        """Eixos do Passo 4: sinal antes e depois da filtragem"""
+        ax1, ax2 = layout['axes']
+        layout['noisy'] = DecimatedLine(ax1.plot([], [], color='red', linewidth=1, alpha=0.7,
+                                                 label='Sinal Ruidoso')[0])
+        layout['original'] = DecimatedLine(ax1.plot([], [], color='blue', linewidth=2, alpha=0.8,
+                                                    label='Sinal Original')[0])
+        layout['filtered'] = DecimatedLine(ax2.plot([], [], color='green', linewidth=2,
+                                                    label='Sinal Filtrado')[0])
+        layout['reference'] = DecimatedLine(ax2.plot([], [], color='blue', linewidth=2, alpha=0.5,
+                                                     linestyle='--', label='Original (Referência)')[0])
+        ax1.set_title('Antes da Filtragem', fontsize=12, fontweight='bold')
+        ax2.set_xlabel('Tempo (s)')
+        for ax in (ax1, ax2):
+            ax.set_ylabel('Amplitude')
+            ax.grid(True, alpha=0.3)
+            ax.legend()
+            ax.set_xlim(0, 0.5)
+
+    def _show_step4(self, results):
+        """Exibe o resultado da filtragem do Passo 4 (executa na thread da interface)"""
         try:
-            # Aplicar filtro usando a função existente
-            from process_signal import process_and_analyze_signal
-            results = process_and_analyze_signal(self.current_noisy_signal, self.Fs, 
-                                               cutoff_freq=35, filter_order=5)
-            
-            # Plotar antes e depois da filtragem
-            self.fig.clear()
-            
-            # Subplot 1: Sinal ruidoso
-            ax1 = self.fig.add_subplot(2, 1, 1)
-            ax1.plot(self.current_time_vector[:500], self.current_noisy_signal[:500], 
-                    color='red', linewidth=1, alpha=0.7, label='Sinal Ruidoso')
-            ax1.plot(self.current_time_vector[:500], self.clean_signal[:500], 
-                    color='blue', linewidth=2, alpha=0.8, label='Sinal Original')
-            ax1.set_title('Antes da Filtragem', fontsize=12, fontweight='bold')
-            ax1.set_ylabel('Amplitude')
-            ax1.grid(True, alpha=0.3)
-            ax1.legend()
-            ax1.set_xlim(0, 0.5)
-            
-            # Subplot 2: Sinal filtrado
-            ax2 = self.fig.add_subplot(2, 1, 2)
-            ax2.plot(results['time_vector'][:500], results['filtered_signal'][:500], 
-                    color='green', linewidth=2, label='Sinal Filtrado')
-            ax2.plot(self.current_time_vector[:500], self.clean_signal[:500], 
-                    color='blue', linewidth=2, alpha=0.5, linestyle='--', label='Original (Referência)')
-            ax2.set_title(f'🔽 Passo 4: Após Filtro Passa-Baixa ({results["cutoff_freq"]} Hz)', 
-                         fontsize=12, fontweight='bold')
-            ax2.set_xlabel('Tempo (s)')
-            ax2.set_ylabel('Amplitude')
-            ax2.grid(True, alpha=0.3)
-            ax2.legend()
-            ax2.set_xlim(0, 0.5)
-            
-            self.fig.tight_layout()
-            self.canvas.draw()
+            # Plotar antes e depois da filtragem (atualiza as linhas do layout persistente)
+            layout = self._get_layout('step4', 2, 1, self._build_step4_layout)
+            ax1, ax2 = layout['axes']
+            t = self.current_time_vector
+            layout['noisy'].set_data(t, self.current_noisy_signal)
+            layout['original'].set_data(t, self.clean_signal)
+            layout['filtered'].set_data(results['time_vector'], results['filtered_signal'])
+            layout['reference'].set_data(t, self.clean_signal)
+            ax2.set_title(f'🔽 Passo 4: Após Filtro Passa-Baixa ({results["cutoff_freq"]:g} Hz)',
+                          fontsize=12, fontweight='bold')
+            self._rescale(ax1, legend=False)
+            self._rescale(ax2, legend=False)
+
+            self.canvas.draw_idle()
             self._update_progress(4, "Filtragem Aplicada")
             
             explanation = f"""
@@ -807,17 +1125,17 @@ O filtro passa-baixa remove frequências altas (ruído) preservando o sinal úti
 🔧 FILTRO BUTTERWORTH:
 • Tipo: Passa-baixa
 • Ordem: {results["filter_order"]}ª ordem
-• Frequência de corte: {results["cutoff_freq"]} Hz
+• Frequência de corte: {results["cutoff_freq"]:g} Hz
 • Resposta: Máximamente plana na banda passante
 
 📊 FUNCIONAMENTO:
-• Frequências < 35 Hz: PASSAM (atenuação mínima)
-• Frequências > 35 Hz: BLOQUEADAS (atenuação alta)
+• Frequências < {results["cutoff_freq"]:g} Hz: PASSAM (atenuação mínima)
+• Frequências > {results["cutoff_freq"]:g} Hz: BLOQUEADAS (atenuação alta)
 • Taxa de corte: ~20 dB/década por ordem
 
 🔬 IMPLEMENTAÇÃO:
 • Função de transferência H(z)
-• Filtragem bidirecional (filtfilt)
+• Filtragem bidirecional (sosfiltfilt, seções de 2ª ordem)
 • Zero distorção de fase
 • Resposta impulsiva finita
 
@@ -842,6 +1160,48 @@ Próximo: Análise espectral com FFT
         except Exception as e:
             messagebox.showerror("Erro", f"Erro no Passo 4: {e}")
 
+    def _build_step5_layout(self, layout):
+        """Eixos do Passo 5: sinal filtrado, espectros, zoom com marcadores e resultados"""
+        ax1, ax2, ax3, ax4 = layout['axes']
+        layout['suptitle'] = '📊 Passo 5: Análise FFT e Detecção de Periodicidade'
+
+        layout['time_line'] = DecimatedLine(ax1.plot([], [], color='green', linewidth=2)[0])
+        ax1.set_title('Sinal Filtrado', fontsize=10, fontweight='bold')
+        ax1.set_xlabel('Tempo (s)')
+        ax1.set_ylabel('Amplitude')
+        ax1.grid(True, alpha=0.3)
+        ax1.set_xlim(0, 0.5)
+
+        layout['spectrum_original'] = DecimatedLine(ax2.plot([], [], 'r-', alpha=0.7, label='Original')[0])
+        layout['spectrum_filtered'] = DecimatedLine(ax2.plot([], [], 'g-', linewidth=2, label='Filtrado')[0])
+        layout['cutoff_line'] = ax2.axvline(x=0, color='blue', linestyle='--')
+        ax2.set_yscale('log')
+        ax2.set_title('Espectros de Potência', fontsize=10, fontweight='bold')
+        ax2.set_xlabel('Frequência (Hz)')
+        ax2.set_ylabel('Potência (log)')
+        ax2.set_xlim(0, 100)
+        ax2.grid(True, alpha=0.3)
+
+        layout['zoom_line'] = DecimatedLine(ax3.plot([], [], 'g-', linewidth=2)[0])
+        layout['markers'] = self._make_line_slots(ax3, 5, ['red'], marker='o', linestyle='none',
+                                                  markersize=8)
+        ax3.set_title('Detecção de Picos', fontsize=10, fontweight='bold')
+        ax3.set_xlabel('Frequência (Hz)')
+        ax3.set_ylabel('Potência')
+        ax3.set_xlim(0, 50)
+        ax3.grid(True, alpha=0.3)
+
+        # Artistas animados: ficam fora do redesenho completo e são atualizados por blitting
+        layout['peak_line'] = ax3.axvline(x=0, color='purple', linestyle='--', linewidth=2,
+                                          animated=True)
+        layout['peak_label'] = ax3.text(0, 0.95, '', color='purple', fontsize=8, va='top',
+                                        transform=ax3.get_xaxis_transform(), animated=True)
+        ax4.axis('off')
+        layout['info_text'] = ax4.text(0.1, 0.9, '', fontsize=9, transform=ax4.transAxes,
+                                       verticalalignment='top', animated=True,
+                                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.8))
+        layout['animated'] = [layout['peak_line'], layout['peak_label'], layout['info_text']]
+
     def _step5_fft_analysis(self):
         """Passo 5: Análise FFT e detecção de periodicidade"""
         if not hasattr(self, 'filtered_results'):
@@ -850,66 +1210,63 @@ Próximo: Análise espectral com FFT
             
         try:
             results = self.filtered_results
+            self._show_step5(results)
             
-            # Plotar análise espectral completa
-            self.fig.clear()
+            # Mostrar popup de conclusão
+            messagebox.showinfo("🎉 Parabéns!", 
+                              "Você completou todo o processo de detecção de pulsares!\n\n"
+                              f"Período detectado: {results['detected_period']:.3f} segundos\n"
+                              f"Frequência: {results['detected_peak_freq']:.2f} Hz\n\n"
+                              "Todos os conceitos de Sinais e Sistemas foram aplicados com sucesso!")
             
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro no Passo 5: {e}")
+
+    def _show_step5(self, results):
+        """Exibe a análise espectral do Passo 5 (também usado pelos ajustes ao vivo)"""
+        # Plotar análise espectral completa (atualiza o layout persistente)
+        layout = self._get_layout('step5', 2, 2, self._build_step5_layout, top=0.88, hspace=0.4)
+        ax1, ax2, ax3, ax4 = layout['axes']
+        # Os espectros vêm do cache do pipeline: se são os mesmos arrays (por exemplo, só a
+        # faixa de busca mudou), apenas os marcadores animados precisam ser redesenhados
+        spectra = (results['power_spectrum_original'], results['power_spectrum_filtered'])
+        previous = layout.get('spectra', (None, None))
+        spectra_changed = previous[0] is not spectra[0] or previous[1] is not spectra[1]
+
+        if spectra_changed:
+            freqs = results['frequencies']
+            power_filtered = results['power_spectrum_filtered']
+
             # Subplot 1: Sinal no tempo
-            ax1 = self.fig.add_subplot(2, 2, 1)
-            ax1.plot(results['time_vector'][:500], results['filtered_signal'][:500], 
-                    color='green', linewidth=2)
-            ax1.set_title('Sinal Filtrado', fontsize=10, fontweight='bold')
-            ax1.set_xlabel('Tempo (s)')
-            ax1.set_ylabel('Amplitude')
-            ax1.grid(True, alpha=0.3)
-            ax1.set_xlim(0, 0.5)
-            
+            layout['time_line'].set_data(results['time_vector'], results['filtered_signal'])
+            self._rescale(ax1, legend=False)
+
             # Subplot 2: Espectro original vs filtrado
-            ax2 = self.fig.add_subplot(2, 2, 2)
-            ax2.semilogy(results['frequencies'], results['power_spectrum_original'], 
-                        'r-', alpha=0.7, label='Original')
-            ax2.semilogy(results['frequencies'], results['power_spectrum_filtered'], 
-                        'g-', linewidth=2, label='Filtrado')
-            ax2.axvline(x=results['cutoff_freq'], color='blue', linestyle='--', 
-                       label=f'Corte ({results["cutoff_freq"]} Hz)')
-            ax2.set_title('Espectros de Potência', fontsize=10, fontweight='bold')
-            ax2.set_xlabel('Frequência (Hz)')
-            ax2.set_ylabel('Potência (log)')
-            ax2.set_xlim(0, 100)
-            ax2.grid(True, alpha=0.3)
-            ax2.legend(fontsize=8)
-            
-            # Subplot 3: Zoom nas frequências baixas
-            ax3 = self.fig.add_subplot(2, 2, 3)
-            ax3.plot(results['frequencies'], results['power_spectrum_filtered'], 
-                    'g-', linewidth=2)
-            
-            # Marcar os picos das componentes originais (5, 15, 25 Hz)
+            layout['spectrum_original'].set_data(freqs, results['power_spectrum_original'])
+            layout['spectrum_filtered'].set_data(freqs, power_filtered)
+            layout['cutoff_line'].set_xdata([results['cutoff_freq']] * 2)
+            layout['cutoff_line'].set_label(f'Corte ({results["cutoff_freq"]:g} Hz)')
+            self._rescale(ax2, fontsize=8)
+
+            # Subplot 3: Zoom nas frequências baixas, marcando as componentes originais
+            layout['zoom_line'].set_data(freqs, power_filtered)
+            markers = []
             for comp in self.individual_components:
-                freq = comp['freq']
-                if freq < len(results['frequencies']):
-                    idx = np.argmin(np.abs(results['frequencies'] - freq))
-                    ax3.plot(freq, results['power_spectrum_filtered'][idx], 
-                            'ro', markersize=8, label=f'{freq} Hz')
-            
-            # Marcar pico detectado
-            if results['detected_peak_freq'] > 0:
-                ax3.axvline(x=results['detected_peak_freq'], color='purple', 
-                           linestyle='--', linewidth=2,
-                           label=f'Detectado: {results["detected_peak_freq"]:.1f} Hz')
-            
-            ax3.set_title('Detecção de Picos', fontsize=10, fontweight='bold')
-            ax3.set_xlabel('Frequência (Hz)')
-            ax3.set_ylabel('Potência')
-            ax3.set_xlim(0, 50)
-            ax3.grid(True, alpha=0.3)
-            ax3.legend(fontsize=8)
-            
-            # Subplot 4: Informações da detecção
-            ax4 = self.fig.add_subplot(2, 2, 4)
-            ax4.axis('off')
-            
-            detection_info = f"""📊 RESULTADOS DA DETECÇÃO
+                idx = np.argmin(np.abs(freqs - comp['freq']))
+                markers.append(([comp['freq']], [power_filtered[idx]], f'{comp["freq"]} Hz'))
+            self._fill_line_slots(layout['markers'], markers)
+            self._rescale(ax3, fontsize=8)
+            layout['spectra'] = spectra
+
+        # Partes móveis (desenhadas por blitting): pico detectado e quadro de resultados
+        peak_freq = results['detected_peak_freq']
+        layout['peak_line'].set_xdata([peak_freq] * 2)
+        layout['peak_line'].set_visible(peak_freq > 0)
+        layout['peak_label'].set_x(peak_freq)
+        layout['peak_label'].set_text(f' Detectado: {peak_freq:.1f} Hz')
+        layout['peak_label'].set_visible(peak_freq > 0)
+
+        detection_info = f"""📊 RESULTADOS DA DETECÇÃO
 
 🎯 Pico Principal Detectado:
 Frequência: {results['detected_peak_freq']:.2f} Hz
@@ -920,23 +1277,22 @@ Período: {results['detected_period']:.3f} s
 • 15 Hz → Período: 0.067 s  
 • 25 Hz → Período: 0.040 s
 
-✅ Status: {"DETECTADO!" if results['detected_peak_freq'] > 0 else "NÃO DETECTADO"}
+📈 Significância: {results['detection_sigma']:.1f} σ
+✅ Status: {"DETECTADO!" if results['detected'] else "NÃO DETECTADO"}
 
 🌟 Conclusão:
-{"O algoritmo identificou com sucesso a periodicidade do pulsar!" if results['detected_peak_freq'] > 0 else "Ajustar parâmetros de detecção."}
-            """
-            
-            ax4.text(0.1, 0.9, detection_info, fontsize=9, 
-                    transform=ax4.transAxes, verticalalignment='top',
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.8))
-            
-            self.fig.suptitle('📊 Passo 5: Análise FFT e Detecção de Periodicidade', 
-                             fontsize=14, fontweight='bold')
-            self.fig.tight_layout()
-            self.canvas.draw()
-            self._update_progress(5, "Análise Completa!")
-            
-            explanation = f"""
+{"O algoritmo identificou com sucesso a periodicidade do pulsar!" if results['detected'] else "Nenhum pico acima do limiar: sinal compatível com apenas ruído."}
+        """
+        
+        layout['info_text'].set_text(detection_info)
+
+        if spectra_changed:
+            self.canvas.draw_idle()
+        else:
+            self._blit_animated()  # Só os marcadores mudaram: sem redesenhar os espectros
+        self._update_progress(5, "Análise Completa!")
+        
+        explanation = f"""
 📊 PASSO 5: TRANSFORMADA DE FOURIER (FFT)
 
 A FFT revela as frequências presentes no sinal!
@@ -972,22 +1328,27 @@ Em radiotelescópios, este processo detecta pulsares reais no universo, permitin
 
 🏆 MISSÃO CUMPRIDA!
 Você aprendeu todo o pipeline de detecção de pulsares usando processamento digital de sinais!
-            """
-            self.explanation_text.delete(1.0, tk.END)
-            self.explanation_text.insert(tk.END, explanation)
-            
-            # Mostrar popup de conclusão
-            messagebox.showinfo("🎉 Parabéns!", 
-                              "Você completou todo o processo de detecção de pulsares!\n\n"
-                              f"Período detectado: {results['detected_period']:.3f} segundos\n"
-                              f"Frequência: {results['detected_peak_freq']:.2f} Hz\n\n"
-                              "Todos os conceitos de Sinais e Sistemas foram aplicados com sucesso!")
-            
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro no Passo 5: {e}")
+        """
+        self.explanation_text.delete(1.0, tk.END)
+        self.explanation_text.insert(tk.END, explanation)
 
     def _reset_all(self):
         """Reset completo da aplicação"""
+        # Descarta qualquer processamento em andamento (mensagens antigas serão ignoradas)
+        self._cancel_event.set()
+        self._task_id += 1
+        self._set_busy(False)
+        self.task_progress['value'] = 0
+        self.task_progress_var.set("Etapa: ociosa")
+
+        if self._tuning_after_id is not None:
+            self.root.after_cancel(self._tuning_after_id)
+            self._tuning_after_id = None
+        # Um pipeline novo em vez de limpar o atual: uma tarefa antiga que ainda esteja
+        # rodando continua com o seu e não invalida estágios em uso nem altera parâmetros
+        self.pipeline = build_signal_pipeline()
+        self._on_profile_toggle()
+
         self.current_step = 0
         self.current_noisy_signal = None
         self.current_time_vector = None
@@ -1012,9 +1373,7 @@ Você aprendeu todo o pipeline de detecção de pulsares usando processamento di
         self.status_var.set("🚀 Sistema Reinicializado | Pronto para Nova Detecção")
         self.status_indicator.configure(fg=self.colors['success'])
         
-        # Reset plot - limpar completamente e mostrar tela inicial
-        self.fig.clear()
-        self.ax = self.fig.add_subplot(1, 1, 1)
+        # Reset plot - volta à tela inicial (os layouts dos passos são reaproveitados)
         self._show_welcome_screen()
     
     def _clear_plots(self):
@@ -0,0 +1,225 @@
+"""
+Suíte de regressão de desempenho das funções centrais.
+Cronometra process_and_analyze_signal, process_and_analyze_batch,
+generate_and_save_random_signal e generate_educational_components em uma grade de
+tamanhos de sinal, ordens de filtro e tamanhos de lote; mede a vazão (amostras por
+segundo, melhor de várias repetições) e o pico de memória (tracemalloc, em uma
+execução separada para não distorcer os tempos).
+
+Os resultados podem ser gravados como linha de base em JSON e comparados depois:
+o script sai com código 1 se algum caso perder vazão ou ganhar pico de memória
+além da tolerância.
+
+Exemplo:
+    python perf_regression.py --save linha_base.json
+    python perf_regression.py --compare linha_base.json --tolerance 0.15
+    python perf_regression.py --sizes 1e3 1e5 1e7 1e8 --save grande.json   # 1e8 precisa de vários GB
+
+A linha de base do repositório fica em tests/perf_baseline.json e é verificada
+pelo pytest com o marcador perf (opcional, pois os tempos dependem da máquina).
+Na integração contínua, a partir da raiz do repositório:
+    python -m pytest tests --perf                  # falha se algum caso regredir
+    python src/perf_regression.py --save tests/perf_baseline.json   # ao trocar de runner
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+import scipy
+
+from generate_signal import generate_and_save_random_signal, generate_educational_components
+from instrumentation import StageProfiler
+from process_signal import process_and_analyze_signal, process_and_analyze_batch
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5, 10**6)
+DEFAULT_ORDERS = (2, 5, 8)
+DEFAULT_BATCHES = (1, 8, 32)
+FS = 1000
+BATCH_SAMPLES = 10**4  # Tamanho de cada sinal nos casos de lote e de ordem de filtro
+
+
+def _test_signal(n_samples, n_signals=None):
+    """Sinal (ou lote) determinístico com uma componente de 7.3 Hz e ruído branco"""
+    rng = np.random.default_rng(0)
+    shape = (n_samples,) if n_signals is None else (n_signals, n_samples)
+    t = np.arange(n_samples) / FS
+    return np.sin(2 * np.pi * 7.3 * t) + rng.standard_normal(shape)
+
+
+def _process_case(n_samples, filter_order=5, n_signals=None):
+    """Prepara a chamada de process_and_analyze_signal (ou _batch, com n_signals)"""
+    x = _test_signal(n_samples, n_signals)
+    if n_signals is None:
+        return lambda: process_and_analyze_signal(x, FS, 35, filter_order=filter_order)
+    return lambda: process_and_analyze_batch(x, FS, 35, filter_order=filter_order)
+
+
+def _generate_random_case(n_samples):
+    """Prepara a chamada de generate_and_save_random_signal (semente e tipo fixos)"""
+    return lambda: generate_and_save_random_signal(FS, n_samples / FS, 0.5, rng=0, signal_type='pulsar')
+
+
+def _generate_educational_case(n_samples):
+    """Prepara a chamada de generate_educational_components"""
+    return lambda: generate_educational_components(FS, n_samples / FS)
+
+
+def build_cases(sizes=DEFAULT_SIZES, orders=DEFAULT_ORDERS, batches=DEFAULT_BATCHES):
+    """
+    Lista de casos (nome, amostras processadas por chamada, preparo, argumentos).
+    O preparo aloca as entradas e devolve a função cronometrada; assim a geração dos
+    sinais de teste fica fora da medição e só acontece quando o caso vai rodar.
+    """
+    cases = []
+    for n in sizes:
+        cases.append((f"process_signal/n={n}", n, _process_case, (n,)))
+        cases.append((f"generate_random/n={n}", n, _generate_random_case, (n,)))
+        cases.append((f"generate_educational/n={n}", n, _generate_educational_case, (n,)))
+    for order in orders:
+        cases.append((f"process_signal/n={BATCH_SAMPLES}/order={order}", BATCH_SAMPLES,
+                      _process_case, (BATCH_SAMPLES, order)))
+    for batch in batches:
+        cases.append((f"process_batch/n={BATCH_SAMPLES}/batch={batch}", BATCH_SAMPLES * batch,
+                      _process_case, (BATCH_SAMPLES, 5, batch)))
+    return cases
+
+
+def time_call(func, repeats=5, min_time=0.2):
+    """
+    Melhor tempo por chamada: como o timeit, escolhe quantas chamadas por repetição
+    são necessárias para durar ao menos min_time e fica com a repetição mais rápida.
+    """
+    func()  # Aquece caches (filtros, planos de FFT, layouts de banda)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    best = elapsed / number
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def peak_memory(func):
+    """Pico de memória alocada (bytes) durante uma chamada, medido com tracemalloc"""
+    profiler = StageProfiler(trace_memory=True)
+    try:
+        with profiler.stage('call'):
+            func()
+        return profiler.report()[0]['peak_bytes']
+    finally:
+        profiler.close()
+
+
+def run_suite(cases, repeats=5, min_time=0.2, verbose=True):
+    """Mede todos os casos; retorna {nome: {seconds, samples_per_s, peak_bytes}}"""
+    results = {}
+    for name, n_samples, setup, setup_args in cases:
+        func = setup(*setup_args)
+        seconds = time_call(func, repeats, min_time)
+        results[name] = {'seconds': seconds, 'samples_per_s': n_samples / seconds,
+                         'peak_bytes': peak_memory(func)}
+        del func
+        if verbose:
+            row = results[name]
+            print(f"{name:<40} {row['seconds'] * 1e3:>10.3f} ms {row['samples_per_s'] / 1e6:>10.2f} Ma/s "
+                  f"{row['peak_bytes'] / 1e6:>10.2f} MB")
+    return results
+
+
+def environment():
+    """Versões e máquina: linhas de base só são comparáveis no mesmo ambiente"""
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'scipy': scipy.__version__,
+            'machine': platform.machine(), 'processor': platform.processor(),
+            'created': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+
+def save_baseline(path, results):
+    """Grava a linha de base em JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'cases': results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    """Lê uma linha de base gravada por save_baseline"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance=0.15, memory_tolerance=0.10):
+    """
+    Compara os resultados com a linha de base. Um caso regride se a vazão cair mais
+    que `tolerance` ou o pico de memória subir mais que `memory_tolerance` (frações).
+    Casos ausentes da linha de base são ignorados. Retorna uma linha por caso comparado.
+    """
+    rows = []
+    for name, row in results.items():
+        reference = baseline['cases'].get(name)
+        if reference is None:
+            continue
+        speed = row['samples_per_s'] / reference['samples_per_s']
+        memory = row['peak_bytes'] / reference['peak_bytes'] if reference['peak_bytes'] else 1.0
+        problems = []
+        if speed < 1 - tolerance:
+            problems.append(f"vazão {speed - 1:+.0%}")
+        if memory > 1 + memory_tolerance:
+            problems.append(f"memória {memory - 1:+.0%}")
+        rows.append({'case': name, 'speed_ratio': speed, 'memory_ratio': memory, 'problems': problems})
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Regressão de desempenho das funções centrais")
+    parser.add_argument('--sizes', type=float, nargs='+', default=list(DEFAULT_SIZES),
+                        help="Tamanhos de sinal (amostras; até 1e8)")
+    parser.add_argument('--orders', type=int, nargs='+', default=list(DEFAULT_ORDERS),
+                        help="Ordens de filtro")
+    parser.add_argument('--batches', type=int, nargs='+', default=list(DEFAULT_BATCHES),
+                        help="Tamanhos de lote para process_and_analyze_batch")
+    parser.add_argument('--repeats', type=int, default=5, help="Repetições por caso (usa a melhor)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Duração mínima de cada repetição (s)")
+    parser.add_argument('--save', default=None, help="Grava os resultados como linha de base (JSON)")
+    parser.add_argument('--compare', default=None, help="Linha de base (JSON) para comparar")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="Queda de vazão tolerada (fração)")
+    parser.add_argument('--memory-tolerance', type=float, default=0.10,
+                        help="Aumento de pico de memória tolerado (fração)")
+    args = parser.parse_args()
+
+    print("📈 REGRESSÃO DE DESEMPENHO")
+    print("=" * 78)
+    cases = build_cases([int(n) for n in args.sizes], args.orders, args.batches)
+    results = run_suite(cases, args.repeats, args.min_time)
+    print("=" * 78)
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"💾 Linha de base gravada em {args.save}")
+
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        current = environment()
+        if any(baseline['environment'].get(key) != current[key] for key in current if key != 'created'):
+            print("⚠️ Linha de base gravada em outro ambiente; as razões podem não ser comparáveis")
+        rows = compare(results, baseline, args.tolerance, args.memory_tolerance)
+        for row in rows:
+            status = "❌ " + "; ".join(row['problems']) if row['problems'] else "✅"
+            print(f"{row['case']:<40} vazão ×{row['speed_ratio']:.2f}  memória ×{row['memory_ratio']:.2f}  "
+                  f"{status}")
+        regressions = [row for row in rows if row['problems']]
+        if regressions:
+            print(f"❌ {len(regressions)} caso(s) regrediram além da tolerância")
+            sys.exit(1)
+        print(f"✅ {len(rows)} caso(s) dentro da tolerância")
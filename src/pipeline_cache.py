@@ -0,0 +1,231 @@
+"""
+Cache de resultados intermediários com dependências explícitas.
+Cada estágio declara de quais parâmetros e estágios depende; mudar um parâmetro
+invalida apenas os estágios a jusante dele, que são recalculados sob demanda.
+Assim, mudar a faixa de detecção não refiltra o sinal, mudar o corte não refaz
+a FFT do sinal original e mudar o ruído não ressintetiza as componentes.
+"""
+
+import numpy as np
+
+from generate_signal import component_signals
+from instrumentation import stage as stage_timer
+from process_signal import filter_signal, compute_power_spectrum, analyze_spectrum
+
+# Marca de "sem valor em cache" (None é um valor válido de estágio)
+_MISSING = object()
+
+
+def _same_value(old, new):
+    """Arrays, listas e dicionários comparam por identidade; escalares por valor"""
+    if old is new:
+        return True
+    mutable = (np.ndarray, list, dict)
+    if isinstance(old, mutable) or isinstance(new, mutable):
+        return False
+    try:
+        return bool(old == new)
+    except (TypeError, ValueError):
+        return False
+
+
+class PipelineCache:
+    """
+    Grafo de estágios com cache dos valores calculados.
+    add_stage registra func(*valores_das_dependências); set_params altera
+    parâmetros e invalida os dependentes; get calcula só o que está faltando.
+    Expõe contadores de acertos (hits), faltas (misses) e de cálculos por estágio.
+    Atribuir um instrumentation.StageProfiler a `profiler` mede cada estágio calculado.
+    """
+
+    def __init__(self):
+        self._stages = {}      # nome -> (função, dependências, descrição)
+        self._dependents = {}  # nome -> estágios que dependem diretamente dele
+        self._params = {}
+        self._values = {}
+        self._generation = 0   # Incrementado a cada mudança de parâmetro
+        self.hits = 0
+        self.misses = 0
+        self.compute_counts = {}
+        self.profiler = None
+
+    def add_stage(self, name, func, deps, description=None):
+        """Registra um estágio; deps pode misturar nomes de parâmetros e de outros estágios"""
+        self._stages[name] = (func, tuple(deps), description or name)
+        for dep in deps:
+            self._dependents.setdefault(dep, []).append(name)
+        self._invalidate(name)
+
+    def set_params(self, **params):
+        """
+        Atualiza parâmetros. Só os que mudaram invalidam estágios (arrays e objetos
+        mutáveis são comparados por identidade: passar um array novo conta como mudança).
+        Retorna o conjunto de estágios descartados.
+        """
+        dropped = set()
+        for name, value in params.items():
+            if name in self._params and _same_value(self._params[name], value):
+                continue
+            self._params[name] = value
+            self._generation += 1
+            for stage in self._dependents.get(name, ()):
+                dropped |= self._invalidate(stage)
+        return dropped
+
+    def _invalidate(self, name):
+        """Descarta o valor do estágio e de tudo que depende dele"""
+        dropped = set()
+        stack = [name]
+        while stack:
+            stage = stack.pop()
+            if stage in dropped:
+                continue
+            self._values.pop(stage, None)
+            dropped.add(stage)
+            stack.extend(self._dependents.get(stage, ()))
+        return dropped
+
+    def is_cached(self, name):
+        """True se o estágio já está calculado para os parâmetros atuais"""
+        return name in self._values
+
+    def get(self, name, progress=None):
+        """
+        Retorna o valor do estágio (ou parâmetro), calculando só os estágios que faltam,
+        em ordem topológica. progress(fração, descrição) é chamado antes de cada
+        cálculo e pode lançar uma exceção para interromper (cancelamento).
+        """
+        if name not in self._stages:
+            return self._lookup(name, {})
+
+        # Os valores em cache usados são capturados já no planejamento: se outra thread
+        # invalidar estágios no meio do cálculo, este continua com o que tinha
+        generation = self._generation
+        plan = []
+        computed = {}
+        self._plan(name, plan, set(), computed)
+        if not plan:
+            self.hits += 1
+            return computed[name]
+
+        # Se os parâmetros mudarem durante o cálculo (outra thread), o resultado
+        # é devolvido mas não entra no cache
+        for i, stage in enumerate(plan):
+            func, deps, description = self._stages[stage]
+            if progress is not None:
+                progress(i / len(plan), description)
+            with stage_timer(self.profiler, stage):
+                computed[stage] = func(*(self._lookup(dep, computed) for dep in deps))
+            self.misses += 1
+            self.compute_counts[stage] = self.compute_counts.get(stage, 0) + 1
+            if generation == self._generation:
+                self._values[stage] = computed[stage]
+        return computed[name]
+
+    def _plan(self, name, plan, seen, cached):
+        """
+        Lista (em ordem de dependência) os estágios que precisam ser calculados e
+        guarda em `cached` os valores já calculados de que eles dependem.
+        """
+        if name in seen or name in cached:
+            return
+        value = self._values.get(name, _MISSING)
+        if value is not _MISSING:
+            cached[name] = value
+            return
+        if name not in self._stages:
+            if name not in self._params:
+                raise KeyError(f"Parâmetro ou estágio desconhecido: {name!r}")
+            return
+        seen.add(name)
+        for dep in self._stages[name][1]:
+            self._plan(dep, plan, seen, cached)
+        plan.append(name)
+
+    def _lookup(self, name, computed):
+        if name in computed:
+            return computed[name]
+        if name not in self._params:
+            raise KeyError(f"Parâmetro ou estágio desconhecido: {name!r}")
+        return self._params[name]
+
+    def cache_info(self):
+        """Resumo do estado do cache (no estilo de FilterBank.cache_info)"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'cached': sorted(self._values),
+            'compute_counts': dict(self.compute_counts)
+        }
+
+    def clear(self):
+        """Descarta todos os valores calculados e zera os contadores (mantém os parâmetros)"""
+        self._values.clear()
+        self._generation += 1
+        self.hits = 0
+        self.misses = 0
+        self.compute_counts.clear()
+
+
+def _superpose(t, components):
+    """Soma das componentes (sinal nulo quando não há nenhuma)"""
+    clean_signal = np.zeros_like(t)
+    for comp in components:
+        clean_signal += comp['signal']
+    return clean_signal
+
+
+def _assemble_analysis(t, noisy_signal, filtered_signal, spectrum_original, spectrum_filtered,
+                       detection, cutoff_freq, filter_order):
+    """Monta o dicionário no mesmo formato de process_and_analyze_signal"""
+    xf, power_spectrum_filtered = spectrum_filtered
+    return {
+        'time_vector': t,
+        'noisy_signal': noisy_signal,
+        'filtered_signal': filtered_signal,
+        'frequencies': xf,
+        'power_spectrum_original': spectrum_original[1],
+        'power_spectrum_filtered': power_spectrum_filtered,
+        **detection,
+        'cutoff_freq': cutoff_freq,
+        'filter_order': filter_order
+    }
+
+
+def build_signal_pipeline(filter_bank=None):
+    """
+    Pipeline completo do sinal sintético (componentes → ruído → filtro → FFT → detecção).
+    Parâmetros: Fs, duration, signal_info, rng, noise_amplitude, cutoff_freq,
+    filter_order, min_freq e max_freq. O ruído é sorteado uma vez com amplitude
+    unitária e só reescalado quando noise_amplitude muda.
+    """
+    pipeline = PipelineCache()
+    pipeline.add_stage('time_vector', lambda Fs, duration: np.arange(0, duration, 1 / Fs),
+                       ['Fs', 'duration'], "Criando vetor de tempo")
+    pipeline.add_stage('components', component_signals, ['time_vector', 'signal_info'],
+                       "Sintetizando componentes")
+    pipeline.add_stage('clean_signal', _superpose, ['time_vector', 'components'],
+                       "Somando componentes")
+    pipeline.add_stage('unit_noise', lambda t, rng: rng.standard_normal(len(t)),
+                       ['time_vector', 'rng'], "Gerando ruído gaussiano")
+    pipeline.add_stage('noise', lambda amplitude, unit_noise: amplitude * unit_noise,
+                       ['noise_amplitude', 'unit_noise'], "Escalando ruído")
+    pipeline.add_stage('noisy_signal', lambda clean, noise: clean + noise,
+                       ['clean_signal', 'noise'], "Somando ruído ao sinal")
+    pipeline.add_stage('filtered_signal',
+                       lambda x, Fs, cutoff, order: filter_signal(x, Fs, cutoff, order, filter_bank),
+                       ['noisy_signal', 'Fs', 'cutoff_freq', 'filter_order'], "Filtrando sinal")
+    pipeline.add_stage('spectrum_original', compute_power_spectrum, ['noisy_signal', 'Fs'],
+                       "FFT do sinal original")
+    pipeline.add_stage('spectrum_filtered', compute_power_spectrum, ['filtered_signal', 'Fs'],
+                       "FFT do sinal filtrado")
+    pipeline.add_stage('detection',
+                       lambda spectrum, Fs, cutoff, min_freq, max_freq: analyze_spectrum(
+                           spectrum[0], spectrum[1], Fs, cutoff, min_freq, max_freq),
+                       ['spectrum_filtered', 'Fs', 'cutoff_freq', 'min_freq', 'max_freq'],
+                       "Buscando picos")
+    pipeline.add_stage('analysis', _assemble_analysis,
+                       ['time_vector', 'noisy_signal', 'filtered_signal', 'spectrum_original',
+                        'spectrum_filtered', 'detection', 'cutoff_freq', 'filter_order'],
+                       "Montando resultados")
+    return pipeline
@@ -0,0 +1,144 @@
+"""
+Renderização em níveis de detalhe para sinais longos.
+Uma pirâmide min/max guarda, para blocos de 2, 4, 8, ... amostras, o mínimo e o
+máximo de cada bloco. Na hora de desenhar escolhe-se o nível mais fino cujo
+trecho visível cabe em ~max_points pontos, então o custo de desenho fica
+constante mesmo com milhões de amostras, e picos estreitos (ruído, linhas
+espectrais) nunca somem como aconteceria com uma subamostragem simples.
+"""
+
+import numpy as np
+
+
+def _interleave(x, lo, hi):
+    """Monta a envoltória (x, y) alternando mínimo e máximo de cada bloco"""
+    xx = np.repeat(x, 2)
+    yy = np.empty(2 * len(lo), dtype=np.result_type(lo, hi))
+    yy[0::2] = lo
+    yy[1::2] = hi
+    return xx, yy
+
+
+def minmax_decimate(x, y, max_points=4000):
+    """
+    Decimação min/max de uma única passada, para gráficos estáticos.
+    Retorna (x, y) com no máximo ~max_points pontos; sinais curtos voltam intactos.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n_blocks = max(1, max_points // 2)
+    if len(y) <= max_points:
+        return x, y
+
+    block = -(-len(y) // n_blocks)  # Divisão com arredondamento para cima
+    n_full = len(y) // block * block
+    lo = y[:n_full].reshape(-1, block).min(axis=1)
+    hi = y[:n_full].reshape(-1, block).max(axis=1)
+    starts = x[:n_full:block]
+    if n_full < len(y):  # Bloco final incompleto
+        lo = np.append(lo, y[n_full:].min())
+        hi = np.append(hi, y[n_full:].max())
+        starts = np.append(starts, x[n_full])
+    return _interleave(starts, lo, hi)
+
+
+class MinMaxPyramid:
+    """
+    Pirâmide min/max de uma série (x crescente, como tempo ou frequência).
+    Cada nível agrupa pares de blocos do nível anterior, então a construção
+    custa O(N) no total e a consulta de um trecho custa O(max_points).
+    """
+
+    def __init__(self, x, y, min_points=1024):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError("x e y devem ser vetores 1-D do mesmo tamanho")
+
+        # levels[k] = (início de cada bloco, mínimos, máximos) para blocos de 2**(k+1) amostras
+        self.levels = []
+        xs, lo, hi = self.x, self.y, self.y
+        while len(xs) > min_points:
+            if len(xs) % 2:
+                # Repete o último bloco para fechar o par (não altera mínimo nem máximo)
+                xs, lo, hi = np.append(xs, xs[-1]), np.append(lo, lo[-1]), np.append(hi, hi[-1])
+            xs = xs[0::2]
+            lo = np.minimum(lo[0::2], lo[1::2])
+            hi = np.maximum(hi[0::2], hi[1::2])
+            self.levels.append((xs, lo, hi))
+
+    @staticmethod
+    def _visible(xs, xmin, xmax):
+        """Índices [i0, i1) do trecho visível, com um ponto extra de cada lado"""
+        i0 = max(0, np.searchsorted(xs, xmin, side='right') - 1)
+        i1 = min(len(xs), np.searchsorted(xs, xmax, side='left') + 1)
+        return i0, i1
+
+    def view(self, xmin, xmax, max_points=4000):
+        """
+        Retorna (x, y) do trecho [xmin, xmax] no nível mais fino que cabe em
+        max_points pontos. Com zoom suficiente devolve as amostras originais.
+        """
+        if xmin > xmax:
+            xmin, xmax = xmax, xmin
+        i0, i1 = self._visible(self.x, xmin, xmax)
+        if i1 - i0 <= max_points or not self.levels:
+            return self.x[i0:i1], self.y[i0:i1]
+
+        for xs, lo, hi in self.levels:
+            j0, j1 = self._visible(xs, xmin, xmax)
+            if 2 * (j1 - j0) <= max_points:
+                break
+        return _interleave(xs[j0:j1], lo[j0:j1], hi[j0:j1])
+
+
+class DecimatedLine:
+    """
+    Liga um Line2D a uma pirâmide min/max e refaz a decimação sempre que os
+    limites do eixo x mudam (zoom e pan da NavigationToolbar2Tk, botão 'home',
+    set_xlim). Atributos não definidos aqui são repassados para a linha.
+
+    O matplotlib guarda só referências fracas aos callbacks: o objeto precisa
+    ser mantido vivo por quem o criou.
+    """
+
+    def __init__(self, line, max_points=4000):
+        self.line = line
+        self.max_points = max_points
+        self.pyramid = None
+        self._source = (None, None)
+        line.axes.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def __getattr__(self, name):
+        return getattr(self.line, name)
+
+    def set_data(self, x, y):
+        """Troca a série completa; reaproveita a pirâmide se os arrays forem os mesmos"""
+        if self._source[0] is not x or self._source[1] is not y:
+            self.pyramid = MinMaxPyramid(x, y) if len(x) else None
+            self._source = (x, y)
+        self.refresh()
+
+    def refresh(self):
+        """Atualiza os pontos desenhados para os limites atuais do eixo"""
+        if self.pyramid is None:
+            self.line.set_data([], [])
+            return
+        xmin, xmax = self.line.axes.get_xlim()
+        self.line.set_data(*self.pyramid.view(xmin, xmax, self.max_points))
+
+    def _on_xlim_changed(self, ax):
+        self.refresh()
+
+
+def plot_decimated(ax, x, y, *args, max_points=4000, **kwargs):
+    """
+    Equivalente a ax.plot(x, y, ...) para séries longas: desenha a envoltória
+    min/max (o autoscale vê a série inteira) e refina conforme o zoom.
+    Retorna o DecimatedLine, que deve ser mantido vivo enquanto a figura existir.
+    """
+    x = np.asarray(x)
+    line, = ax.plot(*minmax_decimate(x, y, max_points), *args, **kwargs)
+    decimated = DecimatedLine(line, max_points)
+    decimated.set_data(x, y)
+    return decimated
@@ -1,46 +1,773 @@
+from functools import lru_cache
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.signal import butter, filtfilt
-from scipy.fft import fft, fftfreq
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import sosfiltfilt, zoom_fft, get_window, hilbert
+from scipy.fft import fft, fftfreq, rfft, rfftfreq, next_fast_len
+from scipy.special import gammaincc, gammaln, ndtri_exp
+
+from filter_bank import default_filter_bank
+from instrumentation import stage
+from epoch_folding import refine_period
+from fast_folding import ffa_search
+
+def _report_progress(progress, fraction, description):
+    """Repassa o andamento do pipeline ao callback opcional de progresso"""
+    if progress is not None:
+        progress(fraction, description)
+
+def _fft_length(N, pad):
+    """
+    Escolhe o tamanho da FFT: N (sem preenchimento), próximo tamanho rápido
+    ('fast') ou próxima potência de dois ('pow2').
+    """
+    if pad is None:
+        return N
+    if pad == 'fast':
+        return next_fast_len(N, real=True)
+    if pad == 'pow2':
+        return 1 << (N - 1).bit_length()
+    raise ValueError(f"Preenchimento de FFT desconhecido: {pad!r} (use None, 'fast' ou 'pow2')")
+
+def _half_power_spectrum(x, T, use_rfft=True, workers=None, pad=None):
+    """
+    Calcula o espectro de potência de meio lado ao longo do último eixo.
+    Com use_rfft=True usa a FFT real (metade do custo); com False mantém o caminho
+    antigo com a FFT complexa completa. Retorna (frequências, potência), ambos com
+    n_fft//2 pontos, no mesmo layout de fftfreq(n_fft, T)[:n_fft//2].
+    """
+    n_fft = _fft_length(x.shape[-1], pad)
+    half = n_fft // 2
+    if use_rfft:
+        yf = rfft(x, n=n_fft, axis=-1, workers=workers)[..., :half]
+        xf = rfftfreq(n_fft, T)[:half]
+    else:
+        yf = fft(x, n=n_fft, axis=-1, workers=workers)[..., :half]
+        xf = fftfreq(n_fft, T)[:half]
+    return xf, np.abs(yf)**2
+
+def _whiten_spectrum(power, block_size=64):
+    """
+    Normaliza o espectro pelo piso de ruído local.
+    O piso é a mediana de blocos de block_size bins (dividida por ln 2, já que a
+    potência do ruído segue distribuição exponencial), calculada com um reshape
+    em vez de um filtro de mediana deslizante. Para ruído puro o resultado tem
+    média ~1 em qualquer região do espectro, inclusive na banda de rejeição.
+    """
+    n_bins = power.shape[-1]
+    n_blocks = -(-n_bins // block_size)
+    padded = np.pad(power, [(0, 0)] * (power.ndim - 1) + [(0, n_blocks * block_size - n_bins)],
+                    mode='edge')
+    blocks = padded.reshape(power.shape[:-1] + (n_blocks, block_size))
+    floor = np.median(blocks, axis=-1) / np.log(2)
+    floor = np.repeat(floor, block_size, axis=-1)[..., :n_bins]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(floor > 0, power / floor, 0.0)
+
+# Maior log da probabilidade de falso alarme convertido em sigmas (evita -inf quando p = 1)
+_MAX_LOG_FALSE_ALARM = np.log1p(-np.finfo(float).eps)
+
+def false_alarm_sigma(log_survival, n_trials):
+    """
+    Significância corrigida pelo número de bins buscados.
+    log_survival é o log da probabilidade de um único bin de ruído superar o pico;
+    a chance de o maior de n_trials bins de ruído superá-lo (falso alarme) é
+    1 - (1 - p)^n_trials, calculada em escala log para não zerar em picos fortes.
+    Retorna (sigma, log do falso alarme), com sigma = cauda unilateral equivalente
+    de uma normal; assim o mesmo limiar vale para gravações de qualquer duração.
+    """
+    log_survival = np.asarray(log_survival, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        p = np.exp(log_survival)
+        log_false_alarm = np.where(p * n_trials < 1e-8, log_survival + np.log(n_trials),
+                                   np.log(-np.expm1(n_trials * np.log1p(-p))))
+    log_false_alarm = np.minimum(log_false_alarm, _MAX_LOG_FALSE_ALARM)
+    return -ndtri_exp(log_false_alarm), log_false_alarm
+
+def _log_gamma_survival(h, s):
+    """
+    log P(soma de h bins de ruído branqueado > s): a soma de h exponenciais de
+    média 1 segue uma gama(h, 1). Quando gammaincc zera usa o termo assintótico
+    (h-1)·ln s - s - ln Γ(h), válido para s >> h.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        q = gammaincc(h, np.maximum(s, 0.0))
+        return np.where(q > 0, np.log(q), (h - 1) * np.log(s) - s - gammaln(h))
+
+def harmonic_sum_search(power_spectrum, frequencies, idx_min, idx_max, max_harmonics=16,
+                        noise_mean=None):
+    """
+    Soma incoerente de harmônicos para a busca do pico.
+    O espectro é branqueado (_whiten_spectrum) e testado nas dobras h = 1, 2, 4, 8, ...
+    até max_harmonics. Na dobra h, cada índice j representa o h-ésimo harmônico de
+    uma fundamental em j/h bins, e a soma P[round(j·1/h)] + ... + P[round(j·h/h)] é
+    feita com indexação vetorizada do espectro; assim todo harmônico cai a no máximo
+    meio bin da posição verdadeira, mesmo quando a fundamental não coincide com um bin.
+    Com noise_mean (potência média de ruído por bin, escalar ou uma por sinal) o
+    espectro é dividido por ela em vez de branqueado por blocos; é o caso do espectro
+    filtrado, em que os blocos sobre a queda do filtro perto do corte inflariam bins
+    de ruído (ali a potência normalizada fica abaixo de 1 e a busca é conservadora).
+    Com o espectro normalizado, a soma de h bins de ruído segue uma gama(h, 1); cada
+    dobra é comparada pela probabilidade dessa cauda, e a melhor vira significância
+    corrigida pelo total de somas testadas em todas as dobras (false_alarm_sigma).
+    Funciona ao longo do último eixo: aceita um espectro (N,) ou um lote (n_sinais, N).
+    Retorna dicionário com a fundamental (resolução de 1/h bin), a dobra, o score
+    (S - h)/sqrt(h) e a significância 'sigma' com seu 'false_alarm'.
+    """
+    power = np.asarray(power_spectrum, dtype=float)
+    if noise_mean is None:
+        power = _whiten_spectrum(power)
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            power = np.nan_to_num(power / np.asarray(noise_mean, dtype=float)[..., np.newaxis])
+    n_bins = power.shape[-1]
+    batch_shape = power.shape[:-1]
+    df = frequencies[1] - frequencies[0]
+
+    best_score = np.full(batch_shape, -np.inf)
+    best_log_survival = np.full(batch_shape, np.inf)
+    best_position = np.full(batch_shape, float(idx_min))
+    best_fold = np.ones(batch_shape, dtype=int)
+    n_trials = 0
+
+    fold = 1
+    while fold <= max_harmonics:
+        # j = posição (em bins) do harmônico mais alto; a fundamental fica em j/fold
+        j = np.arange(fold * idx_min, min(fold * idx_max, n_bins))
+        if j.size == 0:
+            break
+        sums = np.zeros(batch_shape + (j.size,))
+        for m in range(1, fold + 1):
+            sums += power[..., (j * m + fold // 2) // fold]
+        n_trials += j.size
+
+        # Dentro da dobra a maior soma é a mais improvável; entre dobras decide a cauda gama
+        fold_index = np.argmax(sums, axis=-1)
+        fold_sum = np.take_along_axis(sums, fold_index[..., np.newaxis], axis=-1)[..., 0]
+        fold_log_survival = _log_gamma_survival(fold, fold_sum)
+        better = fold_log_survival < best_log_survival
+        best_log_survival = np.where(better, fold_log_survival, best_log_survival)
+        best_score = np.where(better, (fold_sum - fold) / np.sqrt(fold), best_score)
+        best_position = np.where(better, j[fold_index] / fold, best_position)
+        best_fold = np.where(better, fold, best_fold)
+        fold *= 2
+
+    sigma, log_false_alarm = false_alarm_sigma(best_log_survival, max(n_trials, 1))
+    return {
+        'fundamental_freq': frequencies[0] + best_position * df,
+        'fold': best_fold,
+        'score': best_score,
+        'sigma': sigma,
+        'false_alarm': np.exp(log_false_alarm)
+    }
+
+# Fração do corte até onde a resposta do Butterworth é plana o bastante para o piso de ruído
+_FLAT_PASSBAND = 0.7
+
+def _passband_slice(xf, idx_min, idx_max, cutoff_freq):
+    """
+    Parte da faixa de detecção abaixo de cutoff_freq. Abaixo de _FLAT_PASSBAND·corte
+    estima o piso de ruído (perto do corte o espectro filtrado já é atenuado e puxaria
+    a mediana para baixo); abaixo do corte dá o número de bins efetivamente buscados.
+    """
+    idx_cutoff = min(idx_max, int(np.searchsorted(xf, cutoff_freq, side='right')))
+    return slice(idx_min, idx_cutoff) if idx_cutoff - idx_min >= 2 else slice(idx_min, idx_max)
+
+# Registro de um candidato: frequência (Hz), potência, significância corrigida pelo número
+# de bins buscados (sigmas equivalentes) e probabilidade de falso alarme
+CANDIDATE_DTYPE = np.dtype([('freq', 'f8'), ('power', 'f8'), ('sigma', 'f8'), ('false_alarm', 'f8')])
+
+def extract_candidates(power_spectrum, frequencies, idx_min, idx_max, n_candidates=5,
+                       noise_slice=None, n_trials=None):
+    """
+    Extrai os K melhores picos do espectro na faixa [idx_min, idx_max).
+    Só máximos locais são considerados (supressão de não-máximos por comparação com
+    os vizinhos), e os K maiores são escolhidos com np.argpartition, sem ordenar o
+    espectro inteiro. A potência de um bin de ruído segue uma exponencial, cuja
+    média é estimada de forma robusta pela mediana / ln 2 da região noise_slice
+    (padrão: a própria faixa); um pico P tem probabilidade exp(-P/média) em um bin,
+    corrigida pelo número de bins buscados n_trials (padrão: o tamanho da faixa)
+    com false_alarm_sigma. Sem essa
+    correção o maior pico de ruído cresce com ln N e gravações longas sempre
+    "detectariam" algo. Em espectros médios (Welch/Bartlett) a cauda real é mais
+    curta que a exponencial e a significância fica conservadora.
+    Funciona ao longo do último eixo; retorna um array estruturado CANDIDATE_DTYPE
+    de forma (..., K) ordenado por potência decrescente (posições sem pico = NaN).
+    """
+    power = np.asarray(power_spectrum)
+    band = power[..., idx_min:idx_max]
+    noise = power[..., noise_slice] if noise_slice is not None else band
+
+    noise_mean = np.median(noise, axis=-1, keepdims=True) / np.log(2)
+
+    # Supressão de não-máximos: o bin precisa ser >= ao vizinho esquerdo e > ao direito
+    left = power[..., max(idx_min - 1, 0):idx_max - 1]
+    right = power[..., idx_min + 1:idx_max + 1]
+    if idx_min == 0:
+        left = np.concatenate([np.full(band.shape[:-1] + (1,), -np.inf), left], axis=-1)
+    if right.shape[-1] < band.shape[-1]:
+        right = np.concatenate([right, np.full(band.shape[:-1] + (1,), -np.inf)], axis=-1)
+    peaks = np.where((band >= left) & (band > right), band, -np.inf)
+
+    k = min(n_candidates, peaks.shape[-1])
+    top = np.argpartition(peaks, -k, axis=-1)[..., -k:]
+    top_power = np.take_along_axis(peaks, top, axis=-1)
+    order = np.argsort(-top_power, axis=-1)  # Ordena só os K escolhidos
+    top = np.take_along_axis(top, order, axis=-1)
+    top_power = np.take_along_axis(top_power, order, axis=-1)
+
+    valid = np.isfinite(top_power)
+    candidates = np.empty(top.shape, dtype=CANDIDATE_DTYPE)
+    candidates['freq'] = np.where(valid, frequencies[idx_min + top], np.nan)
+    candidates['power'] = np.where(valid, top_power, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma, log_false_alarm = false_alarm_sigma(-top_power / noise_mean,
+                                                   n_trials or band.shape[-1])
+    candidates['sigma'] = np.where(valid, sigma, np.nan)
+    candidates['false_alarm'] = np.where(valid, np.exp(log_false_alarm), np.nan)
+    return candidates
+
+def filter_signal(x, Fs, cutoff_freq, filter_order, filter_bank=None, dtype=None, profiler=None):
+    """
+    Filtro passa-baixa Butterworth de fase zero (sosfiltfilt) ao longo do último eixo.
+    O projeto do filtro (SOS) vem do cache do banco. Com dtype=np.float32 o sinal e
+    os coeficientes são convertidos para precisão simples e a filtragem inteira roda
+    em float32. dtype=None segue a entrada: float32 continua em float32 (os
+    coeficientes float64 promoveriam o sinal dentro do sosfiltfilt) e os demais
+    tipos rodam em float64.
+    Com um profiler (instrumentation.StageProfiler) mede 'filter_design' e 'filtfilt'.
+    """
+    bank = filter_bank if filter_bank is not None else default_filter_bank
+    if dtype is None and np.asarray(x).dtype == np.float32:
+        dtype = np.float32
+    with stage(profiler, 'filter_design'):
+        sos = bank.get_sos(Fs, cutoff_freq, filter_order, btype='low')
+        if dtype is not None:
+            sos = sos.astype(dtype, copy=False)
+    with stage(profiler, 'filtfilt'):
+        if dtype is not None:
+            x = np.asarray(x, dtype=dtype)
+        return sosfiltfilt(sos, x, axis=-1)
+
+# Maior número de amostras janeladas materializadas por vez na estimativa segmentada
+_MAX_SEGMENT_BLOCK = 1 << 20
+
+def _segmented_power_spectrum(x, T, method='welch', window=None, nperseg=None, noverlap=None,
+                              workers=None):
+    """
+    Espectro médio de segmentos (Welch ou Bartlett) ao longo do último eixo.
+    Os segmentos são uma visão com passos (sliding_window_view, sem cópia) e cada
+    bloco de segmentos passa por uma única rfft em lote; a soma das potências é
+    acumulada bloco a bloco, então a memória fica limitada a ~_MAX_SEGMENT_BLOCK
+    amostras janeladas qualquer que seja a duração da gravação.
+    A escala é a de |X|² de um segmento (dividida pela potência média da janela).
+    Como no detrend='constant' do scipy.signal.welch, a média de cada segmento é
+    removida antes da janela, para que um nível DC não vaze para os bins vizinhos.
+
+    Args:
+        method: 'welch' (padrão: janela 'hann', 50% de sobreposição) ou 'bartlett'
+            (padrão: janela retangular, sem sobreposição)
+        window: Nome da janela para scipy.signal.get_window (None = padrão do método)
+        nperseg: Amostras por segmento (None = N/8, com no mínimo 256 ou N)
+        noverlap: Amostras de sobreposição entre segmentos (None = padrão do método)
+    """
+    N = x.shape[-1]
+    if nperseg is None:
+        nperseg = max(min(N, 256), N // 8)
+    nperseg = int(nperseg)
+    if not 1 < nperseg <= N:
+        raise ValueError(f"Tamanho de segmento inválido: {nperseg} (o sinal tem {N} amostras)")
+    if noverlap is None:
+        noverlap = nperseg // 2 if method == 'welch' else 0
+    if not 0 <= noverlap < nperseg:
+        raise ValueError("A sobreposição deve estar no intervalo [0, nperseg)")
+    if window is None:
+        window = 'hann' if method == 'welch' else 'boxcar'
+
+    real_dtype = np.result_type(x.dtype, np.float32)  # float32 continua em precisão simples
+    win = get_window(window, nperseg).astype(real_dtype, copy=False)
+    segments = sliding_window_view(x, nperseg, axis=-1)[..., ::nperseg - noverlap, :]
+    n_segments = segments.shape[-2]
+    half = nperseg // 2
+    batch_size = int(np.prod(x.shape[:-1]))
+
+    power = np.zeros(x.shape[:-1] + (half,))
+    block = max(1, _MAX_SEGMENT_BLOCK // (nperseg * batch_size))
+    for start in range(0, n_segments, block):
+        chunk = segments[..., start:start + block, :]
+        chunk = (chunk - chunk.mean(axis=-1, keepdims=True)) * win
+        yf = rfft(chunk, axis=-1, workers=workers)[..., :half]
+        power += np.sum(yf.real**2 + yf.imag**2, axis=-2)
+    power /= n_segments * np.mean(win**2)
+    return rfftfreq(nperseg, T)[:half], power.astype(real_dtype, copy=False)
+
+def compute_power_spectrum(x, Fs, use_rfft=True, workers=None, pad=None, method='fft',
+                           window=None, nperseg=None, noverlap=None):
+    """
+    Frequências e espectro de potência de meio lado do sinal ao longo do último eixo.
+    method='fft' usa uma FFT do sinal inteiro (ver _half_power_spectrum); 'welch' e
+    'bartlett' fazem a média de segmentos (ver _segmented_power_spectrum), trocando
+    resolução em frequência por um piso de ruído de variância bem menor.
+    """
+    x = np.asarray(x)
+    if method == 'fft':
+        return _half_power_spectrum(x, 1 / Fs, use_rfft, workers, pad)
+    if method in ('welch', 'bartlett'):
+        return _segmented_power_spectrum(x, 1 / Fs, method, window, nperseg, noverlap, workers)
+    raise ValueError(f"Método espectral desconhecido: {method!r} (use 'fft', 'welch' ou 'bartlett')")
+
+def _parabolic_offset(left, center, right):
+    """Deslocamento (em bins, entre -0.5 e 0.5) do vértice da parábola pelos três pontos"""
+    denominator = left - 2 * center + right
+    if denominator == 0:
+        return 0.0
+    return float(np.clip(0.5 * (left - right) / denominator, -0.5, 0.5))
+
+def _quinn_tau(x):
+    """Função auxiliar τ(x) do segundo estimador de Quinn"""
+    root = np.sqrt(2 / 3)
+    return 0.25 * np.log(3 * x**2 + 6 * x + 1) - np.sqrt(6) / 24 * np.log(
+        (x + 1 - root) / (x + 1 + root))
+
+def _dft_bins(x, k, N):
+    """Coeficientes complexos X[k] da DFT de N pontos só para os bins pedidos (O(N) por bin)"""
+    n = np.arange(len(x))
+    return np.exp(-2j * np.pi * np.outer(k, n) / N) @ x
+
+def interpolate_peak(x, Fs, peak_freq, method='quinn'):
+    """
+    Estimativa da frequência do pico com resolução abaixo de um bin (Fs/N).
+    Trabalha na grade da DFT sem preenchimento: calcula só os três coeficientes
+    em torno do bin mais próximo de peak_freq e interpola.
+
+    Args:
+        method: 'quinn' (padrão: segundo estimador de Quinn, usa os coeficientes
+            complexos; o mais preciso para uma senoide) ou 'parabolic' (parábola pelo
+            log das magnitudes, a interpolação gaussiana). Sem janela o lóbulo da DFT
+            é um sinc, não uma gaussiana, então 'parabolic' continua enviesado (erro
+            típico de alguns centésimos de bin a ~0.1 bin); use-o só como estimativa rápida
+    """
+    if method not in ('parabolic', 'quinn'):
+        raise ValueError(f"Método de interpolação desconhecido: {method!r} (use 'parabolic' ou 'quinn')")
+    x = np.asarray(x, dtype=float)
+    N = len(x)
+    df = Fs / N
+    k = int(round(peak_freq / df))
+    if k < 1 or k + 1 > N // 2:
+        return peak_freq  # Sem vizinhos dos dois lados: mantém o valor original
+    left, center, right = _dft_bins(x, [k - 1, k, k + 1], N)
+
+    if method == 'parabolic':
+        magnitudes = np.abs([left, center, right])
+        if np.any(magnitudes == 0):
+            return peak_freq
+        delta = _parabolic_offset(*np.log(magnitudes))
+    else:
+        if center == 0:
+            return peak_freq
+        ap = (right / center).real
+        am = (left / center).real
+        dp = -ap / (1 - ap)
+        dm = am / (1 - am)
+        delta = (dp + dm) / 2 + _quinn_tau(dp**2) - _quinn_tau(dm**2)
+        delta = float(np.clip(delta, -1.0, 1.0))
+    return (k + delta) * df
+
+def zoom_peak(x, Fs, peak_freq, zoom_bins=2, zoom_factor=16):
+    """
+    Refinamento por zoom-FFT (transformada chirp-z) só em uma faixa estreita:
+    avalia o espectro em ±zoom_bins bins (Fs/N) em torno de peak_freq com
+    zoom_factor pontos por bin, sem preencher o sinal inteiro com zeros (o custo é
+    de algumas FFTs de tamanho ~N, não de uma FFT zoom_factor vezes maior).
+    O zoom é feito no sinal analítico (scipy.signal.hilbert): no sinal real a imagem
+    em -peak_freq vaza para a grade fina e deixa o máximo de |X(f)| assimétrico,
+    puxando-o para baixo em frequências baixas (5.0 Hz exatos saíam como 4.992 Hz).
+    Retorna a frequência do máximo, ajustada por interpolação parabólica na grade fina.
+    """
+    x = hilbert(np.asarray(x, dtype=float))
+    N = len(x)
+    df = Fs / N
+    f_low = max(peak_freq - zoom_bins * df, 0.0)
+    f_high = min(peak_freq + zoom_bins * df, Fs / 2)
+    m = int(np.ceil((f_high - f_low) / df * zoom_factor)) + 1
+    if m < 3:
+        return peak_freq
+    power = np.abs(zoom_fft(x, [f_low, f_high], m=m, fs=Fs, endpoint=True))**2
+    step = (f_high - f_low) / (m - 1)
+    i = int(np.argmax(power))
+    if 0 < i < m - 1:
+        magnitude = np.sqrt(power[i - 1:i + 2])
+        return f_low + (i + _parabolic_offset(*magnitude)) * step
+    return f_low + i * step
+
+def relocate_peak(x, Fs, peak_freq, search_width):
+    """
+    Reposiciona na grade da FFT do sinal inteiro (Fs/N) um pico achado em uma grade
+    mais grossa (Welch/Bartlett, ou FFT com preenchimento): devolve a frequência do
+    maior bin da rfft de N pontos em peak_freq ± search_width. Os refinamentos
+    (interpolate_peak, zoom_peak, epoch_folding.refine_period) partem desse bin.
+    """
+    x = np.asarray(x, dtype=float)
+    N = len(x)
+    df = Fs / N
+    k_low = max(int(np.ceil((peak_freq - search_width) / df)), 1)
+    k_high = min(int(np.floor((peak_freq + search_width) / df)), (N - 1) // 2)
+    if k_high < k_low:
+        return peak_freq
+    power = np.abs(rfft(x)[k_low:k_high + 1])**2
+    return (k_low + int(np.argmax(power))) * df
+
+def refine_peak_frequency(x, Fs, peak_freq, method='quinn', zoom_bins=2, zoom_factor=16):
+    """
+    Etapa opcional de refinamento do pico: 'quinn' (padrão) ou 'parabolic'
+    (interpolate_peak) ou 'zoom' (zoom_peak). Retorna a frequência refinada em Hz.
+    """
+    if method == 'zoom':
+        return zoom_peak(x, Fs, peak_freq, zoom_bins, zoom_factor)
+    return interpolate_peak(x, Fs, peak_freq, method)
+
+def _nearest_bin(freq, df, n_bins):
+    """
+    Bin da grade k·df (k = 0 … n_bins-1) mais próximo de freq, em O(1).
+    Reproduz np.argmin(np.abs(xf - freq)), inclusive no empate (fica com o bin menor).
+    """
+    k = int(min(max(np.floor(freq / df), 0), n_bins - 1))
+    # Corrige o arredondamento da divisão para garantir k·df <= freq < (k+1)·df
+    while k > 0 and k * df > freq:
+        k -= 1
+    while k + 1 < n_bins and (k + 1) * df <= freq:
+        k += 1
+    if k + 1 < n_bins and abs((k + 1) * df - freq) < abs(k * df - freq):
+        k += 1
+    return k
+
+def _first_bin_above(freq, df, n_bins):
+    """
+    Primeiro bin da grade k·df com k·df >= freq, nunca o bin 0 (DC): é o início de
+    uma banda de busca. Arredondar para o bin mais próximo deixaria 0.5 Hz cair no
+    bin DC em grades grossas (df >= 1 Hz, comuns no modo Welch/Bartlett).
+    """
+    k = _nearest_bin(freq, df, n_bins)
+    if k * df < freq:
+        k += 1
+    return max(k, 1)
+
+def _normalize_bands(Fs, min_freq, max_freq, bands):
+    """Bandas como tupla de pares (mín, máx) em Hz; bands=None usa a faixa [min_freq, max_freq]"""
+    if bands is None:
+        bands = ((min_freq, max_freq),)
+    return tuple((float(low), float(Fs/2 - 5 if high is None else high)) for low, high in bands)
+
+@lru_cache(maxsize=128)
+def _band_layout(n_bins, df, bands):
+    """
+    Índices das bandas de detecção para uma grade de frequências (n_bins, df),
+    calculados uma única vez e guardados em cache.
+    Retorna (edges, gather, offsets, lengths): edges[i] = [idx_min, idx_max) da banda i;
+    gather concatena os bins de todas as bandas não vazias, que começam em offsets.
+    """
+    edges = np.array([[_first_bin_above(low, df, n_bins), _nearest_bin(high, df, n_bins)]
+                      for low, high in bands], dtype=np.intp).reshape(-1, 2)
+    lengths = np.maximum(edges[:, 1] - edges[:, 0], 0)
+    gather = np.concatenate([np.arange(start, start + length, dtype=np.intp)
+                             for start, length in zip(edges[:, 0], lengths)] + [np.empty(0, np.intp)])
+    offsets = (np.cumsum(lengths) - lengths)[lengths > 0]
+    for array in (edges, lengths, gather, offsets):
+        array.flags.writeable = False  # Compartilhados entre chamadas
+    return edges, gather, offsets, lengths
+
+def _grid_step(xf):
+    """Espaçamento da grade de frequências (que sempre começa em 0 Hz)"""
+    return float(xf[1]) if len(xf) > 1 else 1.0
+
+def _band_indices(xf, Fs, min_freq, max_freq):
+    """Índices [idx_min, idx_max) da faixa de busca do pulsar (max_freq=None usa Fs/2 - 5 Hz)"""
+    bands = _normalize_bands(Fs, min_freq, max_freq, None)
+    edges = _band_layout(len(xf), _grid_step(xf), bands)[0]
+    return int(edges[0, 0]), int(edges[0, 1])
+
+# Pico de uma banda de detecção: limites da banda (Hz), frequência e potência do máximo
+BAND_PEAK_DTYPE = np.dtype([('min_freq', 'f8'), ('max_freq', 'f8'), ('freq', 'f8'), ('power', 'f8')])
+
+def band_peaks(power_spectrum, frequencies, Fs, bands):
+    """
+    Máximo de cada banda de detecção em uma única passada vetorizada: os bins de
+    todas as bandas são reunidos com um só fancy-index (índices em cache por grade)
+    e reduzidos com np.maximum.reduceat; a posição do máximo sai de um
+    np.minimum.reduceat sobre os índices que atingem o máximo.
+    Funciona ao longo do último eixo; retorna um array BAND_PEAK_DTYPE de forma
+    (..., n_bandas) (bandas vazias = NaN).
+    """
+    bands = _normalize_bands(Fs, None, None, bands)
+    power = np.asarray(power_spectrum)
+    edges, gather, offsets, lengths = _band_layout(len(frequencies), _grid_step(frequencies), bands)
+
+    peaks = np.full(power.shape[:-1] + (len(bands),), np.nan, dtype=BAND_PEAK_DTYPE)
+    peaks['min_freq'] = [low for low, _ in bands]
+    peaks['max_freq'] = [high for _, high in bands]
+    if gather.size == 0:
+        return peaks
+
+    valid = lengths > 0
+    if np.count_nonzero(valid) == 1:
+        start = int(edges[valid, 0][0])
+        values = power[..., start:start + gather.size]  # Banda única: visão, sem cópia
+    else:
+        values = power[..., gather]
+    maxima = np.maximum.reduceat(values, offsets, axis=-1)
+    hits = values == np.repeat(maxima, lengths[valid], axis=-1)
+    position = np.minimum.reduceat(np.where(hits, np.arange(gather.size), gather.size),
+                                   offsets, axis=-1)
+    peaks['freq'][..., valid] = frequencies[gather[position]]
+    peaks['power'][..., valid] = maxima
+    return peaks
+
+def analyze_spectrum(frequencies, power_spectrum, Fs, cutoff_freq, min_freq=0.5, max_freq=None,
+                     harmonic_sum=False, max_harmonics=16, n_candidates=5, detection_threshold=3.0,
+                     bands=None):
+    """
+    Etapa de detecção de process_and_analyze_signal, isolada para poder ser refeita
+    sem refiltrar o sinal (por exemplo ao mudar só a faixa de busca).
+    Recebe o espectro filtrado e retorna o pico, o período, a dobra e o score
+    harmônicos, os candidatos, a decisão de detecção e o máximo de cada banda
+    (band_peaks). Com harmonic_sum a decisão vem da soma de harmônicos na
+    fundamental reportada; sem ela, do melhor candidato (harmonic_score fica NaN).
+    Com bands (lista de pares (mín, máx) em Hz) a primeira banda é a de detecção
+    principal e substitui min_freq/max_freq. O pico principal é o máximo dessa
+    primeira banda em band_peaks, sem uma segunda varredura da faixa.
+    Funciona ao longo do último eixo: com um espectro (N,) os campos são escalares
+    e os candidatos vêm sem as posições vazias; com um lote (n_sinais, N) cada campo
+    tem uma linha por sinal (é a detecção usada por process_and_analyze_batch).
+    """
+    xf = frequencies
+    power_spectrum = np.asarray(power_spectrum)
+    batch_shape = power_spectrum.shape[:-1]
+    bands = _normalize_bands(Fs, min_freq, max_freq, bands)
+    min_freq, max_freq = bands[0]
+    idx_min_freq, idx_max_freq = _band_indices(xf, Fs, min_freq, max_freq)
+    peaks = band_peaks(power_spectrum, xf, Fs, bands)
+
+    # Garante que a faixa seja válida
+    harmonic_fold = np.ones(batch_shape, dtype=int)
+    harmonic_score = np.full(batch_shape, np.nan)
+    harmonic_sigma = None
+    candidates = np.full(batch_shape + (n_candidates,), np.nan, dtype=CANDIDATE_DTYPE)
+    if idx_min_freq >= idx_max_freq:
+        peak_freq = np.zeros(batch_shape)
+        print("Aviso: Faixa de frequência para detecção de pulsar inválida ou muito estreita.")
+    else:
+        noise_slice = _passband_slice(xf, idx_min_freq, idx_max_freq, _FLAT_PASSBAND * cutoff_freq)
+        searched = _passband_slice(xf, idx_min_freq, idx_max_freq, cutoff_freq)
+        if harmonic_sum:
+            # Só a banda passante, normalizada pelo mesmo piso de ruído dos candidatos
+            noise_mean = np.median(power_spectrum[..., noise_slice], axis=-1) / np.log(2)
+            harmonics = harmonic_sum_search(power_spectrum[..., :searched.stop], xf, idx_min_freq,
+                                            searched.stop, max_harmonics, noise_mean)
+            peak_freq = harmonics['fundamental_freq']
+            harmonic_fold = harmonics['fold']
+            harmonic_score = harmonics['score']
+            harmonic_sigma = harmonics['sigma']
+        else:
+            peak_freq = peaks['freq'][..., 0]
+
+        # Lista de candidatos e decisão de detecção
+        candidates = extract_candidates(power_spectrum, xf, idx_min_freq, idx_max_freq,
+                                        n_candidates, noise_slice, searched.stop - searched.start)
+    with np.errstate(divide='ignore'):
+        detected_period = np.where(peak_freq > 0, 1 / peak_freq, np.inf)
+    # Com a soma de harmônicos a decisão é sobre a fundamental reportada, não o maior bin
+    detection_sigma = candidates['sigma'][..., 0] if harmonic_sigma is None else harmonic_sigma
+
+    if batch_shape:
+        detection_sigma = np.nan_to_num(detection_sigma, nan=0.0)
+        detected = (detection_sigma >= detection_threshold) & (peak_freq > 0)
+    else:
+        candidates = candidates[np.isfinite(candidates['power'])]
+        if harmonic_sigma is None:
+            detection_sigma = candidates['sigma'][0] if len(candidates) else 0.0
+        else:
+            detection_sigma = float(harmonic_sigma)
+        peak_freq = peak_freq[()]
+        detected_period = detected_period[()]
+        harmonic_fold = int(harmonic_fold)
+        harmonic_score = float(harmonic_score)
+        detected = bool(detection_sigma >= detection_threshold and peak_freq > 0)
+    return {
+        'detected_peak_freq': peak_freq,
+        'detected_period': detected_period,
+        'harmonic_fold': harmonic_fold,
+        'harmonic_score': harmonic_score,
+        'candidates': candidates,
+        'detection_sigma': detection_sigma,
+        'detected': detected,
+        'band_peaks': peaks
+    }
+
+def _refine_detection(filtered_signal, Fs, frequencies, detection, refine=None, fold_refine=False,
+                      fold_bins=32, ffa_periods=None, ffa_threshold=8.0, progress=None,
+                      profiler=None):
+    """
+    Etapas opcionais depois da detecção (refinamento do pico, dobramento de época e
+    busca FFA) para um sinal; atualiza e retorna o dicionário de analyze_spectrum.
+    Compartilhada pelos modos individual e em lote.
+    """
+    N = filtered_signal.shape[-1]
+
+    # Os refinamentos trabalham na grade Fs/N; um pico da grade grossa do Welch/Bartlett
+    # (ou da FFT preenchida) é antes reposicionado em ±1 bin grosso na FFT completa
+    if (refine is not None or fold_refine) and detection['detected_peak_freq'] > 0:
+        coarse_df = _grid_step(frequencies)
+        if not np.isclose(coarse_df, Fs / N):
+            with stage(profiler, 'refine'):
+                peak_freq = relocate_peak(filtered_signal, Fs, detection['detected_peak_freq'],
+                                          coarse_df)
+            detection['detected_peak_freq'] = peak_freq
+            detection['detected_period'] = 1 / peak_freq
+
+    # --- 4. Refinamento do pico abaixo de um bin (opcional) ---
+    if refine is not None and detection['detected_peak_freq'] > 0:
+        _report_progress(progress, 0.85, "Refinando frequência do pico")
+        with stage(profiler, 'refine'):
+            peak_freq = refine_peak_frequency(filtered_signal, Fs, detection['detected_peak_freq'],
+                                              refine)
+        detection['detected_peak_freq'] = peak_freq
+        detection['detected_period'] = 1 / peak_freq if peak_freq > 0 else np.inf
+
+    # --- 5. Refinamento do período por dobramento de época (opcional) ---
+    if fold_refine and detection['detected_peak_freq'] > 0:
+        _report_progress(progress, 0.9, "Dobrando sinal no período candidato")
+        with stage(profiler, 'fold'):
+            folding = refine_period(filtered_signal, Fs, detection['detected_peak_freq'], fold_bins)
+        detection['detected_peak_freq'] = folding['frequency']
+        detection['detected_period'] = folding['period']
+        detection['fold_profile'] = folding['profile']
+        detection['fold_score'] = folding['score']
+
+    # --- 6. Busca de pulsares lentos pelo FFA (opcional) ---
+    if ffa_periods is not None:
+        _report_progress(progress, 0.95, "Busca de períodos longos (FFA)")
+        with stage(profiler, 'ffa'):
+            ffa = ffa_search(filtered_signal, Fs, *ffa_periods)
+        detection['ffa_period'] = ffa['period']
+        detection['ffa_snr'] = ffa['snr']
+        detection['ffa_width'] = ffa['width']
+        detection['ffa_profile'] = ffa['profile']
+        detection['ffa_detected'] = bool(ffa['snr'] >= ffa_threshold)
+    return detection
+
+def _refine_batch_detection(filtered_signals, Fs, frequencies, detection, fold_bins=32,
+                            progress=None, **options):
+    """
+    Aplica _refine_detection a cada linha do lote e empilha os campos novos.
+    Linhas sem pico não ganham perfil dobrado; nelas fold_profile/fold_score ficam NaN.
+    """
+    rows = []
+    for i, signal in enumerate(filtered_signals):
+        row = {'detected_peak_freq': detection['detected_peak_freq'][i],
+               'detected_period': detection['detected_period'][i]}
+        rows.append(_refine_detection(signal, Fs, frequencies, row, fold_bins=fold_bins, **options))
+        _report_progress(progress, 0.8 + 0.2 * (i + 1) / len(filtered_signals),
+                         "Refinando detecções")
 
-def process_and_analyze_signal(input_signal, Fs, cutoff_freq=55, filter_order=5):
+    detection['detected_peak_freq'] = np.array([row['detected_peak_freq'] for row in rows], dtype=float)
+    detection['detected_period'] = np.array([row['detected_period'] for row in rows], dtype=float)
+    missing = {'fold_profile': np.full(fold_bins, np.nan), 'fold_score': np.nan}
+    for key in sorted({key for row in rows for key in row} - {'detected_peak_freq', 'detected_period'}):
+        detection[key] = np.array([row.get(key, missing.get(key)) for row in rows])
+    return detection
+
+def process_and_analyze_signal(input_signal, Fs, cutoff_freq=55, filter_order=5,
+                               use_rfft=True, workers=None, pad=None, filter_bank=None,
+                               harmonic_sum=False, max_harmonics=16, n_candidates=5,
+                               detection_threshold=3.0, min_freq=0.5, max_freq=None, bands=None,
+                               method='fft', window=None, nperseg=None, noverlap=None,
+                               refine=None, fold_refine=False, fold_bins=32,
+                               ffa_periods=None, ffa_threshold=8.0, dtype=None,
+                               progress=None, profiler=None):
     """
     Aplica filtro passa-baixa, realiza FFT e tenta detectar um pico de frequência.
     Retorna o sinal filtrado, frequências, espectros e o período detectado.
+
+    Args:
+        use_rfft: Se True, usa a FFT real (rfft); False restaura a FFT complexa completa
+        workers: Número de threads repassado a scipy.fft (None = padrão do scipy)
+        pad: None, 'fast' (next_fast_len) ou 'pow2' para preencher com zeros antes da FFT
+        filter_bank: FilterBank com o cache de filtros (None = banco padrão compartilhado)
+        harmonic_sum: Se True, o pico é escolhido pela soma de harmônicos (ver harmonic_sum_search)
+            e a decisão de detecção usa a significância dessa soma; o resultado traz
+            'harmonic_fold' e 'harmonic_score'
+        max_harmonics: Maior dobra harmônica testada (1, 2, 4, ... até este valor)
+        n_candidates: Quantos picos manter na lista de candidatos (ver extract_candidates)
+        detection_threshold: Significância mínima do melhor candidato para declarar
+            detecção, em sigmas equivalentes da probabilidade de falso alarme corrigida
+            pelo número de bins buscados (3σ ≈ 0.13% de falsos alarmes por gravação,
+            qualquer que seja a duração); abaixo disso o sinal é tratado como apenas ruído
+        min_freq, max_freq: Faixa de busca do pulsar em Hz (max_freq=None usa Fs/2 - 5 Hz)
+        bands: Lista opcional de bandas (mín, máx) em Hz; o máximo de cada uma vai para
+            'band_peaks' e a primeira é a banda de detecção (substitui min_freq/max_freq)
+        method: 'fft' (uma FFT do sinal inteiro), 'welch' ou 'bartlett' (média de
+            segmentos, ver compute_power_spectrum); pad e use_rfft valem só para 'fft'
+        window, nperseg, noverlap: Janela, tamanho e sobreposição dos segmentos
+            (None = padrões do método)
+        refine: None, 'quinn', 'parabolic' ou 'zoom' para estimar o pico abaixo da
+            resolução de um bin (ver refine_peak_frequency); detected_peak_freq e
+            detected_period passam a usar a frequência refinada. Com method 'welch' ou
+            'bartlett' (ou pad), o pico é antes reposicionado na FFT do sinal inteiro
+            (ver relocate_peak), já que os refinamentos partem da grade Fs/N
+        fold_refine: Se True, refina o período dobrando o sinal filtrado em uma grade em
+            torno do pico (ver epoch_folding.refine_period); detected_period e
+            detected_peak_freq passam a ser o período dobrado e sua frequência, e o
+            resultado ganha 'fold_profile' e 'fold_score'
+        fold_bins: Número de caixas de fase do perfil dobrado
+        ffa_periods: Faixa (período mínimo, período máximo) em segundos para uma busca
+            adicional pelo Fast Folding Algorithm no sinal filtrado (ver
+            fast_folding.ffa_search), que cobre pulsares lentos abaixo de min_freq;
+            o resultado ganha 'ffa_period', 'ffa_snr', 'ffa_width', 'ffa_profile' e
+            'ffa_detected'
+        ffa_threshold: S/N mínimo do melhor perfil do FFA para 'ffa_detected'
+        dtype: None mantém o tipo de entrada (float32 fica em float32, os demais tipos
+            viram float64); np.float32 processa tudo em precisão simples
+            (filtro SOS em float32, FFT em complex64, espectros em float32) com metade
+            da memória e da banda de memória; np.float64 força precisão dupla
+        progress: Função opcional progress(fração, descrição) chamada entre as etapas;
+            pode lançar uma exceção para interromper o processamento (cancelamento)
+        profiler: instrumentation.StageProfiler opcional; mede tempo (e memória) de
+            filter_design, filtfilt, fft_original, fft_filtered, band_search, refine, fold e ffa
     """
+    if dtype is not None:
+        input_signal = np.asarray(input_signal, dtype=dtype)
     N = len(input_signal)
     T = 1 / Fs
     t = np.arange(0, N * T, T) # Vetor de tempo para plotagem
 
     # --- 1. Filtragem Passa-Baixa ---
-    Wn = cutoff_freq / (Fs / 2) # Frequência de corte normalizada
-    b, a = butter(filter_order, Wn, btype='low', analog=False)
-    filtered_signal = filtfilt(b, a, input_signal)
+    # Filtro em seções de segunda ordem (SOS), reaproveitado do cache do banco
+    _report_progress(progress, 0.0, "Filtrando sinal")
+    filtered_signal = filter_signal(input_signal, Fs, cutoff_freq, filter_order, filter_bank, dtype,
+                                    profiler)
 
     # --- 2. Análise Espectral (FFT) ---
-    yf_original = fft(input_signal)
-    power_spectrum_original = np.abs(yf_original[0:N//2])**2
-
-    yf_filtered = fft(filtered_signal)
-    xf = fftfreq(N, T)[:N//2] # Frequências correspondentes
-    power_spectrum_filtered = np.abs(yf_filtered[0:N//2])**2
+    _report_progress(progress, 0.4, "FFT do sinal original")
+    spectral = dict(method=method, window=window, nperseg=nperseg, noverlap=noverlap)
+    with stage(profiler, 'fft_original'):
+        _, power_spectrum_original = compute_power_spectrum(input_signal, Fs, use_rfft, workers, pad,
+                                                            **spectral)
+    _report_progress(progress, 0.6, "FFT do sinal filtrado")
+    with stage(profiler, 'fft_filtered'):
+        xf, power_spectrum_filtered = compute_power_spectrum(filtered_signal, Fs, use_rfft, workers,
+                                                             pad, **spectral)
 
-    # --- 3. Detecção do Pulsar (Pico na FFT) ---
-    min_freq_for_pulsar = 0.5 # Hz (ajuste se souber a faixa do seu pulsar sintético)
-    max_freq_for_pulsar = Fs/2 - 5 # Hz (ajuste)
+    # --- 3. Detecção do Pulsar (Pico na FFT) e lista de candidatos ---
+    _report_progress(progress, 0.8, "Buscando picos")
+    with stage(profiler, 'band_search'):
+        detection = analyze_spectrum(xf, power_spectrum_filtered, Fs, cutoff_freq, min_freq, max_freq,
+                                     harmonic_sum, max_harmonics, n_candidates, detection_threshold,
+                                     bands)
 
-    idx_min_freq = np.argmin(np.abs(xf - min_freq_for_pulsar))
-    idx_max_freq = np.argmin(np.abs(xf - max_freq_for_pulsar))
-
-    # Garante que a faixa seja válida
-    if idx_min_freq >= idx_max_freq:
-        peak_freq = 0.0
-        detected_period = np.inf
-        print("Aviso: Faixa de frequência para detecção de pulsar inválida ou muito estreita.")
-    else:
-        peak_index_in_range = np.argmax(power_spectrum_filtered[idx_min_freq : idx_max_freq])
-        peak_freq = xf[idx_min_freq + peak_index_in_range]
-        detected_period = 1 / peak_freq if peak_freq > 0 else np.inf
+    # --- 4 a 6. Refinamento, dobramento e FFA (opcionais) ---
+    detection = _refine_detection(filtered_signal, Fs, xf, detection, refine, fold_refine, fold_bins,
+                                  ffa_periods, ffa_threshold, progress, profiler)
+    _report_progress(progress, 1.0, "Análise concluída")
     
     return {
         'time_vector': t,
@@ -49,8 +776,72 @@ def process_and_analyze_signal(input_signal, Fs, cutoff_freq=55, filter_order=5)
         'frequencies': xf,
         'power_spectrum_original': power_spectrum_original,
         'power_spectrum_filtered': power_spectrum_filtered,
-        'detected_peak_freq': peak_freq,
-        'detected_period': detected_period,
+        **detection,
+        'cutoff_freq': cutoff_freq,
+        'filter_order': filter_order
+    }
+
+def process_and_analyze_batch(input_signals, Fs, cutoff_freq=55, filter_order=5,
+                              use_rfft=True, workers=None, pad=None, filter_bank=None,
+                              harmonic_sum=False, max_harmonics=16, n_candidates=5,
+                              detection_threshold=3.0, min_freq=0.5, max_freq=None, bands=None,
+                              method='fft', window=None, nperseg=None, noverlap=None,
+                              refine=None, fold_refine=False, fold_bins=32,
+                              ffa_periods=None, ffa_threshold=8.0, dtype=None,
+                              progress=None, profiler=None):
+    """
+    Versão em lote de process_and_analyze_signal para vários sinais de mesmo tamanho.
+    Recebe um array (n_sinais, N) e aplica filtro, FFTs e busca de pico ao longo do
+    último eixo em chamadas vetorizadas únicas, sem laço Python por sinal; a detecção
+    é a mesma analyze_spectrum do modo individual. As etapas opcionais por sinal
+    (refine, fold_refine, ffa_periods) rodam linha a linha, como no modo individual.
+    Retorna os mesmos campos do modo individual, empilhados com uma linha por sinal.
+    O profiler opcional mede os mesmos estágios do modo individual.
+    """
+    input_signals = np.atleast_2d(np.asarray(input_signals, dtype=dtype))
+    n_signals, N = input_signals.shape
+    T = 1 / Fs
+    t = np.arange(0, N * T, T)
+
+    # --- 1. Filtragem Passa-Baixa (todas as linhas de uma vez) ---
+    _report_progress(progress, 0.0, "Filtrando sinais")
+    filtered_signals = filter_signal(input_signals, Fs, cutoff_freq, filter_order, filter_bank, dtype,
+                                     profiler)
+
+    # --- 2. Análise Espectral (FFT ao longo do último eixo) ---
+    _report_progress(progress, 0.4, "FFT dos sinais originais")
+    spectral = dict(method=method, window=window, nperseg=nperseg, noverlap=noverlap)
+    with stage(profiler, 'fft_original'):
+        _, power_spectrum_original = compute_power_spectrum(input_signals, Fs, use_rfft, workers, pad,
+                                                            **spectral)
+    _report_progress(progress, 0.6, "FFT dos sinais filtrados")
+    with stage(profiler, 'fft_filtered'):
+        xf, power_spectrum_filtered = compute_power_spectrum(filtered_signals, Fs, use_rfft, workers,
+                                                             pad, **spectral)
+
+    # --- 3. Detecção do Pulsar (vetorizada sobre as linhas) ---
+    _report_progress(progress, 0.8, "Buscando picos")
+    with stage(profiler, 'band_search'):
+        detection = analyze_spectrum(xf, power_spectrum_filtered, Fs, cutoff_freq, min_freq, max_freq,
+                                     harmonic_sum, max_harmonics, n_candidates, detection_threshold,
+                                     bands)
+
+    # --- 4 a 6. Refinamento, dobramento e FFA (opcionais, por sinal) ---
+    if refine is not None or fold_refine or ffa_periods is not None:
+        detection = _refine_batch_detection(filtered_signals, Fs, xf, detection, fold_bins, progress,
+                                            refine=refine, fold_refine=fold_refine,
+                                            ffa_periods=ffa_periods, ffa_threshold=ffa_threshold,
+                                            profiler=profiler)
+    _report_progress(progress, 1.0, "Análise concluída")
+
+    return {
+        'time_vector': t,
+        'noisy_signal': input_signals,
+        'filtered_signal': filtered_signals,
+        'frequencies': xf,
+        'power_spectrum_original': power_spectrum_original,
+        'power_spectrum_filtered': power_spectrum_filtered,
+        **detection,
         'cutoff_freq': cutoff_freq,
         'filter_order': filter_order
     }
@@ -59,46 +850,18 @@ if __name__ == '__main__':
     # Este bloco só executa se o script for rodado diretamente, não quando importado
     # Exemplo de uso direto (para testar a função):
     from generate_signal import generate_and_save_random_signal
+    from visualization import plot_analysis_results
 
     Fs_test = 1000
     duration_test = 2
     noise_amp_test = 0.5
     
-    test_noisy_signal, test_time_vec = generate_and_save_random_signal(Fs_test, duration_test, noise_amp_test)
+    test_noisy_signal, test_time_vec, _ = generate_and_save_random_signal(Fs_test, duration_test, noise_amp_test)
     
     results = process_and_analyze_signal(test_noisy_signal, Fs_test)
     
     # Plotar os resultados (similar ao seu script original, mas usando 'results')
-    plt.figure(figsize=(12, 10))
-
-    plt.subplot(3, 1, 1)
-    plt.plot(results['time_vector'], results['noisy_signal'])
-    plt.title('Sinal Original Sintético com Ruído')
-    plt.xlabel('Tempo (s)')
-    plt.ylabel('Amplitude')
-    plt.grid(True)
-
-    plt.subplot(3, 1, 2)
-    plt.plot(results['time_vector'], results['filtered_signal'], color='orange')
-    plt.title(f'Sinal Filtrado (Passa-Baixa, Corte: {results["cutoff_freq"]} Hz)')
-    plt.xlabel('Tempo (s)')
-    plt.ylabel('Amplitude')
-    plt.grid(True)
-
-    plt.subplot(3, 1, 3)
-    plt.plot(results['frequencies'], results['power_spectrum_original'], label='Espectro Original (Ruidoso)', alpha=0.7)
-    plt.plot(results['frequencies'], results['power_spectrum_filtered'], label='Espectro Filtrado', color='orange')
-    plt.axvline(x=results['detected_peak_freq'], color='g', linestyle='--', label=f'Pico Detectado: {results["detected_peak_freq"]:.2f} Hz')
-    plt.axvline(x=results['cutoff_freq'], color='r', linestyle='--', label=f'Corte do Filtro ({results["cutoff_freq"]} Hz)')
-    plt.title('Espectro de Potência (FFT)')
-    plt.xlabel('Frequência (Hz)')
-    plt.ylabel('Potência')
-    plt.xlim(0, Fs_test/2)
-    plt.grid(True)
-    plt.legend()
-
-    plt.tight_layout()
-    plt.show()
+    plot_analysis_results(results, Fs_test)
 
     print(f"\n--- Detecção de Pulsar ---")
     print(f"Frequência do Pico Detectado: {results['detected_peak_freq']:.4f} Hz")
@@ -0,0 +1,100 @@
+import json
+import struct
+
+import numpy as np
+
+# Formato binário de sinal (.sig):
+#   [0:6)   assinatura b'PSIG\x00\x01' (nome + versão)
+#   [6:10)  tamanho do cabeçalho JSON em bytes (uint32 little-endian)
+#   [10:..) cabeçalho JSON em UTF-8, completado com espaços até múltiplo de 64 bytes
+#   [..:)   amostras cruas (float32 ou float64 little-endian)
+# O alinhamento permite abrir as amostras com np.memmap sem copiar nem converter.
+MAGIC = b'PSIG\x00\x01'
+_PREFIX = struct.Struct('<6sI')
+_ALIGNMENT = 64
+
+
+def _json_default(value):
+    """Converte tipos do NumPy que aparecem em signal_info para tipos JSON"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Valor não serializável no cabeçalho: {type(value).__name__}")
+
+
+def save_signal(path, signal, Fs, duration=None, noise_amplitude=None, signal_info=None,
+                dtype=np.float64):
+    """
+    Salva um sinal no formato binário .sig com cabeçalho de metadados.
+    Guarda Fs, duração, amplitude do ruído e o signal_info do gerador.
+
+    Args:
+        dtype: np.float32 ocupa metade do espaço; np.float64 preserva o sinal exatamente
+    """
+    dtype = np.dtype(dtype).newbyteorder('<')
+    if dtype.kind != 'f':
+        raise ValueError("O sinal deve ser salvo como float32 ou float64")
+    data = np.ascontiguousarray(signal, dtype=dtype).ravel()
+
+    if duration is None:
+        duration = len(data) / Fs
+    if signal_info is not None:
+        noise_amplitude = signal_info.get('noise_amplitude', noise_amplitude)
+
+    header = {
+        'dtype': dtype.str,
+        'num_samples': len(data),
+        'fs': Fs,
+        'duration': duration,
+        'noise_amplitude': noise_amplitude,
+        'signal_info': signal_info
+    }
+    header_bytes = json.dumps(header, default=_json_default).encode('utf-8')
+    data_offset = _PREFIX.size + len(header_bytes)
+    padding = -data_offset % _ALIGNMENT
+    header_bytes += b' ' * padding
+
+    with open(path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        data.tofile(f)
+
+
+def read_header(path):
+    """
+    Lê apenas o cabeçalho de um arquivo .sig.
+    Retorna o dicionário de metadados, com 'data_offset' indicando onde começam as amostras.
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"Arquivo de sinal inválido ou truncado: {path}")
+        magic, header_len = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"Arquivo não está no formato de sinal binário (.sig): {path}")
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    header['data_offset'] = _PREFIX.size + header_len
+    return header
+
+
+def load_signal(path, start=0, stop=None, mmap=True):
+    """
+    Abre um sinal salvo e retorna (amostras, metadados).
+    Com mmap=True as amostras vêm de np.memmap, então ler um trecho [start:stop]
+    não carrega o arquivo inteiro. Arquivos .txt antigos (np.savetxt) também são
+    aceitos, mas exigem leitura e conversão completas.
+    """
+    if str(path).endswith('.txt'):
+        samples = np.loadtxt(path)[start:stop]
+        return samples, {'dtype': samples.dtype.str, 'num_samples': len(samples),
+                         'fs': None, 'duration': None, 'noise_amplitude': None,
+                         'signal_info': None}
+
+    header = read_header(path)
+    samples = np.memmap(path, dtype=np.dtype(header['dtype']), mode='r',
+                        offset=header['data_offset'], shape=(header['num_samples'],))
+    samples = samples[start:stop]
+    if not mmap:
+        samples = np.array(samples)
+    return samples, header
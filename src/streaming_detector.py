@@ -0,0 +1,140 @@
+import numpy as np
+from scipy.signal import sosfilt, sosfilt_zi, get_window
+from scipy.fft import rfft, rfftfreq
+
+from filter_bank import default_filter_bank
+
+
+class StreamingPulsarDetector:
+    """
+    Detector de pulsares para fluxos contínuos de amostras.
+    Recebe o sinal em blocos (chunks), aplica o filtro passa-baixa de forma causal
+    mantendo o estado (zi) entre blocos e calcula espectros em janelas sobrepostas
+    (estilo Welch). A cada janela completa emite uma atualização com a frequência
+    de pico e o período. A memória usada depende só do tamanho da janela, nunca
+    da duração total da gravação.
+    """
+
+    def __init__(self, Fs, window_size=2048, overlap=0.5, cutoff_freq=55, filter_order=5,
+                 window='hann', min_freq=0.5, max_freq=None, filter_bank=None):
+        if not 0 <= overlap < 1:
+            raise ValueError("A sobreposição deve estar no intervalo [0, 1)")
+
+        self.Fs = Fs
+        self.window_size = int(window_size)
+        self.hop = max(1, int(round(self.window_size * (1 - overlap))))
+        self.cutoff_freq = cutoff_freq
+        self.filter_order = filter_order
+
+        bank = filter_bank if filter_bank is not None else default_filter_bank
+        self._sos = bank.get_sos(Fs, cutoff_freq, filter_order, btype='low')
+
+        # Janela e escala de densidade espectral (como em scipy.signal.welch)
+        self._window = get_window(window, self.window_size)
+        self._scale = 1.0 / (Fs * np.sum(self._window**2))
+        self.frequencies = rfftfreq(self.window_size, 1 / Fs)
+
+        # Faixa de busca do pico resolvida uma única vez (índices inclusivos)
+        if max_freq is None:
+            max_freq = Fs/2 - 5
+        df = Fs / self.window_size
+        self._idx_min = max(1, int(np.ceil(min_freq / df)))
+        self._idx_max = min(len(self.frequencies) - 1, int(np.floor(max_freq / df)))
+        if self._idx_min > self._idx_max:
+            raise ValueError("Faixa de frequência para detecção inválida para este tamanho de janela")
+
+        self.reset()
+
+    def reset(self):
+        """Descarta o estado do filtro, o buffer e o espectro acumulado"""
+        self._zi = None
+        self._buffer = np.zeros(self.window_size)
+        self._n_buffered = 0
+        self._since_last_window = 0
+        self._psd_sum = np.zeros(len(self.frequencies))
+        self.n_windows = 0
+        self.samples_seen = 0
+
+    @property
+    def average_spectrum(self):
+        """Média dos espectros de todas as janelas já processadas (Welch)"""
+        if self.n_windows == 0:
+            return np.zeros_like(self._psd_sum)
+        return self._psd_sum / self.n_windows
+
+    def process_chunk(self, chunk):
+        """
+        Consome um bloco de amostras e retorna a lista de atualizações emitidas
+        (uma por janela completada dentro do bloco; pode ser vazia).
+        """
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        if chunk.size == 0:
+            return []
+
+        # --- 1. Filtragem causal com estado preservado entre blocos ---
+        if self._zi is None:
+            # Inicializa no regime permanente do primeiro valor para evitar transitório
+            self._zi = sosfilt_zi(self._sos) * chunk[0]
+        filtered, self._zi = sosfilt(self._sos, chunk, zi=self._zi)
+
+        # --- 2. Janelamento com sobreposição ---
+        updates = []
+        pos = 0
+        while pos < len(filtered):
+            if self._n_buffered < self.window_size:
+                # Ainda enchendo a primeira janela
+                k = min(self.window_size - self._n_buffered, len(filtered) - pos)
+                self._buffer[self._n_buffered:self._n_buffered + k] = filtered[pos:pos + k]
+                self._n_buffered += k
+                ready = self._n_buffered == self.window_size
+            else:
+                # Desliza a janela em até 'hop' amostras
+                k = min(self.hop - self._since_last_window, len(filtered) - pos)
+                self._buffer[:-k] = self._buffer[k:]
+                self._buffer[-k:] = filtered[pos:pos + k]
+                self._since_last_window += k
+                ready = self._since_last_window == self.hop
+
+            pos += k
+            self.samples_seen += k
+            if ready:
+                self._since_last_window = 0
+                updates.append(self._analyze_window())
+
+        return updates
+
+    def _analyze_window(self):
+        """Espectro da janela atual, acumulação Welch e busca do pico"""
+        spectrum = np.abs(rfft(self._buffer * self._window))**2 * self._scale
+        self._psd_sum += spectrum
+        self.n_windows += 1
+
+        band = self._psd_sum[self._idx_min:self._idx_max + 1]
+        peak_index = self._idx_min + np.argmax(band)
+        peak_freq = self.frequencies[peak_index]
+
+        return {
+            'window_index': self.n_windows - 1,
+            'time': self.samples_seen / self.Fs,
+            'peak_freq': peak_freq,
+            'period': 1 / peak_freq if peak_freq > 0 else np.inf,
+            'peak_power': self._psd_sum[peak_index] / self.n_windows,
+            'window_peak_freq': self.frequencies[self._idx_min + np.argmax(
+                spectrum[self._idx_min:self._idx_max + 1])]
+        }
+
+
+if __name__ == '__main__':
+    # Exemplo: alimenta o detector com um sinal sintético em blocos de 250 amostras
+    from generate_signal import generate_and_save_random_signal
+
+    Fs_test = 1000
+    test_signal, _, test_info = generate_and_save_random_signal(Fs_test, 20, 0.5, rng=42, educational=True)
+
+    detector = StreamingPulsarDetector(Fs_test, window_size=2048, overlap=0.5, cutoff_freq=35)
+    for start in range(0, len(test_signal), 250):
+        for update in detector.process_chunk(test_signal[start:start + 250]):
+            print(f"t={update['time']:6.2f} s | janela {update['window_index']:3d} | "
+                  f"pico médio: {update['peak_freq']:6.2f} Hz | período: {update['period']:.3f} s")
+
+    print(f"\nComponentes reais: {test_info['frequencies']} Hz")
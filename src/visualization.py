@@ -0,0 +1,139 @@
+"""
+Gráficos de demonstração do gerador e do pipeline de processamento.
+Os módulos de cálculo (generate_signal, process_signal, ...) não importam o
+matplotlib: só este módulo desenha, e o pyplot é importado dentro de cada
+função, na primeira vez que um gráfico é pedido. Assim os workers dos pools de
+processos carregam apenas NumPy/SciPy.
+"""
+
+
+def plot_generation_demo(components, components_data, time_vec, noisy_sig, Fs, duration,
+                         noise_amplitude, show=True):
+    """
+    Painel 2×2 da demonstração do gerador: componentes educativas, superposição,
+    sinal com ruído e quadro de parâmetros. Retorna a figura.
+    """
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(12, 8))
+
+    # Subplot das componentes
+    plt.subplot(2, 2, 1)
+    colors = ['red', 'blue', 'green']
+    for i, comp in enumerate(components):
+        plt.plot(comp['time'][:500], comp['signal'][:500],
+                color=colors[i], linewidth=2,
+                label=f"{comp['name']}: {comp['freq']} Hz")
+    plt.title('Componentes Senoidais Individuais')
+    plt.xlabel('Tempo (s)')
+    plt.ylabel('Amplitude')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.xlim(0, 0.5)
+
+    # Sinal somado (limpo)
+    plt.subplot(2, 2, 2)
+    clean_signal = sum(comp['signal'] for comp in components)
+    plt.plot(components[0]['time'][:500], clean_signal[:500],
+            'purple', linewidth=2, label='Sinal Limpo (Soma)')
+    plt.title('Superposição das Componentes')
+    plt.xlabel('Tempo (s)')
+    plt.ylabel('Amplitude')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.xlim(0, 0.5)
+
+    # Sinal com ruído
+    plt.subplot(2, 2, 3)
+    plt.plot(time_vec[:500], noisy_sig[:500],
+            'orange', alpha=0.8, label='Sinal + Ruído')
+    plt.plot(time_vec[:500], clean_signal[:500],
+            'purple', alpha=0.5, linestyle='--', label='Original')
+    plt.title('Sinal com Ruído Adicionado')
+    plt.xlabel('Tempo (s)')
+    plt.ylabel('Amplitude')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.xlim(0, 0.5)
+
+    # Informações
+    plt.subplot(2, 2, 4)
+    plt.axis('off')
+    info_text = f"""
+📊 PARÂMETROS DO SINAL:
+
+🎯 Componentes:
+"""
+    for comp_data in components_data:
+        info_text += f"• {comp_data['name']}: {comp_data['freq']} Hz, A={comp_data['amp']:.1f}\n"
+
+    info_text += f"""
+⚙️ Configurações:
+• Freq. amostragem: {Fs} Hz
+• Duração: {duration} s
+• Amostras: {len(noisy_sig)}
+• Ruído: σ = {noise_amplitude}
+
+🔬 Conceitos:
+• Superposição linear
+• Amostragem digital
+• Ruído gaussiano
+• Periodicidade
+"""
+
+    plt.text(0.1, 0.9, info_text, fontsize=10, verticalalignment='top',
+            bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.8))
+
+    plt.suptitle('🎲 Demonstração: Geração de Sinais Educativos', fontsize=14, fontweight='bold')
+    plt.tight_layout()
+    if show:
+        plt.show()
+    return fig
+
+
+def plot_analysis_results(results, Fs, show=True):
+    """
+    Sinal original, sinal filtrado e espectros de um resultado de
+    process_and_analyze_signal, com o pico detectado e o corte do filtro marcados.
+    Retorna (figura, linhas decimadas); as linhas precisam continuar referenciadas
+    enquanto a figura estiver aberta (ver plot_decimation.DecimatedLine).
+    """
+    import matplotlib.pyplot as plt
+    from plot_decimation import plot_decimated
+
+    fig = plt.figure(figsize=(12, 10))
+
+    plt.subplot(3, 1, 1)
+    decimated_lines = []  # Mantém as linhas decimadas vivas enquanto a janela estiver aberta
+    decimated_lines.append(plot_decimated(plt.gca(), results['time_vector'], results['noisy_signal']))
+    plt.title('Sinal Original Sintético com Ruído')
+    plt.xlabel('Tempo (s)')
+    plt.ylabel('Amplitude')
+    plt.grid(True)
+
+    plt.subplot(3, 1, 2)
+    decimated_lines.append(plot_decimated(plt.gca(), results['time_vector'], results['filtered_signal'],
+                                          color='orange'))
+    plt.title(f'Sinal Filtrado (Passa-Baixa, Corte: {results["cutoff_freq"]} Hz)')
+    plt.xlabel('Tempo (s)')
+    plt.ylabel('Amplitude')
+    plt.grid(True)
+
+    plt.subplot(3, 1, 3)
+    decimated_lines.append(plot_decimated(plt.gca(), results['frequencies'], results['power_spectrum_original'],
+                                          label='Espectro Original (Ruidoso)', alpha=0.7))
+    decimated_lines.append(plot_decimated(plt.gca(), results['frequencies'], results['power_spectrum_filtered'],
+                                          label='Espectro Filtrado', color='orange'))
+    plt.axvline(x=results['detected_peak_freq'], color='g', linestyle='--', label=f'Pico Detectado: {results["detected_peak_freq"]:.2f} Hz')
+    plt.axvline(x=results['cutoff_freq'], color='r', linestyle='--', label=f'Corte do Filtro ({results["cutoff_freq"]} Hz)')
+    plt.title('Espectro de Potência (FFT)')
+    plt.xlabel('Frequência (Hz)')
+    plt.ylabel('Potência')
+    plt.xlim(0, Fs/2)
+    plt.grid(True)
+    plt.legend()
+
+    plt.tight_layout()
+    if show:
+        plt.show()
+    return fig, decimated_lines
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos ficam soltos em src/ e são importados pelo nome, como nos scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+
+def pytest_addoption(parser):
+    parser.addoption('--perf', action='store_true',
+                     help="Roda também os testes de desempenho (marcador perf) contra a linha de base")
+    parser.addoption('--perf-tolerance', type=float, default=0.25,
+                     help="Queda de vazão tolerada nos testes de desempenho (fração)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "perf: regressão de desempenho contra a linha de base "
+                                       "(só roda com --perf)")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Os tempos dependem da máquina: os testes perf são opcionais e rodam no runner da linha de base
+    if config.getoption('--perf'):
+        return
+    skip = pytest.mark.skip(reason="teste de desempenho: use --perf")
+    for item in items:
+        if 'perf' in item.keywords:
+            item.add_marker(skip)
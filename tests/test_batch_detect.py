@@ -0,0 +1,60 @@
+import csv
+
+import numpy as np
+
+from batch_detect import COLUMNS, find_signal_files, read_journal, run_batch
+from signal_storage import save_signal
+
+
+def _write_signals(directory, names, Fs=1000):
+    t = np.arange(0, 2, 1 / Fs)
+    rng = np.random.default_rng(0)
+    paths = []
+    for name in names:
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        save_signal(str(path), np.sin(2 * np.pi * 7 * t) + rng.standard_normal(len(t)), Fs)
+        paths.append(str(path))
+    return paths
+
+
+def test_directory_scan_only_collects_sig_files(tmp_path):
+    """Um notes.txt solto no diretório não vira linha de erro; .txt nomeado continua aceito"""
+    sig_paths = _write_signals(tmp_path, ['a.sig', 'sub/b.sig'])
+    (tmp_path / 'notes.txt').write_text("anotações da campanha\n", encoding='utf-8')
+    text_signal = tmp_path / 'sub' / 'c.txt'
+    np.savetxt(text_signal, np.zeros(10))
+
+    assert find_signal_files([str(tmp_path)]) == sorted(sig_paths)
+    assert find_signal_files([str(text_signal)]) == [str(text_signal)]
+    assert find_signal_files([str(tmp_path / '**' / '*.txt')]) == sorted(
+        [str(tmp_path / 'notes.txt'), str(text_signal)])
+
+    rows = run_batch([str(tmp_path)], str(tmp_path / 'out.csv'), workers=1, verbose=False)
+    assert sorted(row['path'] for row in rows) == sorted(sig_paths)
+    assert not any(row['error'] for row in rows)
+
+
+def test_resume_reprocesses_truncated_last_row(tmp_path):
+    """A última linha do diário cortada por uma interrupção não conta como processada"""
+    paths = _write_signals(tmp_path, ['a.sig', 'b.sig', 'c.sig'])
+    output = str(tmp_path / 'out.csv')
+    run_batch(paths, output, workers=1, verbose=False)
+
+    with open(output, encoding='utf-8') as f:
+        content = f.read()
+    truncated_row = content.rstrip('\n').rsplit('\n', 1)[1]
+    truncated_path = next(csv.reader([truncated_row]))[0]
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(content.rstrip('\n')[:-len(truncated_row) // 2])
+
+    rows = run_batch(paths, output, workers=1, resume=True, verbose=False)
+    assert sorted(row['path'] for row in rows) == sorted(paths)
+    reprocessed = [row for row in rows if row['path'] == truncated_path]
+    assert len(reprocessed) == 1 and isinstance(reprocessed[0]['peak_freq_hz'], float)
+
+    journal = read_journal(output)
+    assert sorted(row['path'] for row in journal) == sorted(paths)
+    for row in journal:
+        assert None not in row and row['error'] == ''
+        assert all(row[column] not in ('', None) for column in COLUMNS if column != 'error')
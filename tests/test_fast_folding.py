@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from fast_folding import downsample, ffa_search, ffa_transform
+
+
+def test_transform_rows_are_drifting_folds():
+    """Linha 0 soma sem deslocamento; a última desloca a linha i de i caixas"""
+    data = np.random.default_rng(0).standard_normal((8, 16))
+    profiles = ffa_transform(data)
+    assert profiles.shape == (8, 16)
+    np.testing.assert_allclose(profiles[0], data.sum(axis=0))
+    np.testing.assert_allclose(profiles[-1], sum(np.roll(row, -i) for i, row in enumerate(data)))
+
+
+def test_transform_pads_rows_to_a_power_of_two():
+    data = np.ones((5, 8))
+    profiles = ffa_transform(data)
+    assert profiles.shape == (8, 8)
+    np.testing.assert_allclose(profiles.sum(axis=1), data.sum())
+
+
+def test_downsample_preserves_the_integral():
+    x = np.random.default_rng(1).standard_normal(1000)
+    np.testing.assert_allclose(downsample(x, 4), x.reshape(-1, 4).mean(axis=1))
+    reduced = downsample(x, 2.5)
+    assert len(reduced) == 400
+    assert reduced.sum() * 2.5 == pytest.approx(x.sum())
+    with pytest.raises(ValueError):
+        downsample(x, 0.5)
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_search_recovers_a_slow_narrow_pulsar(seed):
+    """Período de 3.7 s com pulso de 1% do período, abaixo da banda da FFT"""
+    Fs = 500
+    period = 3.7
+    t = np.arange(0, 120, 1 / Fs)
+    x = 0.5 * ((t / period) % 1.0 < 0.01) + np.random.default_rng(seed).standard_normal(len(t))
+    result = ffa_search(x, Fs, 1.0, 10.0)
+    assert result['period'] == pytest.approx(period, abs=2e-3)
+    assert result['snr'] > 8
+    assert result['width'] < 0.1
+    assert np.all(np.diff(result['periods']) > 0)
+    assert result['periods'][0] >= 1.0 and result['periods'][-1] <= 10.0
+
+
+def test_search_validates_the_period_range():
+    x = np.zeros(10000)
+    with pytest.raises(ValueError):
+        ffa_search(x, 500, 2.0, 1.0)
+    with pytest.raises(ValueError):
+        ffa_search(x, 500, 0.1, 1.0)  # 0.1 s · 500 Hz < bins_min amostras
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from generate_signal import sample_signal_parameters
+from pipeline_cache import PipelineCache, build_signal_pipeline
+from process_signal import process_and_analyze_signal
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = build_signal_pipeline()
+    pipeline.set_params(Fs=1000, duration=2, signal_info=sample_signal_parameters(educational=True),
+                        rng=np.random.default_rng(0), noise_amplitude=0.5, cutoff_freq=35,
+                        filter_order=5, min_freq=0.5, max_freq=None)
+    pipeline.get('analysis')
+    return pipeline
+
+
+def test_analysis_matches_process_and_analyze_signal(pipeline):
+    analysis = pipeline.get('analysis')
+    direct = process_and_analyze_signal(pipeline.get('noisy_signal'), 1000, cutoff_freq=35, filter_order=5)
+    assert analysis['detected_peak_freq'] == direct['detected_peak_freq']
+    assert analysis['detection_sigma'] == direct['detection_sigma']
+    np.testing.assert_array_equal(analysis['filtered_signal'], direct['filtered_signal'])
+
+
+def test_band_change_does_not_refilter(pipeline):
+    assert pipeline.set_params(min_freq=10.0, max_freq=30.0) == {'detection', 'analysis'}
+    analysis = pipeline.get('analysis')
+    counts = pipeline.compute_counts
+    assert counts['filtered_signal'] == 1 and counts['spectrum_filtered'] == 1
+    assert counts['detection'] == 2
+    assert 10.0 <= analysis['detected_peak_freq'] <= 30.0
+
+
+def test_cutoff_change_does_not_redo_original_spectrum(pipeline):
+    pipeline.set_params(cutoff_freq=20)
+    pipeline.get('analysis')
+    counts = pipeline.compute_counts
+    assert counts['spectrum_original'] == 1 and counts['noisy_signal'] == 1
+    assert counts['filtered_signal'] == 2 and counts['detection'] == 2
+
+
+def test_noise_change_does_not_resynthesize_components(pipeline):
+    noise_before = pipeline.get('noise')
+    pipeline.set_params(noise_amplitude=1.0)
+    pipeline.get('analysis')
+    counts = pipeline.compute_counts
+    assert counts['components'] == 1 and counts['clean_signal'] == 1 and counts['unit_noise'] == 1
+    assert counts['noise'] == 2 and counts['filtered_signal'] == 2
+    np.testing.assert_allclose(pipeline.get('noise'), 2 * noise_before)
+
+
+def test_unchanged_params_keep_the_cache(pipeline):
+    assert pipeline.set_params(cutoff_freq=35, min_freq=0.5) == set()
+    hits = pipeline.hits
+    pipeline.get('analysis')
+    assert pipeline.hits == hits + 1
+    assert all(count == 1 for count in pipeline.compute_counts.values())
+
+
+def _racing_pipeline():
+    """a(x) em cache; b(y) simula outra thread mudando x no meio do cálculo; c(a, b)"""
+    pipeline = PipelineCache()
+    pipeline.add_stage('a', lambda x: x * 10, ['x'])
+    pipeline.add_stage('b', lambda y: (pipeline.set_params(x=y), y)[1], ['y'])
+    pipeline.add_stage('c', lambda a, b: a + b, ['a', 'b'])
+    pipeline.set_params(x=1, y=0)
+    assert pipeline.get('a') == 10
+    return pipeline
+
+
+def test_params_changed_mid_computation_are_not_cached():
+    pipeline = _racing_pipeline()
+    pipeline.set_params(y=5)
+    # 'a' foi descartado pela mudança de x durante 'b', mas 'c' usa o valor capturado no planejamento
+    assert pipeline.get('c') == 15
+    assert not pipeline.is_cached('b') and not pipeline.is_cached('c') and not pipeline.is_cached('a')
+    # A próxima chamada recalcula com os parâmetros novos
+    assert pipeline.get('c') == 55
+    assert pipeline.is_cached('c')
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from process_signal import (process_and_analyze_signal, process_and_analyze_batch, interpolate_peak,
+                            zoom_peak, _band_indices)
+
+
+@pytest.mark.parametrize('method', ['fft', 'welch', 'bartlett'])
+def test_dc_offset_does_not_hide_the_peak(method):
+    """Um nível DC não pode vencer a busca no modo segmentado (média removida por segmento)"""
+    Fs = 1000
+    t = np.arange(0, 8, 1 / Fs)
+    x = 2.0 + np.sin(2 * np.pi * 20 * t) + np.random.default_rng(0).standard_normal(len(t))
+    results = process_and_analyze_signal(x, Fs, cutoff_freq=35, method=method)
+    assert results['detected']
+    assert results['detected_peak_freq'] == pytest.approx(20.0, abs=results['frequencies'][1])
+
+
+@pytest.mark.parametrize('df', [0.25, 1 / 3, 1.0, 2.0])
+def test_band_starts_at_first_bin_above_min_freq(df):
+    xf = np.arange(0, 500, df)
+    idx_min, _ = _band_indices(xf, 1000, 0.5, None)
+    assert idx_min >= 1
+    assert xf[idx_min] >= 0.5
+    assert xf[idx_min - 1] < 0.5 or idx_min == 1
+
+
+@pytest.mark.parametrize('method', ['welch', 'bartlett'])
+@pytest.mark.parametrize('refine', ['quinn', 'zoom'])
+def test_refine_after_segmented_spectrum_uses_full_resolution(method, refine):
+    """O pico da grade grossa é reposicionado na FFT completa antes do refinamento"""
+    Fs = 1000
+    t = np.arange(0, 8, 1 / Fs)
+    x = np.sin(2 * np.pi * 21.3 * t) + np.random.default_rng(0).standard_normal(len(t))
+    results = process_and_analyze_signal(x, Fs, cutoff_freq=35, method=method, refine=refine)
+    assert results['detected_peak_freq'] == pytest.approx(21.3, abs=0.01)
+
+
+def test_zoom_is_unbiased_on_an_exact_bin():
+    Fs = 1000
+    t = np.arange(0, 2, 1 / Fs)
+    assert zoom_peak(np.sin(2 * np.pi * 5.0 * t), Fs, 5.0) == pytest.approx(5.0, abs=1e-3)
+
+
+def test_default_interpolation_is_quinn():
+    Fs = 1000
+    t = np.arange(0, 2, 1 / Fs)
+    x = np.sin(2 * np.pi * 7.3 * t)
+    assert interpolate_peak(x, Fs, 7.5) == pytest.approx(7.3, abs=0.01)
+    assert abs(interpolate_peak(x, Fs, 7.5, 'parabolic') - 7.3) < abs(7.5 - 7.3)
+
+
+def test_fold_refine_keeps_frequency_and_period_consistent():
+    Fs = 1000
+    t = np.arange(0, 8, 1 / Fs)
+    x = np.sin(2 * np.pi * 21.3 * t) + np.random.default_rng(0).standard_normal(len(t))
+    results = process_and_analyze_signal(x, Fs, cutoff_freq=35, fold_refine=True)
+    assert results['detected_peak_freq'] == pytest.approx(1 / results['detected_period'])
+    assert results['detected_peak_freq'] == pytest.approx(21.3, abs=0.01)
+
+
+def test_batch_matches_single_signal_detection():
+    """Os dois modos usam a mesma detecção e as mesmas etapas opcionais"""
+    Fs = 1000
+    t = np.arange(0, 8, 1 / Fs)
+    rng = np.random.default_rng(2)
+    signals = rng.standard_normal((3, len(t)))
+    signals[0] += np.sin(2 * np.pi * 21.3 * t)
+    signals[1] += 2.0 + 0.5 * np.sin(2 * np.pi * 7.0 * t)
+    options = dict(cutoff_freq=35, method='welch', refine='quinn', fold_refine=True)
+    batch = process_and_analyze_batch(signals, Fs, **options)
+    for i, signal in enumerate(signals):
+        single = process_and_analyze_signal(signal, Fs, **options)
+        for key in ('detected_peak_freq', 'detected_period', 'detection_sigma', 'detected'):
+            assert batch[key][i] == pytest.approx(single[key])
+
+
+@pytest.mark.parametrize('duration', [2, 60, 600])
+def test_long_noise_only_input_is_not_detected(duration):
+    """A significância é corrigida pelo número de bins: o ruído não cresce com ln N"""
+    Fs = 1000
+    noise = np.random.default_rng(duration).standard_normal(duration * Fs)
+    results = process_and_analyze_signal(noise, Fs, cutoff_freq=35)
+    assert not results['detected']
+    assert results['detection_sigma'] < 3.0
+
+
+def test_harmonic_sum_decision_uses_the_harmonic_score():
+    """Harmônicos fracos demais para um bin isolado somam uma detecção na fundamental reportada"""
+    Fs = 1000
+    t = np.arange(0, 8, 1 / Fs)
+    x = sum(0.05 * np.sin(2 * np.pi * 3.3 * h * t) for h in range(1, 9))
+    x = x + np.random.default_rng(0).standard_normal(len(t))
+    single_bin = process_and_analyze_signal(x, Fs, cutoff_freq=35)
+    harmonic = process_and_analyze_signal(x, Fs, cutoff_freq=35, harmonic_sum=True)
+    assert not single_bin['detected']
+    assert harmonic['detected']
+    assert harmonic['detected_peak_freq'] == pytest.approx(3.3, abs=0.01)
+    assert harmonic['harmonic_fold'] == 8
+    assert np.isfinite(harmonic['harmonic_score'])
+    assert harmonic['detection_sigma'] > single_bin['detection_sigma']
+
+
+@pytest.mark.parametrize('process', [process_and_analyze_signal, process_and_analyze_batch])
+def test_default_dtype_follows_float32_input(process):
+    """dtype=None mantém float32: os coeficientes float64 não promovem o sinal filtrado"""
+    Fs = 1000
+    t = np.arange(0, 2, 1 / Fs)
+    x = (np.sin(2 * np.pi * 5 * t) + np.random.default_rng(0).standard_normal(len(t))).astype(np.float32)
+    results = process(x, Fs, cutoff_freq=35)
+    for key in ('filtered_signal', 'power_spectrum_original', 'power_spectrum_filtered'):
+        assert results[key].dtype == np.float32
+    assert process(x.astype(np.float64), Fs, cutoff_freq=35)['filtered_signal'].dtype == np.float64
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from generate_signal import sample_signal_parameters
+from signal_storage import MAGIC, load_signal, read_header, save_signal
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_round_trip_keeps_samples_and_metadata(tmp_path, dtype):
+    path = str(tmp_path / 'sinal.sig')
+    signal = np.random.default_rng(0).standard_normal(1001)
+    signal_info = sample_signal_parameters(np.random.default_rng(1))
+    save_signal(path, signal, 1000, noise_amplitude=0.5, signal_info=signal_info, dtype=dtype)
+
+    samples, header = load_signal(path)
+    assert isinstance(samples, np.memmap)
+    assert samples.dtype == dtype
+    np.testing.assert_array_equal(samples, signal.astype(dtype))
+    assert header['fs'] == 1000 and header['num_samples'] == 1001
+    assert header['duration'] == pytest.approx(1.001)
+    assert header['signal_info']['frequencies'] == pytest.approx(list(signal_info['frequencies']))
+    assert header['data_offset'] % 64 == 0
+
+
+@pytest.mark.parametrize('start, stop', [(0, 10), (250, 750), (900, None), (-5, None), (500, 500)])
+def test_slices_match_the_full_signal(tmp_path, start, stop):
+    path = str(tmp_path / 'sinal.sig')
+    signal = np.arange(1000, dtype=float)
+    save_signal(path, signal, 1000)
+    for mmap in (True, False):
+        samples, _ = load_signal(path, start, stop, mmap=mmap)
+        np.testing.assert_array_equal(samples, signal[start:stop])
+    assert not isinstance(load_signal(path, start, stop, mmap=False)[0], np.memmap)
+
+
+def test_empty_signal(tmp_path):
+    path = str(tmp_path / 'vazio.sig')
+    save_signal(path, np.array([]), 1000)
+    samples, header = load_signal(path)
+    assert len(samples) == 0
+    assert header['num_samples'] == 0 and header['duration'] == 0.0
+
+
+def test_invalid_files_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        save_signal(str(tmp_path / 'int.sig'), np.arange(4), 1000, dtype=np.int32)
+    truncated = tmp_path / 'truncado.sig'
+    truncated.write_bytes(MAGIC[:3])
+    with pytest.raises(ValueError):
+        read_header(str(truncated))
+    wrong = tmp_path / 'outro.sig'
+    wrong.write_bytes(b'XXXXXX' + bytes(64))
+    with pytest.raises(ValueError):
+        read_header(str(wrong))
+
+
+def test_legacy_text_files_still_load(tmp_path):
+    path = str(tmp_path / 'antigo.txt')
+    np.savetxt(path, np.linspace(0, 1, 50))
+    samples, header = load_signal(path, 10, 20)
+    np.testing.assert_allclose(samples, np.linspace(0, 1, 50)[10:20])
+    assert header['fs'] is None
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from streaming_detector import StreamingPulsarDetector
+
+
+def _feed(x, chunk_size, **options):
+    detector = StreamingPulsarDetector(1000, **options)
+    updates = []
+    for start in range(0, len(x), chunk_size):
+        updates.extend(detector.process_chunk(x[start:start + chunk_size]))
+    return detector, updates
+
+
+@pytest.fixture
+def test_signal():
+    t = np.arange(0, 20, 1 / 1000)
+    return np.sin(2 * np.pi * 7.3 * t) + np.random.default_rng(0).standard_normal(len(t))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 97, 250, 4096])
+def test_result_does_not_depend_on_chunk_size(test_signal, chunk_size):
+    """Filtro com estado e janelas deslizantes: o fatiamento do fluxo não muda nada"""
+    reference, reference_updates = _feed(test_signal, len(test_signal), cutoff_freq=35)
+    detector, updates = _feed(test_signal, chunk_size, cutoff_freq=35)
+    assert len(updates) == len(reference_updates) == reference.n_windows
+    for update, expected in zip(updates, reference_updates):
+        assert update['window_index'] == expected['window_index']
+        assert update['time'] == expected['time']
+        assert update['peak_freq'] == expected['peak_freq']
+        assert update['peak_power'] == pytest.approx(expected['peak_power'], rel=1e-9)
+    np.testing.assert_allclose(detector.average_spectrum, reference.average_spectrum, rtol=1e-9)
+
+
+def test_stream_finds_the_tone_and_counts_windows(test_signal):
+    detector, updates = _feed(test_signal, 500, cutoff_freq=35, window_size=2048, overlap=0.5)
+    assert detector.samples_seen == len(test_signal)
+    assert detector.n_windows == 1 + (len(test_signal) - 2048) // 1024
+    assert updates[-1]['peak_freq'] == pytest.approx(7.3, abs=1000 / 2048)
+
+
+def test_reset_and_empty_chunks():
+    detector = StreamingPulsarDetector(1000, window_size=256)
+    assert detector.process_chunk([]) == []
+    detector.process_chunk(np.ones(300))
+    detector.reset()
+    assert detector.n_windows == 0 and detector.samples_seen == 0
+    assert not detector.average_spectrum.any()